@@ -1,3 +1,14 @@
+"""
+Alerts admin configuration
+"""
 from django.contrib import admin
+from .models import WatchNotificationState
 
-# Register your models here.
+
+@admin.register(WatchNotificationState)
+class WatchNotificationStateAdmin(admin.ModelAdmin):
+    """알림 발송 상태 관리"""
+    list_display = ['watch', 'last_alerted_price', 'last_alerted_at', 'cooldown', 'alert_count']
+    search_fields = ['watch__user_id', 'watch__product__name']
+    readonly_fields = ['last_alerted_price', 'last_alerted_at', 'alert_count']
+    ordering = ['-last_alerted_at']
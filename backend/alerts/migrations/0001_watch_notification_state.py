@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("catalog", "0004_offer_product_url_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WatchNotificationState",
+            fields=[
+                (
+                    "watch",
+                    models.OneToOneField(
+                        help_text="연결된 Watch",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="notification_state",
+                        serialize=False,
+                        to="catalog.watch",
+                    ),
+                ),
+                (
+                    "last_alerted_price",
+                    models.DecimalField(
+                        decimal_places=0,
+                        help_text="마지막으로 알린 총 가격",
+                        max_digits=11,
+                    ),
+                ),
+                ("last_alerted_at", models.DateTimeField(help_text="마지막 알림 시각")),
+                (
+                    "cooldown",
+                    models.DurationField(
+                        blank=True,
+                        help_text="재알림 대기 시간 (비어 있으면 ALERTS_COOLDOWN_MINUTES 사용)",
+                        null=True,
+                    ),
+                ),
+                (
+                    "alert_count",
+                    models.PositiveIntegerField(default=0, help_text="누적 알림 횟수"),
+                ),
+            ],
+            options={
+                "db_table": "alerts_watchnotificationstate",
+            },
+        ),
+    ]
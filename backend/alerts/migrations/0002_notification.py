@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0001_watch_notification_state"),
+        ("catalog", "0004_offer_product_url_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Notification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "channel",
+                    models.CharField(
+                        help_text="발송 채널 (email, file, webhook, extension)",
+                        max_length=30,
+                    ),
+                ),
+                ("subject", models.CharField(help_text="제목", max_length=200)),
+                ("message", models.TextField(help_text="본문")),
+                (
+                    "payload",
+                    models.JSONField(
+                        blank=True, default=dict, help_text="채널용 구조화 데이터"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "대기"),
+                            ("sent", "발송 완료"),
+                            ("failed", "발송 실패"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, help_text="발송 시도 횟수"),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(help_text="다음 발송 시도 시각"),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, default="", help_text="마지막 오류"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "watch",
+                    models.ForeignKey(
+                        help_text="연결된 Watch",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="catalog.watch",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "alerts_notification",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "channel", "next_attempt_at"],
+                        name="alerts_noti_status_0dc1de_idx",
+                    )
+                ],
+            },
+        ),
+    ]
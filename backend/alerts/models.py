@@ -1,3 +1,73 @@
+"""
+Alerts domain models
+"""
 from django.db import models
+from catalog.models import Watch
 
-# Create your models here.
+
+class WatchNotificationState(models.Model):
+    """Watch별 알림 발송 상태 모델 (중복 알림 방지)"""
+    watch = models.OneToOneField(
+        Watch,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_state',
+        help_text="연결된 Watch"
+    )
+    last_alerted_price = models.DecimalField(
+        max_digits=11,
+        decimal_places=0,
+        help_text="마지막으로 알린 총 가격"
+    )
+    last_alerted_at = models.DateTimeField(help_text="마지막 알림 시각")
+    cooldown = models.DurationField(
+        blank=True,
+        null=True,
+        help_text="재알림 대기 시간 (비어 있으면 ALERTS_COOLDOWN_MINUTES 사용)"
+    )
+    alert_count = models.PositiveIntegerField(default=0, help_text="누적 알림 횟수")
+
+    class Meta:
+        db_table = 'alerts_watchnotificationstate'
+
+    def __str__(self):
+        return f"Watch {self.watch_id} - {self.last_alerted_price:,}원 ({self.last_alerted_at.strftime('%Y-%m-%d %H:%M')})"
+
+
+class Notification(models.Model):
+    """알림 발송 대기열 모델 (채널별 1건)"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_SENT, '발송 완료'),
+        (STATUS_FAILED, '발송 실패'),
+    ]
+
+    watch = models.ForeignKey(
+        Watch,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        help_text="연결된 Watch"
+    )
+    channel = models.CharField(max_length=30, help_text="발송 채널 (email, file, webhook, extension)")
+    subject = models.CharField(max_length=200, help_text="제목")
+    message = models.TextField(help_text="본문")
+    payload = models.JSONField(default=dict, blank=True, help_text="채널용 구조화 데이터")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0, help_text="발송 시도 횟수")
+    next_attempt_at = models.DateTimeField(help_text="다음 발송 시도 시각")
+    last_error = models.TextField(blank=True, default='', help_text="마지막 오류")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'alerts_notification'
+        indexes = [
+            models.Index(fields=['status', 'channel', 'next_attempt_at']),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.channel} - Watch {self.watch_id} ({self.get_status_display()})"
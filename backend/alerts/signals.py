@@ -0,0 +1,53 @@
+"""
+알림 시그널 수신자
+"""
+import logging
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from catalog.models import Watch
+from catalog.signals import price_dropped
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(price_dropped, dispatch_uid='alerts.enqueue_price_drop_evaluation')
+def enqueue_price_drop_evaluation(sender, drops, **kwargs):
+    """가격이 내려간 상품 중 활성 Watch가 있는 상품만 평가 태스크로 전달"""
+    from apps.alerts.tasks import evaluate_product_alerts
+    
+    watched = set(
+        Watch.objects.filter(product_id__in=drops, is_active=True)
+        .order_by()
+        .values_list('product_id', flat=True)
+        .distinct()
+    )
+    for product_id in sorted(watched):
+        try:
+            evaluate_product_alerts.apply_async(args=(product_id,), retry=False)
+        except Exception as e:
+            logger.error(f"상품 {product_id} 알림 평가 태스크 등록 중 오류: {str(e)}")
+
+
+@receiver(post_save, sender=Watch, dispatch_uid='alerts.index_saved_watch')
+def index_saved_watch(sender, instance, **kwargs):
+    """Watch 생성/수정 시 목표가 인덱스 갱신"""
+    from apps.alerts.watch_index import get_watch_index
+    
+    try:
+        if instance.is_active:
+            get_watch_index().add(instance.id, instance.product_id, instance.target_price)
+        else:
+            get_watch_index().remove(instance.id, instance.product_id)
+    except Exception as e:
+        logger.error(f"Watch {instance.id} 목표가 인덱스 갱신 중 오류: {str(e)}")
+
+
+@receiver(post_delete, sender=Watch, dispatch_uid='alerts.unindex_deleted_watch')
+def unindex_deleted_watch(sender, instance, **kwargs):
+    """Watch 삭제 시 목표가 인덱스에서 제거"""
+    from apps.alerts.watch_index import get_watch_index
+    
+    try:
+        get_watch_index().remove(instance.id, instance.product_id)
+    except Exception as e:
+        logger.error(f"Watch {instance.id} 목표가 인덱스 제거 중 오류: {str(e)}")
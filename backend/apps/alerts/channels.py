@@ -0,0 +1,162 @@
+"""
+알림 발송 채널
+"""
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+import requests
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from alerts.models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationChannel(ABC):
+    """알림 채널 베이스 클래스
+    
+    `send_batch`는 대기 알림 묶음을 한 번에 보내고 {알림 ID: 오류 메시지 또는 None}을 반환한다.
+    """
+    
+    name: str = ''
+    
+    @abstractmethod
+    def send_batch(self, notifications: List[Notification]) -> Dict[int, Optional[str]]:
+        """알림 묶음 발송"""
+        pass
+
+
+class EmailChannel(NotificationChannel):
+    """이메일 채널 (하나의 SMTP 연결로 알림별 발송)
+    
+    연결은 배치마다 한 번만 열고, 메시지는 하나씩 보내 수신 거부 등으로 실패한
+    알림만 실패로 표시한다.
+    """
+    
+    name = 'email'
+    
+    def build_message(self, notification: Notification) -> EmailMessage:
+        return EmailMessage(
+            subject=notification.subject,
+            body=notification.message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[notification.payload['email']]
+        )
+    
+    def send_batch(self, notifications: List[Notification]) -> Dict[int, Optional[str]]:
+        try:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+        except Exception as e:
+            return {notification.id: str(e) for notification in notifications}
+        
+        results = {}
+        try:
+            for notification in notifications:
+                try:
+                    sent = connection.send_messages([self.build_message(notification)])
+                    results[notification.id] = None if sent else "메일이 발송되지 않았습니다."
+                except Exception as e:
+                    results[notification.id] = str(e)
+        finally:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"SMTP 연결 종료 실패: {str(e)}")
+        return results
+
+
+class FileChannel(NotificationChannel):
+    """파일 채널 (개발용, 배치마다 파일을 한 번만 열어 기록)"""
+    
+    name = 'file'
+    
+    def __init__(self, path: Path = None):
+        self.path = path or Path(settings.BASE_DIR) / 'logs' / 'price_alerts.log'
+    
+    def send_batch(self, notifications: List[Notification]) -> Dict[int, Optional[str]]:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for notification in notifications:
+                    f.write(f"[{timezone.now()}] {notification.subject}\n{notification.message}\n{'='*50}\n")
+        except OSError as e:
+            return {notification.id: str(e) for notification in notifications}
+        
+        return {notification.id: None for notification in notifications}
+
+
+class WebhookChannel(NotificationChannel):
+    """웹훅 채널 (하나의 HTTP 세션을 재사용해 알림별로 POST)"""
+    
+    name = 'webhook'
+    setting_name = 'ALERTS_WEBHOOK_URL'
+    
+    def __init__(self, url: str = None, timeout: float = 5.0):
+        self.url = url or getattr(settings, self.setting_name, '')
+        self.timeout = timeout
+    
+    def build_body(self, notification: Notification) -> dict:
+        return {
+            'subject': notification.subject,
+            'message': notification.message,
+            **notification.payload
+        }
+    
+    def send_batch(self, notifications: List[Notification]) -> Dict[int, Optional[str]]:
+        if not self.url:
+            return {notification.id: f"{self.setting_name}가 설정되지 않았습니다." for notification in notifications}
+        
+        results = {}
+        with requests.Session() as session:
+            for notification in notifications:
+                try:
+                    response = session.post(self.url, json=self.build_body(notification), timeout=self.timeout)
+                    response.raise_for_status()
+                    results[notification.id] = None
+                except requests.RequestException as e:
+                    results[notification.id] = str(e)
+        return results
+
+
+class ExtensionPushChannel(WebhookChannel):
+    """크롬 확장 푸시 채널
+    
+    확장 프로그램 알림을 중계하는 푸시 게이트웨이(ALERTS_EXTENSION_PUSH_URL)로
+    사용자별 알림 데이터를 전달한다.
+    """
+    
+    name = 'extension'
+    setting_name = 'ALERTS_EXTENSION_PUSH_URL'
+    
+    def build_body(self, notification: Notification) -> dict:
+        return {
+            'user_id': notification.payload.get('user_id'),
+            'notification': {
+                'type': 'basic',
+                'title': notification.subject,
+                'message': notification.message,
+            },
+            'data': notification.payload
+        }
+
+
+# 채널 레지스트리
+CHANNELS = {
+    channel.name: channel
+    for channel in (EmailChannel, FileChannel, WebhookChannel, ExtensionPushChannel)
+}
+
+
+def get_channel(name: str) -> NotificationChannel:
+    """이름으로 채널 생성"""
+    if name not in CHANNELS:
+        raise ValueError(f"알 수 없는 알림 채널: {name}")
+    return CHANNELS[name]()
+
+
+def enabled_channels() -> List[str]:
+    """설정에서 사용하는 채널 목록"""
+    return list(getattr(settings, 'ALERTS_NOTIFICATION_CHANNELS', ['email']))
@@ -0,0 +1,195 @@
+"""
+알림 발송 파이프라인
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from alerts.models import Notification
+from catalog.models import Offer, Watch
+from catalog.services.retention import delete_in_chunks
+from .channels import enabled_channels, get_channel
+
+logger = logging.getLogger(__name__)
+
+
+def build_price_alert(watch: Watch, offer: Offer, current_price: Decimal) -> Dict[str, object]:
+    """가격 알림 제목/본문/데이터 구성"""
+    subject = f"🎯 가격 알림: {watch.product.display_name}"
+    
+    message = f"""
+가격 모니터링 알림
+
+상품: {watch.product.display_name}
+목표가: {watch.target_price:,}원
+현재 최저가: {current_price:,}원
+마켓플레이스: {offer.marketplace}
+판매자: {offer.seller}
+상품 URL: {offer.url}
+
+목표가에 도달했습니다! 🎉
+    """.strip()
+    
+    payload = {
+        'user_id': watch.user_id,
+        # 실제 구현 시 사용자 이메일 주소 필요
+        'email': f"user_{watch.user_id}@example.com",  # 임시
+        'watch_id': watch.id,
+        'product_id': watch.product_id,
+        'target_price': str(watch.target_price),
+        'current_price': str(current_price),
+        'marketplace': offer.marketplace,
+        'seller': offer.seller,
+        'url': offer.affiliate_url or offer.url,
+    }
+    return {'subject': subject, 'message': message, 'payload': payload}
+
+
+def queue_price_alerts(watches: Iterable[Watch], offer: Offer, current_price: Decimal) -> List[Watch]:
+    """가격 알림을 채널별 발송 대기열에 일괄 등록
+    
+    실제 발송은 커밋 후 `alerts.deliver_notifications` 태스크가 별도 큐에서 처리한다.
+    등록된 Watch 목록을 반환한다.
+    """
+    watches = list(watches)
+    channels = enabled_channels()
+    if not watches or not channels:
+        return []
+    
+    now = timezone.now()
+    notifications = []
+    for watch in watches:
+        alert = build_price_alert(watch, offer, current_price)
+        notifications.extend(
+            Notification(watch=watch, channel=channel, next_attempt_at=now, **alert)
+            for channel in channels
+        )
+    Notification.objects.bulk_create(notifications)
+    
+    transaction.on_commit(_kick_delivery)
+    return watches
+
+
+def _kick_delivery():
+    """발송 태스크 등록 (실패해도 주기 태스크가 처리)"""
+    from .tasks import deliver_notifications
+    
+    try:
+        deliver_notifications.apply_async(retry=False)
+    except Exception as e:
+        logger.warning(f"알림 발송 태스크 등록 실패, 다음 주기에 발송: {str(e)}")
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """재시도 대기 시간 (지수 백오프)"""
+    base = getattr(settings, 'ALERTS_NOTIFICATION_RETRY_BASE', 60)
+    cap = getattr(settings, 'ALERTS_NOTIFICATION_RETRY_MAX', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+def deliver_pending(batch_size: int = None, max_batches: int = 20) -> Dict[str, int]:
+    """발송 시각이 된 대기 알림을 채널별로 묶어 발송
+    
+    채널마다 batch_size개씩 선점(`_claim_batch`)해 트랜잭션 밖에서 한 번에 보낸 뒤,
+    실패한 알림은 시도 횟수에 따라 다음 시도 시각을 미루고 최대 시도 횟수를 넘으면
+    실패로 표시한다.
+    """
+    batch_size = batch_size or getattr(settings, 'ALERTS_NOTIFICATION_BATCH_SIZE', 100)
+    max_attempts = getattr(settings, 'ALERTS_NOTIFICATION_MAX_ATTEMPTS', 5)
+    stats = {'sent': 0, 'retried': 0, 'failed': 0}
+    
+    for _ in range(max_batches):
+        now = timezone.now()
+        delivered = 0
+        
+        channels = (
+            Notification.objects.filter(status=Notification.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by()
+            .values_list('channel', flat=True)
+            .distinct()
+        )
+        for channel_name in list(channels):
+            batch = _claim_batch(channel_name, now, batch_size)
+            if not batch:
+                continue
+            
+            # 발송은 트랜잭션 밖에서 (느린 SMTP/웹훅 동안 행 잠금을 잡지 않음)
+            try:
+                results = get_channel(channel_name).send_batch(batch)
+            except Exception as e:
+                results = {notification.id: str(e) for notification in batch}
+            
+            _apply_results(batch, results, timezone.now(), max_attempts, stats)
+            delivered += len(batch)
+        
+        if not delivered:
+            break
+    
+    if any(stats.values()):
+        logger.info(f"알림 발송: 성공 {stats['sent']}건, 재시도 예정 {stats['retried']}건, 실패 {stats['failed']}건")
+    return stats
+
+
+def _claim_batch(channel_name: str, now, batch_size: int) -> List[Notification]:
+    """발송할 알림 선점
+    
+    짧은 트랜잭션에서 잠근(skip_locked) 알림의 시도 횟수를 올리고 다음 시도 시각을
+    `ALERTS_NOTIFICATION_LEASE`초 뒤로 미룬 뒤 커밋한다. 다른 워커는 그동안 같은 알림을
+    가져가지 않고, 발송 중 워커가 죽으면 선점 시간이 지난 뒤 다시 발송된다.
+    """
+    lease = timedelta(seconds=getattr(settings, 'ALERTS_NOTIFICATION_LEASE', 300))
+    with transaction.atomic():
+        batch = list(
+            Notification.objects.select_for_update(skip_locked=True)
+            .filter(status=Notification.STATUS_PENDING, channel=channel_name, next_attempt_at__lte=now)
+            .order_by('id')[:batch_size]
+        )
+        if batch:
+            Notification.objects.filter(id__in=[notification.id for notification in batch]).update(
+                attempts=F('attempts') + 1,
+                next_attempt_at=now + lease
+            )
+    
+    for notification in batch:
+        notification.attempts += 1
+    return batch
+
+
+def purge_notifications(before, chunk_size: int = None) -> int:
+    """`before` 이전에 만들어진 발송 완료/실패 알림 삭제 (대기 중인 알림은 유지)"""
+    chunk_size = chunk_size or getattr(settings, 'RETENTION_CHUNK_SIZE', 1000)
+    return delete_in_chunks(
+        Notification.objects.filter(
+            status__in=[Notification.STATUS_SENT, Notification.STATUS_FAILED],
+            created_at__lt=before
+        ),
+        chunk_size
+    )
+
+
+def _apply_results(batch: List[Notification], results: Dict, now, max_attempts: int, stats: Dict[str, int]):
+    """발송 결과 반영 (일괄 업데이트, 시도 횟수는 선점할 때 이미 올림)"""
+    for notification in batch:
+        error = results.get(notification.id, '발송 결과가 없습니다.')
+        if error is None:
+            notification.status = Notification.STATUS_SENT
+            notification.sent_at = now
+            notification.last_error = ''
+            stats['sent'] += 1
+        elif notification.attempts >= max_attempts:
+            notification.status = Notification.STATUS_FAILED
+            notification.last_error = error
+            stats['failed'] += 1
+            logger.error(f"알림 {notification.id} 발송 실패 ({notification.channel}): {error}")
+        else:
+            notification.next_attempt_at = now + retry_delay(notification.attempts)
+            notification.last_error = error
+            stats['retried'] += 1
+    
+    Notification.objects.bulk_update(
+        batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    )
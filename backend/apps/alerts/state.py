@@ -0,0 +1,89 @@
+"""
+알림 발송 상태 (중복 알림 방지)
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Set
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from alerts.models import WatchNotificationState
+from catalog.models import Watch
+
+
+def default_cooldown() -> timedelta:
+    """기본 재알림 대기 시간"""
+    return timedelta(minutes=getattr(settings, 'ALERTS_COOLDOWN_MINUTES', 24 * 60))
+
+
+def select_alertable(watches: Iterable[Watch], price: Decimal, now: datetime = None) -> List[Watch]:
+    """알림을 보낼 Watch만 선택
+    
+    알린 적이 없거나, 마지막으로 알린 가격보다 낮아졌거나(새 최저가),
+    재알림 대기 시간이 지난 Watch만 반환한다. 상태는 한 번의 쿼리로 조회한다.
+    """
+    watches = list(watches)
+    alertable_ids = alertable_watch_ids({watch.id: price for watch in watches}, now)
+    return [watch for watch in watches if watch.id in alertable_ids]
+
+
+def alertable_watch_ids(prices: Dict[int, Decimal], now: datetime = None) -> Set[int]:
+    """Watch ID별 현재 가격 중 알림을 보낼 Watch ID (select_alertable과 같은 규칙, 한 번의 쿼리)"""
+    if not prices:
+        return set()
+    
+    now = now or timezone.now()
+    states = WatchNotificationState.objects.in_bulk(list(prices))
+    cooldown = default_cooldown()
+    
+    alertable = set()
+    for watch_id, price in prices.items():
+        state = states.get(watch_id)
+        if (
+            state is None
+            or price < state.last_alerted_price
+            or now - state.last_alerted_at >= (state.cooldown or cooldown)
+        ):
+            alertable.add(watch_id)
+    return alertable
+
+
+def claim_alerts(watches: Iterable[Watch], price: Decimal, now: datetime = None) -> List[Watch]:
+    """알림을 보낼 Watch를 골라 발송 상태를 먼저 기록 (호출자의 `transaction.atomic` 안에서 사용)
+    
+    Watch 행을 ID 순서로 잠근(select_for_update) 뒤 상태를 읽고 곧바로 기록하므로, 같은 Watch를
+    동시에 평가하는 다른 작업은 잠금이 풀린 뒤 기록된 상태를 보고 건너뛴다. 이후 알림 등록이
+    실패하거나 취소되면 같은 트랜잭션이 롤백되어 기록도 함께 취소된다.
+    """
+    watches = list(watches)
+    if not watches:
+        return []
+    
+    locked_ids = set(
+        Watch.objects.select_for_update()
+        .filter(id__in=[watch.id for watch in watches])
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    alertable = select_alertable([watch for watch in watches if watch.id in locked_ids], price, now)
+    record_alerts(alertable, price, now)
+    return alertable
+
+
+def record_alerts(watches: Iterable[Watch], price: Decimal, now: datetime = None):
+    """알림 발송 상태 일괄 기록"""
+    watch_ids = [watch.id for watch in watches]
+    if not watch_ids:
+        return
+    
+    now = now or timezone.now()
+    WatchNotificationState.objects.bulk_create(
+        [
+            WatchNotificationState(watch_id=watch_id, last_alerted_price=price, last_alerted_at=now)
+            for watch_id in watch_ids
+        ],
+        update_conflicts=True,
+        unique_fields=['watch'],
+        update_fields=['last_alerted_price', 'last_alerted_at']
+    )
+    WatchNotificationState.objects.filter(watch_id__in=watch_ids).update(alert_count=F('alert_count') + 1)
@@ -1,134 +1,340 @@
 """
 알림 태스크
 """
+import asyncio
 import logging
+import time
+from datetime import timedelta
 from decimal import Decimal
-from celery import shared_task
-from django.utils import timezone
-from django.core.mail import send_mail
+from typing import List, Optional, Set, Tuple
+from celery import chord, group, shared_task
+from celery.result import GroupResult
 from django.conf import settings
-from catalog.models import Watch, Product, Offer
+from django.db import transaction
+from django.utils import timezone
+from catalog.models import Watch, Product, Offer, ProductBestPrice
+from catalog.providers.health import provider_health
 from catalog.providers.mock import MockProvider
-from catalog.services.matching import ProductMatcher
+from catalog.providers.ratelimit import BACKGROUND, rate_limiters
+from catalog.services.ingest import ingest_offers
+from catalog.services.pricing import refresh_best_prices
+from catalog.services.retention import cleanup_old_data as cleanup_catalog_data
+from core.runtime import runtime
+from .delivery import deliver_pending, purge_notifications, queue_price_alerts
+from .state import alertable_watch_ids, claim_alerts
+from .watch_index import get_watch_index
 
 logger = logging.getLogger(__name__)
 
+# 프로세스 수명 동안 유지되는 스캔용 프로바이더
+_scan_provider = None
+
 
 @shared_task(bind=True, name='alerts.scan_watches')
 def scan_watches(self):
-    """활성 Watch 스캔 및 알림 전송"""
+    """활성 Watch 스캔 코디네이터
+    
+    Watch가 걸린 상품을 상품 ID 구간(keyset) 샤드로 나누고, 샤드별 태스크를
+    chord로 여러 워커에 분산한다. 샤드 결과는 `finalize_watch_scan`에서 집계한다.
+    """
     logger.info("Watch 스캔 시작")
     
     try:
-        # 활성 Watch 조회
-        active_watches = Watch.objects.filter(is_active=True).select_related('product')
+        # Watch가 걸린 상품 목록
+        product_ids = list(
+            Watch.objects.filter(is_active=True)
+            .order_by('product_id')
+            .values_list('product_id', flat=True)
+            .distinct()
+        )
         
-        if not active_watches.exists():
+        if not product_ids:
             logger.info("활성 Watch가 없습니다.")
             return
         
-        logger.info(f"활성 Watch {active_watches.count()}개 발견")
+        shards = shard_ranges(product_ids, getattr(settings, 'ALERTS_SCAN_SHARD_SIZE', 200))
+        logger.info(f"Watch 대상 상품 {len(product_ids)}개, 샤드 {len(shards)}개로 분산")
         
-        # Mock 프로바이더로 최신 오퍼 갱신
-        mock_provider = MockProvider()
-        matcher = ProductMatcher()
+        header = group(scan_watch_shard.s(first_id, last_id) for first_id, last_id in shards)
+        workflow = chord(header, finalize_watch_scan.s(started_at=time.time()))
         
-        for watch in active_watches:
-            try:
-                # 상품 관련 오퍼 갱신
-                update_product_offers(watch.product, mock_provider)
-                
-                # 가격 체크 및 알림
-                check_price_and_alert(watch)
-                
-            except Exception as e:
-                logger.error(f"Watch {watch.id} 처리 중 오류: {str(e)}")
-                continue
+        if self.app.conf.task_always_eager:
+            # 개발용 동기 실행: 샤드를 차례로 실행하고 집계 결과 반환
+            return workflow.apply().get()
         
-        logger.info("Watch 스캔 완료")
+        result = workflow.apply_async()
+        
+        # 진행률 조회를 위해 그룹 결과 저장
+        group_id = None
+        if result.parent is not None:
+            result.parent.save()
+            group_id = result.parent.id
+        
+        return {'group_id': group_id, 'callback_id': result.id, 'shards': len(shards), 'products': len(product_ids)}
         
     except Exception as e:
         logger.error(f"Watch 스캔 중 오류: {str(e)}")
         raise
 
 
-def update_product_offers(product: Product, provider):
-    """상품의 최신 오퍼 갱신"""
+def shard_ranges(product_ids: List[int], shard_size: int) -> List[Tuple[int, int]]:
+    """정렬된 상품 ID를 (첫 ID, 마지막 ID) 구간 샤드로 분할"""
+    shard_size = max(1, shard_size)
+    return [
+        (product_ids[start], product_ids[min(start + shard_size, len(product_ids)) - 1])
+        for start in range(0, len(product_ids), shard_size)
+    ]
+
+
+@shared_task(bind=True, name='alerts.scan_watch_shard')
+def scan_watch_shard(self, first_id: int, last_id: int):
+    """상품 ID 구간 샤드 스캔"""
+    started_at = time.time()
+    product_ids = list(
+        Watch.objects.filter(is_active=True, product_id__gte=first_id, product_id__lte=last_id)
+        .order_by('product_id')
+        .values_list('product_id', flat=True)
+        .distinct()
+    )
+    
+    # Mock 프로바이더로 최신 오퍼 갱신
+    stats = scan_products(product_ids, get_scan_provider())
+    stats.update({
+        'shard': [first_id, last_id],
+        'elapsed': round(time.time() - started_at, 3)
+    })
+    logger.info(
+        f"샤드 [{first_id}, {last_id}] 스캔 완료: 상품 {stats['products']}개, "
+        f"알림 {stats['alerts']}건, {stats['elapsed']}초"
+    )
+    return stats
+
+
+@shared_task(bind=True, name='alerts.finalize_watch_scan')
+def finalize_watch_scan(self, shard_stats: List[dict], started_at: float = None):
+    """샤드별 스캔 결과 집계"""
+    totals = {'products': 0, 'watches': 0, 'alerts': 0, 'errors': 0}
+    for stats in shard_stats:
+        for key in totals:
+            totals[key] += stats.get(key, 0)
+    
+    totals['shards'] = len(shard_stats)
+    totals['slowest_shard'] = max((stats.get('elapsed', 0) for stats in shard_stats), default=0)
+    if started_at is not None:
+        totals['elapsed'] = round(time.time() - started_at, 3)
+    
+    logger.info(
+        f"Watch 스캔 완료: 샤드 {totals['shards']}개, 상품 {totals['products']}개, "
+        f"Watch {totals['watches']}개 평가, 알림 {totals['alerts']}건, 오류 {totals['errors']}건"
+    )
+    return {'totals': totals, 'shards': shard_stats}
+
+
+def get_scan_progress(group_id: str) -> Optional[dict]:
+    """샤드 스캔 진행률 조회 (scan_watches가 반환한 group_id 기준)"""
+    group_result = GroupResult.restore(group_id)
+    if group_result is None:
+        return None
+    return {
+        'completed': group_result.completed_count(),
+        'total': len(group_result.results),
+        'failed': group_result.failed()
+    }
+
+
+def get_scan_provider():
+    """스캔용 프로바이더 (프로세스당 1개 유지)"""
+    global _scan_provider
+    if _scan_provider is None:
+        _scan_provider = MockProvider()
+    return _scan_provider
+
+
+def scan_products(product_ids, provider) -> dict:
+    """상품별 오퍼 갱신 후 해당 상품의 Watch 일괄 평가
+    
+    프로바이더 검색은 워커 런타임 루프에서 동시에 실행하고, 검색된 오퍼는
+    한 번에 upsert한 뒤 최저가가 내려간 상품과 `find_due_products`가 고른 상품의
+    Watch만 평가한다.
+    """
+    stats = {'products': 0, 'watches': 0, 'alerts': 0, 'errors': 0}
+    products = list(Product.objects.filter(id__in=product_ids).order_by('id'))
+    
+    # 상품 검색 동시 실행 (상품당 1회)
+    search_results = runtime.run_many(
+        (_scan_search(provider, product.name) for product in products),
+        concurrency=getattr(settings, 'ALERTS_SCAN_CONCURRENCY', 8)
+    )
+    
+    # 검색 결과를 모아 한 번에 저장
+    searched = []
+    items = []
+    for product, search_result in zip(products, search_results):
+        if isinstance(search_result, Exception):
+            logger.error(f"상품 {product.id} 검색 중 오류: {str(search_result)}")
+            stats['errors'] += 1
+            continue
+        searched.append(product)
+        items.extend((product.id, record) for record in search_result.offers)
+    
     try:
-        # 상품명으로 검색하여 최신 오퍼 가져오기
-        # 동기 방식으로 변경 (Celery 태스크는 동기 함수여야 함)
-        import asyncio
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # 가격 하락 이벤트 대신 아래에서 직접 평가
+        ingest_result = ingest_offers(items, emit_events=False)
+    except Exception as e:
+        logger.error(f"오퍼 일괄 저장 중 오류: {str(e)}")
+        stats['errors'] += len(searched)
+        return stats
+    
+    stats['products'] = len(searched)
+    
+    # 최저가가 내려간 상품과, 가격 변동 없이도 알림을 보낼 Watch가 있는 상품만 평가
+    due = find_due_products([product.id for product in searched if product.id not in ingest_result.price_drops])
+    for product in searched:
+        if product.id not in ingest_result.price_drops and product.id not in due:
+            continue
         
         try:
-            search_result = loop.run_until_complete(provider.search(product.name))
-        finally:
-            loop.close()
-        
-        if not search_result.offers:
-            logger.info(f"상품 {product.id}에 대한 오퍼를 찾을 수 없습니다.")
-            return
+            # 가격 체크 및 알림
+            checked, alerted = evaluate_product_watches(product)
+            stats['watches'] += checked
+            stats['alerts'] += alerted
+            
+        except Exception as e:
+            logger.error(f"상품 {product.id} 처리 중 오류: {str(e)}")
+            stats['errors'] += 1
+            continue
+    
+    return stats
+
+
+async def _scan_search(provider, keyword: str):
+    """스캔용 검색 (속도 제한 대기열에서 사용자 검색보다 뒤로 밀림)
+    
+    회로가 열린 프로바이더는 호출하지 않고 CircuitOpenError로 실패 처리한다. 토큰을 받은 뒤의
+    검색은 프로바이더 타임아웃(`get_timeout`)을 넘으면 TimeoutError로 실패해, 응답하지 않는
+    호출 하나가 샤드 워커를 붙잡지 않는다.
+    """
+    with provider_health.get(provider).track() as call:
+        await rate_limiters.acquire(provider, BACKGROUND)
+        call.start()
+        return await asyncio.wait_for(provider.search(keyword), timeout=provider.get_timeout())
+
+
+def find_due_products(product_ids: List[int]) -> Set[int]:
+    """가격 하락 없이도 평가가 필요한 상품 ID
+    
+    목표가 인덱스에서 현재 최저가 이상인 Watch를 찾고, 그중 알림을 보낼 수 있는 Watch
+    (목표가를 올리거나 새로 만든 Watch, 놓친 가격 하락 이벤트, 재알림 대기 시간이 지난 Watch)가
+    있는 상품을 고른다. 그래서 가격이 그대로여도 대기 시간이 지나면 주기 스캔에서 다시 알린다.
+    최저가와 알림 상태는 각각 한 번의 쿼리로 조회한다.
+    """
+    if not product_ids:
+        return set()
+    
+    index = get_watch_index()
+    prices = {}
+    products_by_watch = {}
+    best_prices = ProductBestPrice.objects.filter(
+        product_id__in=product_ids, offer__isnull=False
+    ).values_list('product_id', 'total_price')
+    for product_id, total_price in best_prices:
+        for watch_id in index.watches_at_or_above(product_id, total_price):
+            prices[watch_id] = total_price
+            products_by_watch[watch_id] = product_id
+    
+    return {products_by_watch[watch_id] for watch_id in alertable_watch_ids(prices)}
+
+
+def get_best_price_record(product: Product):
+    """상품 최저가 조회 (최저가 테이블에 없으면 다시 계산)"""
+    record = ProductBestPrice.objects.select_related('offer').filter(product=product).first()
+    if record is None and refresh_best_prices([product.id]):
+        record = ProductBestPrice.objects.select_related('offer').filter(product=product).first()
+    return record
+
+
+def evaluate_product_watches(product: Product):
+    """상품의 활성 Watch를 현재 최저가로 일괄 평가
+    
+    목표가 인덱스에서 목표가 >= 최저가인 Watch를 한 번에 찾아 그 Watch만 조회하며,
+    (평가한 Watch 수, 알림 수)를 반환한다.
+    """
+    record = get_best_price_record(product)
+    if record is None or record.offer is None:
+        logger.info(f"상품 {product.id}에 대한 오퍼가 없습니다.")
+        return 0, 0
+    
+    index = get_watch_index()
+    checked = index.count(product.id)
+    triggered_ids = index.watches_at_or_above(product.id, record.total_price)
+    if not triggered_ids:
+        return checked, 0
+    
+    triggered = Watch.objects.filter(
+        id__in=triggered_ids, is_active=True, target_price__gte=record.total_price
+    ).order_by('id')
+    
+    with transaction.atomic():
+        # 새 최저가이거나 재알림 대기 시간이 지난 Watch만 선점 (동시 평가 시 한 번만 알림)
+        alertable = claim_alerts(triggered, record.total_price)
+        for watch in alertable:
+            watch.product = product
+            logger.info(f"Watch {watch.id} 목표가 달성: {record.total_price}원 <= {watch.target_price}원")
         
-        # 기존 오퍼와 비교하여 새로운 오퍼만 추가
-        existing_urls = set(Offer.objects.filter(product=product).values_list('url', flat=True))
-        
-        for offer_like in search_result.offers:
-            if offer_like.url not in existing_urls:
-                # 새 오퍼 생성
-                offer = Offer.objects.create(
-                    product=product,
-                    marketplace=offer_like.marketplace,
-                    seller=offer_like.seller,
-                    price=offer_like.price,
-                    shipping_fee=offer_like.shipping_fee,
-                    url=offer_like.url,
-                    affiliate_url=offer_like.affiliate_url,
-                    fetched_at=timezone.now()
-                )
-                
-                # 가격 히스토리 기록
-                from catalog.models import PriceHistory
-                PriceHistory.objects.create(
-                    offer=offer,
-                    price=offer.price,
-                    total_price=offer.total_price,
-                    recorded_at=timezone.now()
-                )
-                
-                logger.info(f"새 오퍼 생성: {offer.marketplace} - {offer.price}원")
+        # 알림 일괄 등록 (발송은 커밋 후 알림 큐에서 처리)
+        queued = queue_price_alerts(alertable, record.offer, record.total_price)
+        if len(queued) < len(alertable):
+            # 발송 채널이 없으면 선점 기록도 취소
+            transaction.set_rollback(True)
+            return checked, 0
+    return checked, len(queued)
+
+
+def update_product_offers(product: Product, provider):
+    """상품의 최신 오퍼 갱신"""
+    try:
+        # 상품명으로 검색하여 최신 오퍼 가져오기 (워커 런타임 루프에서 실행, 타임아웃 적용)
+        search_result = runtime.run(_scan_search(provider, product.name))
+        save_product_offers(product, search_result.offers)
         
     except Exception as e:
         logger.error(f"상품 {product.id} 오퍼 갱신 중 오류: {str(e)}")
 
 
+def save_product_offers(product: Product, records):
+    """검색된 오퍼 저장 (상품, URL 기준 일괄 upsert)"""
+    if not records:
+        logger.info(f"상품 {product.id}에 대한 오퍼를 찾을 수 없습니다.")
+        return
+    
+    ingest_offers((product.id, record) for record in records)
+
+
 def check_price_and_alert(watch: Watch):
     """가격 체크 및 알림 전송"""
     try:
-        # 상품의 최신 오퍼 조회
-        latest_offers = Offer.objects.filter(
-            product=watch.product
-        ).order_by('-fetched_at')[:5]
+        # 상품 최저가 조회
+        record = get_best_price_record(watch.product)
         
-        if not latest_offers.exists():
+        if record is None or record.offer is None:
             logger.info(f"Watch {watch.id}에 대한 최신 오퍼가 없습니다.")
             return
         
-        # 최저가 찾기
-        best_offer = min(latest_offers, key=lambda x: x.total_price)
-        best_total_price = best_offer.total_price
+        best_total_price = record.total_price
         
         # 목표가 이하인지 확인
         if best_total_price <= watch.target_price:
             logger.info(f"Watch {watch.id} 목표가 달성: {best_total_price}원 <= {watch.target_price}원")
             
-            # 알림 전송
-            send_price_alert(watch, best_offer, best_total_price)
-            
-            # Watch 비활성화 (선택사항)
-            # watch.is_active = False
-            # watch.save()
+            with transaction.atomic():
+                # 이미 같은 가격 이하로 알린 경우 재알림 대기 시간 동안 생략 (동시 평가 시 한 번만 선점)
+                if not claim_alerts([watch], best_total_price):
+                    logger.debug(f"Watch {watch.id} 재알림 대기 중")
+                    return
+                
+                # 알림 전송 (등록되지 않으면 선점 기록 취소)
+                if not send_price_alert(watch, record.offer, best_total_price):
+                    transaction.set_rollback(True)
             
         else:
             logger.debug(f"Watch {watch.id} 목표가 미달성: {best_total_price}원 > {watch.target_price}원")
@@ -137,56 +343,52 @@ def check_price_and_alert(watch: Watch):
         logger.error(f"Watch {watch.id} 가격 체크 중 오류: {str(e)}")
 
 
-def send_price_alert(watch: Watch, offer: Offer, current_price: Decimal):
-    """가격 알림 전송"""
+def send_price_alert(watch: Watch, offer: Offer, current_price: Decimal) -> bool:
+    """가격 알림 등록 (발송은 알림 큐에서 일괄 처리, 성공 여부 반환)"""
     try:
-        subject = f"🎯 가격 알림: {watch.product.display_name}"
-        
-        message = f"""
-가격 모니터링 알림
+        return bool(queue_price_alerts([watch], offer, current_price))
+    except Exception as e:
+        logger.error(f"가격 알림 등록 중 오류: {str(e)}")
+        return False
 
-상품: {watch.product.display_name}
-목표가: {watch.target_price:,}원
-현재 최저가: {current_price:,}원
-마켓플레이스: {offer.marketplace}
-판매자: {offer.seller}
-상품 URL: {offer.url}
 
-목표가에 도달했습니다! 🎉
-        """.strip()
-        
-        # 개발 환경에서는 콘솔/파일 출력으로 대체
-        if settings.DEBUG:
-            logger.info(f"=== 가격 알림 ===\n{subject}\n{message}")
-            
-            # 파일에도 기록
-            import os
-            from pathlib import Path
-            
-            log_dir = Path(settings.BASE_DIR) / 'logs'
-            log_dir.mkdir(exist_ok=True)
-            
-            alert_log_file = log_dir / 'price_alerts.log'
-            with open(alert_log_file, 'a', encoding='utf-8') as f:
-                f.write(f"[{timezone.now()}] {subject}\n{message}\n{'='*50}\n")
-        
-        else:
-            # 프로덕션 환경에서는 이메일 전송
-            # 실제 구현 시 사용자 이메일 주소 필요
-            user_email = f"user_{watch.user_id}@example.com"  # 임시
-            
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user_email],
-                fail_silently=False,
-            )
-            
-            logger.info(f"가격 알림 이메일 전송 완료: {user_email}")
+@shared_task(bind=True, name='alerts.deliver_notifications')
+def deliver_notifications(self):
+    """대기 중인 알림을 채널별로 묶어 발송"""
+    return deliver_pending()
+
+
+@shared_task(bind=True, name='alerts.cleanup_old_data')
+def cleanup_old_data(self):
+    """보존 기간이 지난 데이터 정리 (매일 자정)
     
-    except Exception as e:
-        logger.error(f"가격 알림 전송 중 오류: {str(e)}")
+    오퍼/가격 히스토리는 일별 요약으로 합산한 뒤 PK 구간별로 나눠 삭제하고,
+    발송이 끝난 알림도 `RETENTION_NOTIFICATION_DAYS`가 지나면 삭제한다.
+    """
+    logger.info("데이터 정리 시작")
+    now = timezone.now()
+    stats = cleanup_catalog_data(now=now)
+    
+    notification_days = getattr(settings, 'RETENTION_NOTIFICATION_DAYS', 30)
+    stats['notifications'] = (
+        purge_notifications(now - timedelta(days=notification_days)) if notification_days else 0
+    )
+    
+    logger.info(f"데이터 정리 완료: {stats}")
+    return stats
+
+
+@shared_task(bind=True, name='alerts.evaluate_product_alerts')
+def evaluate_product_alerts(self, product_id: int):
+    """가격 하락 이벤트로 상품의 Watch 평가"""
+    product = Product.objects.filter(id=product_id).first()
+    if product is None:
+        logger.warning(f"상품 {product_id}를 찾을 수 없습니다.")
+        return
+    
+    checked, alerted = evaluate_product_watches(product)
+    logger.info(f"상품 {product_id} 가격 하락 평가: Watch {checked}개, 알림 {alerted}건")
+    return {'product_id': product_id, 'watches': checked, 'alerts': alerted}
 
 
 @shared_task(bind=True, name='alerts.scan_single_watch')
@@ -197,8 +399,7 @@ def scan_single_watch(self, watch_id: int):
         logger.info(f"단일 Watch {watch_id} 스캔 시작")
         
         # Mock 프로바이더로 오퍼 갱신
-        mock_provider = MockProvider()
-        update_product_offers(watch.product, mock_provider)
+        update_product_offers(watch.product, get_scan_provider())
         
         # 가격 체크 및 알림
         check_price_and_alert(watch)
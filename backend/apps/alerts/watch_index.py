@@ -0,0 +1,171 @@
+"""
+Watch 목표가 인덱스
+"""
+import bisect
+import logging
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from catalog.models import Watch
+
+logger = logging.getLogger(__name__)
+
+
+class TargetPriceIndex:
+    """상품별 활성 Watch 목표가 인덱스 (프로세스 내)
+    
+    상품마다 (목표가, Watch ID)를 정렬된 리스트로 유지해, 새 최저가 P에 대해
+    목표가 >= P인 Watch를 이진 탐색 한 번으로 찾는다. 다른 프로세스의 변경은
+    시그널로 전달되지 않으므로 상품별 항목은 ttl초가 지나면 DB에서 다시 읽는다.
+    """
+    
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, List[Tuple[Decimal, int]]]] = {}
+        self._lock = threading.Lock()
+    
+    def watches_at_or_above(self, product_id: int, price: Decimal) -> List[int]:
+        """목표가가 price 이상인 활성 Watch ID 목록"""
+        entries = self._load(product_id)
+        start = bisect.bisect_left(entries, (Decimal(price), 0))
+        return [watch_id for _, watch_id in entries[start:]]
+    
+    def count(self, product_id: int) -> int:
+        """상품의 활성 Watch 수"""
+        return len(self._load(product_id))
+    
+    def add(self, watch_id: int, product_id: int, target_price: Decimal):
+        """Watch 추가 (목표가 변경 시 기존 항목 교체)"""
+        with self._lock:
+            cached = self._entries.get(product_id)
+            if cached is None:
+                return
+            entries = [entry for entry in cached[1] if entry[1] != watch_id]
+            bisect.insort(entries, (Decimal(target_price), watch_id))
+            self._entries[product_id] = (cached[0], entries)
+    
+    def remove(self, watch_id: int, product_id: int):
+        """Watch 제거"""
+        with self._lock:
+            cached = self._entries.get(product_id)
+            if cached is None:
+                return
+            self._entries[product_id] = (cached[0], [entry for entry in cached[1] if entry[1] != watch_id])
+    
+    def invalidate(self, product_id: Optional[int] = None):
+        """상품(또는 전체) 항목 무효화"""
+        with self._lock:
+            if product_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(product_id, None)
+    
+    def _load(self, product_id: int) -> List[Tuple[Decimal, int]]:
+        cached = self._entries.get(product_id)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        
+        entries = sorted(
+            Watch.objects.filter(product_id=product_id, is_active=True)
+            .order_by()
+            .values_list('target_price', 'id')
+        )
+        with self._lock:
+            self._entries[product_id] = (time.monotonic(), entries)
+        return entries
+
+
+class RedisTargetPriceIndex:
+    """상품별 활성 Watch 목표가 인덱스 (Redis sorted set)
+    
+    상품마다 `{prefix}:{product_id}` sorted set에 Watch ID를 목표가 점수로 저장해
+    여러 프로세스가 같은 인덱스를 공유한다. 적재 여부는 점수 -inf인 표식 멤버로 구분한다.
+    프로세스 내 인덱스처럼 키는 ttl초 뒤 만료되어 다시 DB에서 적재되며, 적재는 임시 키에
+    채운 뒤 RENAME으로 교체하므로 다른 프로세스가 반쯤 채워진 인덱스를 읽지 않는다.
+    """
+    
+    LOADED_MARKER = '__loaded__'
+    
+    # 적재된 키에만 추가 (만료 직후 추가로 표식/TTL 없는 키가 생기지 않도록)
+    ADD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+end
+return 0
+"""
+    
+    def __init__(self, client, prefix: str = 'alerts:watch-index', ttl: int = 60):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self._add = client.register_script(self.ADD_SCRIPT)
+    
+    def watches_at_or_above(self, product_id: int, price: Decimal) -> List[int]:
+        """목표가가 price 이상인 활성 Watch ID 목록"""
+        key = self._load(product_id)
+        return [int(member) for member in self.client.zrangebyscore(key, float(price), '+inf')]
+    
+    def count(self, product_id: int) -> int:
+        """상품의 활성 Watch 수"""
+        key = self._load(product_id)
+        return self.client.zcount(key, '(-inf', '+inf')
+    
+    def add(self, watch_id: int, product_id: int, target_price: Decimal):
+        """Watch 추가 (목표가 변경 시 점수 갱신)"""
+        self._add(keys=[self._key(product_id)], args=[float(target_price), str(watch_id)])
+    
+    def remove(self, watch_id: int, product_id: int):
+        """Watch 제거"""
+        self.client.zrem(self._key(product_id), str(watch_id))
+    
+    def invalidate(self, product_id: Optional[int] = None):
+        """상품(또는 전체) 항목 무효화"""
+        if product_id is not None:
+            self.client.delete(self._key(product_id))
+            return
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(key)
+    
+    def _key(self, product_id: int) -> str:
+        return f"{self.prefix}:{product_id}"
+    
+    def _load(self, product_id: int) -> str:
+        key = self._key(product_id)
+        if self.client.exists(key):
+            return key
+        
+        mapping = {
+            str(watch_id): float(target_price)
+            for target_price, watch_id in Watch.objects.filter(product_id=product_id, is_active=True)
+            .values_list('target_price', 'id')
+        }
+        mapping[self.LOADED_MARKER] = float('-inf')
+        
+        build_key = f"{key}:build:{uuid.uuid4().hex}"
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zadd(build_key, mapping)
+        pipe.expire(build_key, self.ttl)
+        pipe.rename(build_key, key)
+        pipe.execute()
+        return key
+
+
+_watch_index = None
+
+
+def get_watch_index():
+    """설정에 따른 전역 목표가 인덱스"""
+    global _watch_index
+    if _watch_index is None:
+        if getattr(settings, 'ALERTS_WATCH_INDEX_REDIS', False):
+            import redis
+            _watch_index = RedisTargetPriceIndex(
+                redis.Redis.from_url(settings.REDIS_URL),
+                ttl=getattr(settings, 'ALERTS_WATCH_INDEX_TTL', 60)
+            )
+        else:
+            _watch_index = TargetPriceIndex(ttl=getattr(settings, 'ALERTS_WATCH_INDEX_TTL', 60))
+    return _watch_index
@@ -3,7 +3,7 @@ Catalog admin configuration
 """
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Product, Offer, PriceHistory, Watch
+from .models import Product, Offer, PriceHistory, PriceHistoryDaily, Watch
 
 
 @admin.register(Product)
@@ -84,6 +84,15 @@ class PriceHistoryAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PriceHistoryDaily)
+class PriceHistoryDailyAdmin(admin.ModelAdmin):
+    """일별 가격 요약 관리"""
+    list_display = ['product', 'marketplace', 'date', 'min_total_price', 'max_total_price', 'close_total_price', 'sample_count']
+    list_filter = ['marketplace', 'date']
+    search_fields = ['product__name', 'product__brand', 'product__model_code']
+    ordering = ['-date']
+
+
 @admin.register(Watch)
 class WatchAdmin(admin.ModelAdmin):
     """가격 모니터링 관리"""
@@ -0,0 +1,28 @@
+"""
+상품 최저가 테이블 재구성 명령
+"""
+from django.core.management.base import BaseCommand
+from catalog.services.pricing import rebuild_best_prices, refresh_best_prices
+
+
+class Command(BaseCommand):
+    """상품 최저가 테이블(catalog_productbestprice)을 오퍼 기준으로 다시 계산"""
+    help = '상품 최저가 테이블을 오퍼 기준으로 다시 계산합니다.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product-id',
+            type=int,
+            action='append',
+            dest='product_ids',
+            help='특정 상품만 다시 계산 (여러 번 지정 가능)'
+        )
+    
+    def handle(self, *args, **options):
+        product_ids = options.get('product_ids')
+        if product_ids:
+            updated = refresh_best_prices(product_ids)
+        else:
+            updated = rebuild_best_prices()
+        
+        self.stdout.write(self.style.SUCCESS(f"최저가 테이블 갱신 완료: {updated}개 상품"))
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+BATCH_SIZE = 1000
+
+
+def backfill_best_prices(apps, schema_editor):
+    """기존 오퍼로 최저가 테이블 채우기 (이후 갱신은 오퍼 저장 경로에서 처리)
+
+    상품별로 총 가격(가격 + 배송비)이 가장 낮은 오퍼(같으면 최근 수집)를 고른다.
+    """
+    Offer = apps.get_model("catalog", "Offer")
+    ProductBestPrice = apps.get_model("catalog", "ProductBestPrice")
+
+    offers = (
+        Offer.objects.alias(total=F("price") + F("shipping_fee"))
+        .order_by("product_id", "total", "-fetched_at")
+        .values_list("id", "product_id", "price", "shipping_fee", "marketplace", "seller")
+    )
+    records = []
+    current = None
+    for offer_id, product_id, price, shipping_fee, marketplace, seller in offers.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        if current is None or current.product_id != product_id:
+            current = ProductBestPrice(
+                product_id=product_id,
+                offer_id=offer_id,
+                price=price,
+                total_price=price + shipping_fee,
+                min_price=price,
+                marketplace=marketplace,
+                seller=seller,
+                offer_count=0,
+            )
+            records.append(current)
+        current.min_price = min(current.min_price, price)
+        current.offer_count += 1
+
+        if len(records) > BATCH_SIZE:
+            ProductBestPrice.objects.bulk_create(records[:-1])
+            records = records[-1:]
+
+    ProductBestPrice.objects.bulk_create(records)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductBestPrice",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        help_text="연결된 상품",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="best_price_record",
+                        serialize=False,
+                        to="catalog.product",
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=0,
+                        help_text="최저 총 가격 오퍼의 가격",
+                        max_digits=10,
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=0,
+                        help_text="최저 총 가격 (가격 + 배송비)",
+                        max_digits=11,
+                    ),
+                ),
+                (
+                    "min_price",
+                    models.DecimalField(
+                        decimal_places=0,
+                        help_text="전체 오퍼 중 최저 가격",
+                        max_digits=10,
+                    ),
+                ),
+                (
+                    "marketplace",
+                    models.CharField(
+                        help_text="최저 총 가격 오퍼의 마켓플레이스", max_length=50
+                    ),
+                ),
+                (
+                    "seller",
+                    models.CharField(
+                        help_text="최저 총 가격 오퍼의 판매자", max_length=100
+                    ),
+                ),
+                (
+                    "offer_count",
+                    models.PositiveIntegerField(default=0, help_text="오퍼 개수"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "offer",
+                    models.ForeignKey(
+                        help_text="최저 총 가격 오퍼",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="catalog.offer",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "catalog_productbestprice",
+                "indexes": [
+                    models.Index(
+                        fields=["total_price"], name="catalog_pro_total_p_e7c3ed_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_best_prices, migrations.RunPython.noop),
+    ]
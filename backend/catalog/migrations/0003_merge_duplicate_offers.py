@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:24
+
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def merge_duplicate_offers(apps, schema_editor):
+    """같은 (상품, URL) 오퍼를 가장 최근 수집 오퍼 하나로 합침 (가격 히스토리는 유지)"""
+    Offer = apps.get_model('catalog', 'Offer')
+    PriceHistory = apps.get_model('catalog', 'PriceHistory')
+    
+    duplicates = (
+        Offer.objects.values('product_id', 'url')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    product_ids = set()
+    for duplicate in duplicates.iterator():
+        offer_ids = list(
+            Offer.objects.filter(product_id=duplicate['product_id'], url=duplicate['url'])
+            .order_by('-fetched_at', '-id')
+            .values_list('id', flat=True)
+        )
+        keep_id, stale_ids = offer_ids[0], offer_ids[1:]
+        PriceHistory.objects.filter(offer_id__in=stale_ids).update(offer_id=keep_id)
+        Offer.objects.filter(id__in=stale_ids).delete()
+        product_ids.add(duplicate['product_id'])
+    
+    refresh_best_prices(apps, product_ids)
+
+
+def refresh_best_prices(apps, product_ids):
+    """오퍼가 합쳐진 상품의 최저가 행 다시 계산 (0002에서 채운 값에 삭제된 오퍼가 남지 않도록)"""
+    Offer = apps.get_model('catalog', 'Offer')
+    ProductBestPrice = apps.get_model('catalog', 'ProductBestPrice')
+    
+    for product_id in product_ids:
+        offers = list(
+            Offer.objects.filter(product_id=product_id)
+            .alias(total=F('price') + F('shipping_fee'))
+            .order_by('total', '-fetched_at')
+        )
+        ProductBestPrice.objects.filter(product_id=product_id).delete()
+        if not offers:
+            continue
+        best = offers[0]
+        ProductBestPrice.objects.create(
+            product_id=product_id,
+            offer_id=best.id,
+            price=best.price,
+            total_price=best.price + best.shipping_fee,
+            min_price=min(offer.price for offer in offers),
+            marketplace=best.marketplace,
+            seller=best.seller,
+            offer_count=len(offers)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0002_product_best_price"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_offers, migrations.RunPython.noop),
+    ]
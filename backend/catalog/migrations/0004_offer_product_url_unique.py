@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0003_merge_duplicate_offers"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="offer",
+            constraint=models.UniqueConstraint(
+                fields=("product", "url"), name="catalog_offer_product_url_uniq"
+            ),
+        ),
+    ]
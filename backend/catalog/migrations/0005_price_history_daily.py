@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0004_offer_product_url_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceHistoryDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "marketplace",
+                    models.CharField(help_text="마켓플레이스명", max_length=50),
+                ),
+                ("date", models.DateField(help_text="기록 날짜")),
+                (
+                    "min_total_price",
+                    models.DecimalField(
+                        decimal_places=0, help_text="일중 최저 총 가격", max_digits=11
+                    ),
+                ),
+                (
+                    "max_total_price",
+                    models.DecimalField(
+                        decimal_places=0, help_text="일중 최고 총 가격", max_digits=11
+                    ),
+                ),
+                (
+                    "close_total_price",
+                    models.DecimalField(
+                        decimal_places=0, help_text="일중 마지막 총 가격", max_digits=11
+                    ),
+                ),
+                ("closed_at", models.DateTimeField(help_text="마지막 기록 시각")),
+                (
+                    "sample_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="요약된 히스토리 건수"
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        help_text="연결된 상품",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_prices",
+                        to="catalog.product",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "catalog_pricehistorydaily",
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(
+                        fields=["product_id", "-date"],
+                        name="catalog_pri_product_bf85ca_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("product", "marketplace", "date"),
+                        name="catalog_pricehistorydaily_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
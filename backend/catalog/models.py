@@ -67,6 +67,9 @@ class Offer(models.Model):
 
     class Meta:
         db_table = 'catalog_offer'
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'url'], name='catalog_offer_product_url_uniq'),
+        ]
         indexes = [
             models.Index(fields=['product_id', 'marketplace', '-fetched_at']),
             models.Index(fields=['marketplace', '-fetched_at']),
@@ -82,6 +85,43 @@ class Offer(models.Model):
         return self.price + self.shipping_fee
 
 
+class ProductBestPrice(models.Model):
+    """상품별 최저가 모델 (오퍼 기준 비정규화 테이블)
+    
+    오퍼가 기록될 때 `catalog.services.pricing.refresh_best_prices`로 갱신한다.
+    """
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='best_price_record',
+        help_text="연결된 상품"
+    )
+    offer = models.ForeignKey(
+        Offer,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        help_text="최저 총 가격 오퍼"
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=0, help_text="최저 총 가격 오퍼의 가격")
+    total_price = models.DecimalField(max_digits=11, decimal_places=0, help_text="최저 총 가격 (가격 + 배송비)")
+    min_price = models.DecimalField(max_digits=10, decimal_places=0, help_text="전체 오퍼 중 최저 가격")
+    marketplace = models.CharField(max_length=50, help_text="최저 총 가격 오퍼의 마켓플레이스")
+    seller = models.CharField(max_length=100, help_text="최저 총 가격 오퍼의 판매자")
+    offer_count = models.PositiveIntegerField(default=0, help_text="오퍼 개수")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'catalog_productbestprice'
+        indexes = [
+            models.Index(fields=['total_price']),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} - {self.total_price:,}원 ({self.marketplace})"
+
+
 class PriceHistory(models.Model):
     """가격 히스토리 모델"""
     offer = models.ForeignKey(
@@ -116,6 +156,43 @@ class PriceHistory(models.Model):
         return f"{self.offer} - {self.price:,}원 ({self.recorded_at.strftime('%Y-%m-%d %H:%M')})"
 
 
+class PriceHistoryDaily(models.Model):
+    """일별 가격 요약 모델
+    
+    보존 기간이 지난 가격 히스토리를 상품/마켓플레이스/날짜별 총 가격 최저·최고·종가로
+    요약한 테이블. `catalog.services.retention`이 원본을 지우기 전에 채운다.
+    """
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='daily_prices',
+        help_text="연결된 상품"
+    )
+    marketplace = models.CharField(max_length=50, help_text="마켓플레이스명")
+    date = models.DateField(help_text="기록 날짜")
+    min_total_price = models.DecimalField(max_digits=11, decimal_places=0, help_text="일중 최저 총 가격")
+    max_total_price = models.DecimalField(max_digits=11, decimal_places=0, help_text="일중 최고 총 가격")
+    close_total_price = models.DecimalField(max_digits=11, decimal_places=0, help_text="일중 마지막 총 가격")
+    closed_at = models.DateTimeField(help_text="마지막 기록 시각")
+    sample_count = models.PositiveIntegerField(default=0, help_text="요약된 히스토리 건수")
+
+    class Meta:
+        db_table = 'catalog_pricehistorydaily'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product', 'marketplace', 'date'],
+                name='catalog_pricehistorydaily_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['product_id', '-date']),
+        ]
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.product_id} {self.marketplace} {self.date} - {self.close_total_price:,}원"
+
+
 class Watch(models.Model):
     """가격 모니터링 모델"""
     user_id = models.BigIntegerField(help_text="사용자 ID")
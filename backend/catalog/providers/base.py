@@ -1,10 +1,20 @@
 """
 프로바이더 공통 인터페이스
 """
+import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import AsyncIterator, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
 from decimal import Decimal
+from django.conf import settings
+from .health import CircuitOpenError, ProviderCall, provider_health
+from .hedge import hedgers
+from .ratelimit import INTERACTIVE, rate_limiters
+from .records import OfferRecord
+
+logger = logging.getLogger(__name__)
 
 
 class OfferLike(BaseModel):
@@ -28,16 +38,62 @@ class OfferLike(BaseModel):
 
 
 class SearchResult(BaseModel):
-    """검색 결과 스키마"""
-    offers: List[OfferLike] = Field(default_factory=list, description="검색된 오퍼 목록")
+    """검색 결과 스키마
+    
+    오퍼는 `OfferRecord`로 보관한다. 어댑터가 `OfferLike`나 dict를 넘기면 여기서 한 번만
+    변환하고, 이미 `OfferRecord`인 오퍼는 다시 검증하지 않는다.
+    """
+    offers: List[OfferRecord] = Field(default_factory=list, description="검색된 오퍼 목록")
     total_count: int = Field(0, description="총 검색 결과 수")
     marketplace: str = Field(..., description="검색한 마켓플레이스")
     search_time: float = Field(..., description="검색 소요 시간(초)")
+    
+    @field_validator('offers', mode='before')
+    @classmethod
+    def to_records(cls, offers):
+        """프로바이더 경계에서 오퍼를 OfferRecord로 변환"""
+        records = []
+        for offer in offers or ():
+            if isinstance(offer, OfferRecord):
+                records.append(offer)
+            elif isinstance(offer, OfferLike):
+                records.append(OfferRecord.from_offer_like(offer))
+            else:
+                records.append(OfferRecord.from_offer_like(OfferLike(**offer)))
+        return records
+
+
+class ProviderOutcome(BaseModel):
+    """프로바이더별 검색 결과 상태"""
+    provider: str = Field(..., description="프로바이더명")
+    status: str = Field(..., description="결과 상태 (ok, timeout, error)")
+    result: Optional[SearchResult] = Field(None, description="검색 결과 (성공 시)")
+    error: Optional[str] = Field(None, description="오류 메시지 (실패 시)")
+    elapsed: float = Field(0.0, description="소요 시간(초)")
+
+
+class FanOutResult(BaseModel):
+    """동시 검색(fan-out) 결과 스키마"""
+    results: List[SearchResult] = Field(default_factory=list, description="제시간에 응답한 검색 결과")
+    timed_out: List[str] = Field(default_factory=list, description="타임아웃된 프로바이더")
+    failed: Dict[str, str] = Field(default_factory=dict, description="오류가 발생한 프로바이더와 사유")
+    elapsed: float = Field(0.0, description="전체 소요 시간(초)")
+    
+    @property
+    def is_partial(self) -> bool:
+        """일부 프로바이더 결과가 누락되었는지 여부"""
+        return bool(self.timed_out or self.failed)
 
 
 class BaseProvider(ABC):
     """프로바이더 기본 클래스"""
     
+    # 프로바이더별 검색 타임아웃(초), 어댑터에서 재정의
+    timeout: float = 3.0
+    
+    # 프로바이더별 속도 제한 (마켓플레이스 API 한도에 맞게 어댑터에서 재정의, 비어 있으면 제한 없음)
+    rate_limit: Dict[str, Optional[int]] = {}
+    
     def __init__(self, name: str):
         self.name = name
     
@@ -55,17 +111,32 @@ class BaseProvider(ABC):
         """프로바이더명 반환"""
         return self.name
     
+    def get_timeout(self) -> float:
+        """검색 타임아웃(초) 반환"""
+        return self.timeout
+    
     def is_available(self) -> bool:
         """프로바이더 사용 가능 여부"""
         return True
     
+    def supports_hedging(self) -> bool:
+        """헤지 요청 허용 여부 (검색이 멱등이 아닌 어댑터는 False로 재정의)"""
+        return True
+    
+    async def hedge_search(self, keyword: str, **kwargs) -> SearchResult:
+        """헤지 요청용 검색 (기본: 같은 검색, 미러 엔드포인트가 있으면 재정의)"""
+        return await self.search(keyword, **kwargs)
+    
     def get_rate_limit_info(self) -> dict:
-        """속도 제한 정보"""
-        return {
-            'requests_per_minute': 60,
-            'requests_per_hour': 1000,
-            'cooldown_seconds': 0
-        }
+        """속도 제한 정보 (`ratelimit.rate_limiters`가 호출 전에 적용)
+        
+        `PROVIDER_RATE_LIMITS` 설정 > 어댑터의 `rate_limit` 순으로 적용하고, 둘 다 없는 값은
+        제한하지 않는다.
+        """
+        info = {'requests_per_minute': None, 'requests_per_hour': None, 'cooldown_seconds': 0}
+        info.update(self.rate_limit)
+        info.update(getattr(settings, 'PROVIDER_RATE_LIMITS', {}).get(self.name, {}))
+        return info
 
 
 class ProviderRegistry:
@@ -87,20 +158,119 @@ class ProviderRegistry:
         return list(self._providers.values())
     
     def get_available_providers(self) -> List[BaseProvider]:
-        """사용 가능한 프로바이더만 조회"""
-        return [p for p in self._providers.values() if p.is_available()]
+        """사용 가능한 프로바이더만 조회 (회로가 열린 프로바이더 제외)"""
+        return [
+            p for p in self._providers.values()
+            if p.is_available() and not provider_health.get(p).is_open()
+        ]
+    
+    def get_rate_limit_stats(self) -> Dict[str, dict]:
+        """프로바이더별 속도 제한 대기열 통계"""
+        return rate_limiters.stats()
+    
+    def get_health_stats(self) -> Dict[str, dict]:
+        """프로바이더별 회로 상태/오류율/지연 시간 통계"""
+        return provider_health.stats()
+    
+    def get_hedge_stats(self) -> Dict[str, dict]:
+        """프로바이더별 헤지 요청 통계"""
+        return hedgers.stats()
+    
+    async def search_provider(
+        self,
+        provider: BaseProvider,
+        keyword: str,
+        timeout: Optional[float] = None,
+        priority: int = INTERACTIVE,
+        **kwargs
+    ) -> ProviderOutcome:
+        """단일 프로바이더 검색 (타임아웃/오류를 결과 상태로 변환)
+        
+        속도 제한 대기열에서 토큰을 받은 뒤 검색하며, 대기 시간도 타임아웃에 포함된다.
+        결과는 회로 차단기에 기록되고, 회로가 열려 있으면 호출하지 않는다.
+        """
+        name = provider.get_name()
+        timeout = timeout if timeout is not None else provider.get_timeout()
+        started = time.monotonic()
+        
+        try:
+            with provider_health.get(provider).track() as call:
+                result = await asyncio.wait_for(
+                    self._rate_limited_search(provider, keyword, priority, call, **kwargs),
+                    timeout=timeout
+                )
+        except CircuitOpenError as e:
+            logger.info(f"프로바이더 {name} 회로 차단 중, 검색 건너뜀: {keyword}")
+            return ProviderOutcome(provider=name, status='error', error=str(e), elapsed=0.0)
+        except asyncio.TimeoutError:
+            elapsed = time.monotonic() - started
+            logger.warning(f"프로바이더 {name} 검색 타임아웃 ({timeout}초): {keyword}")
+            return ProviderOutcome(provider=name, status='timeout', elapsed=elapsed)
+        except Exception as e:
+            elapsed = time.monotonic() - started
+            logger.error(f"프로바이더 {name} 검색 중 오류: {str(e)}")
+            return ProviderOutcome(provider=name, status='error', error=str(e), elapsed=elapsed)
+        
+        return ProviderOutcome(
+            provider=name,
+            status='ok',
+            result=result,
+            elapsed=time.monotonic() - started
+        )
+    
+    async def _rate_limited_search(
+        self, provider: BaseProvider, keyword: str, priority: int, call: ProviderCall, **kwargs
+    ) -> SearchResult:
+        """속도 제한 토큰을 받은 뒤 검색 (토큰을 받은 시점부터 지연 시간 측정, 설정 시 헤지 요청)"""
+        await rate_limiters.acquire(provider, priority)
+        call.start()
+        return await hedgers.search(provider, keyword, priority, call, **kwargs)
+    
+    async def iter_fan_out(
+        self, keyword: str, timeout: Optional[float] = None, priority: int = INTERACTIVE, **kwargs
+    ) -> AsyncIterator[ProviderOutcome]:
+        """모든 프로바이더 동시 검색, 응답이 도착하는 순서대로 결과 반환"""
+        tasks = [
+            asyncio.ensure_future(
+                self.search_provider(provider, keyword, timeout=timeout, priority=priority, **kwargs)
+            )
+            for provider in self.get_available_providers()
+        ]
+        try:
+            for next_outcome in asyncio.as_completed(tasks):
+                yield await next_outcome
+        finally:
+            # 소비자가 중간에 중단한 경우 남은 검색 취소
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def fan_out(
+        self, keyword: str, timeout: Optional[float] = None, priority: int = INTERACTIVE, **kwargs
+    ) -> FanOutResult:
+        """모든 프로바이더 동시 검색
+        
+        각 프로바이더는 자체 타임아웃(`timeout` 지정 시 공통값)으로 실행되며,
+        제시간에 응답한 결과만 모으고 타임아웃/실패한 프로바이더는 별도로 기록한다.
+        """
+        started = time.monotonic()
+        fan_out_result = FanOutResult()
+        
+        async for outcome in self.iter_fan_out(keyword, timeout=timeout, priority=priority, **kwargs):
+            if outcome.status == 'ok':
+                fan_out_result.results.append(outcome.result)
+            elif outcome.status == 'timeout':
+                fan_out_result.timed_out.append(outcome.provider)
+            else:
+                fan_out_result.failed[outcome.provider] = outcome.error or ''
+        
+        fan_out_result.elapsed = time.monotonic() - started
+        return fan_out_result
     
     async def search_all(self, keyword: str, **kwargs) -> List[SearchResult]:
         """모든 프로바이더에서 검색"""
-        results = []
-        for provider in self.get_available_providers():
-            try:
-                result = await provider.search(keyword, **kwargs)
-                results.append(result)
-            except Exception as e:
-                # 로깅 추가 필요
-                continue
-        return results
+        fan_out_result = await self.fan_out(keyword, **kwargs)
+        return fan_out_result.results
 
 
 # 전역 프로바이더 레지스트리
@@ -0,0 +1,303 @@
+"""
+프로바이더 상태 추적 및 회로 차단기
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 회로 상태
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 프로바이더 호출을 건너뜀"""
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """정렬된 값 목록의 q 백분위수 (nearest-rank)"""
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+class ProviderHealth:
+    """프로바이더 하나의 최근 호출 기록과 회로 차단기
+    
+    최근 `window_seconds` 동안의 성공/실패와 지연 시간을 기록한다. 연속 실패가
+    `failure_threshold`번이거나, 표본이 `min_samples`개 이상일 때 오류율이
+    `error_rate_threshold` 이상이면 회로를 연다. 열린 회로는 `open_seconds` 뒤
+    반개방(half-open) 상태가 되어 한 번에 `half_open_probes`개의 시험 호출만 허용하고,
+    시험 호출이 성공하면 닫히고 실패하면 두 배(최대 `max_open_seconds`) 동안 다시 열린다.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 300,
+        max_samples: int = 500,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        min_samples: int = 10,
+        open_seconds: float = 30,
+        max_open_seconds: float = 300,
+        half_open_probes: int = 1
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_probes = half_open_probes
+        
+        # (기록 시각, 성공 여부, 지연 시간, 타임아웃 여부)
+        self._samples: Deque[Tuple[float, bool, float, bool]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.open_until = 0.0
+        self._current_open_seconds = open_seconds
+        self._probes_in_flight = 0
+        self.trips = 0
+    
+    def is_open(self, now: Optional[float] = None) -> bool:
+        """호출을 건너뛰어야 하는지 여부 (상태는 바꾸지 않음)"""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                return now < self.open_until
+            if self.state == HALF_OPEN:
+                return self._probes_in_flight >= self.half_open_probes
+            return False
+    
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """호출 허용 여부 (반개방 상태면 시험 호출 자리를 차지)"""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                if now < self.open_until:
+                    return False
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                logger.info(f"프로바이더 {self.name} 회로 반개방, 시험 호출 허용")
+            
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+    
+    def track(self) -> 'ProviderCall':
+        """호출 결과를 기록하는 컨텍스트 (회로가 열려 있으면 CircuitOpenError)"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"프로바이더 {self.name} 회로 차단 중")
+        return ProviderCall(self)
+    
+    def record_success(self, latency: float, now: Optional[float] = None):
+        """성공 기록"""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            self._samples.append((now, True, latency, False))
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self._close()
+    
+    def record_failure(self, latency: float, timeout: bool = False, now: Optional[float] = None):
+        """실패(오류/타임아웃) 기록 후 필요하면 회로 열기"""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            self._samples.append((now, False, latency, timeout))
+            self.consecutive_failures += 1
+            
+            if self.state == HALF_OPEN:
+                self._open(now, self._current_open_seconds * 2)
+            elif self.state == CLOSED and self._should_trip(now):
+                self._open(now, self.open_seconds)
+    
+    def release_probe(self):
+        """결과 없이 끝난 호출(대기 중 취소 등)의 시험 호출 자리 반환"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+    
+    def latency_percentiles(self, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """최근 성공 호출의 지연 시간 백분위수 (p50, p95, p99)"""
+        latencies = sorted(latency for _, ok, latency, _ in self._recent(now) if ok)
+        return {f'p{q}': percentile(latencies, q) for q in (50, 95, 99)}
+    
+    def latency_percentile(self, q: float, min_samples: int = 1, now: Optional[float] = None) -> Optional[float]:
+        """최근 성공 호출 지연 시간의 q 백분위수 (표본이 min_samples개 미만이면 None)"""
+        latencies = sorted(latency for _, ok, latency, _ in self._recent(now) if ok)
+        if len(latencies) < max(1, min_samples):
+            return None
+        return percentile(latencies, q)
+    
+    def error_rate(self, now: Optional[float] = None) -> float:
+        """최근 호출 오류율"""
+        samples = self._recent(now)
+        if not samples:
+            return 0.0
+        return sum(1 for _, ok, _, _ in samples if not ok) / len(samples)
+    
+    def score(self, now: Optional[float] = None) -> float:
+        """상태 점수 (0~1, 열린 회로는 0)
+        
+        성공률에 p95 지연이 길수록 작아지는 가중치를 곱한다 (p95가 1초 이하면 감점 없음).
+        """
+        if self.is_open(now):
+            return 0.0
+        p95 = self.latency_percentiles(now)['p95']
+        latency_factor = 1.0 if not p95 or p95 <= 1.0 else 1.0 / p95
+        return round((1 - self.error_rate(now)) * latency_factor, 3)
+    
+    def stats(self) -> Dict[str, object]:
+        """회로 상태 및 최근 호출 통계"""
+        now = time.monotonic()
+        samples = self._recent(now)
+        return {
+            'state': self.state,
+            'score': self.score(now),
+            'samples': len(samples),
+            'error_rate': round(self.error_rate(now), 3),
+            'timeouts': sum(1 for *_, timed_out in samples if timed_out),
+            'consecutive_failures': self.consecutive_failures,
+            'latency': self.latency_percentiles(now),
+            'trips': self.trips,
+            'retry_in': max(0.0, round(self.open_until - now, 1)) if self.state == OPEN else 0.0,
+        }
+    
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._close()
+            self.trips = 0
+    
+    def _recent(self, now: Optional[float] = None) -> List[Tuple[float, bool, float, bool]]:
+        now = now if now is not None else time.monotonic()
+        cutoff = now - self.window_seconds
+        with self._lock:
+            return [sample for sample in self._samples if sample[0] >= cutoff]
+    
+    def _should_trip(self, now: float) -> bool:
+        if self.consecutive_failures >= self.failure_threshold:
+            return True
+        cutoff = now - self.window_seconds
+        recent = [ok for recorded_at, ok, _, _ in self._samples if recorded_at >= cutoff]
+        if len(recent) < self.min_samples:
+            return False
+        return recent.count(False) / len(recent) >= self.error_rate_threshold
+    
+    def _open(self, now: float, seconds: float):
+        self._current_open_seconds = min(seconds, self.max_open_seconds)
+        self.state = OPEN
+        self.opened_at = now
+        self.open_until = now + self._current_open_seconds
+        self._probes_in_flight = 0
+        self.trips += 1
+        logger.warning(
+            f"프로바이더 {self.name} 회로 열림 ({self._current_open_seconds:.0f}초, "
+            f"연속 실패 {self.consecutive_failures}회)"
+        )
+    
+    def _close(self):
+        if self.state != CLOSED:
+            logger.info(f"프로바이더 {self.name} 회로 닫힘")
+            # 차단 이전 기록으로 바로 다시 열리지 않도록 초기화
+            self._samples.clear()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.open_until = 0.0
+        self._current_open_seconds = self.open_seconds
+        self._probes_in_flight = 0
+
+
+class ProviderCall:
+    """프로바이더 호출 하나의 결과 기록 컨텍스트
+    
+    `start()` 이후의 시간만 지연 시간으로 본다 (속도 제한 대기 제외). 블록이 정상 종료하면
+    성공, 타임아웃/예외면 실패로 기록하고, 시작 전에 끝났거나 취소되면 기록하지 않는다.
+    헤지 요청이 이기면 `latency`에 첫 요청의 지연 시간을 지정해 그 값을 대신 기록한다.
+    """
+    
+    def __init__(self, health: ProviderHealth):
+        self.health = health
+        self.started: Optional[float] = None
+        self.latency: Optional[float] = None
+    
+    def start(self):
+        self.started = time.monotonic()
+    
+    @property
+    def elapsed(self) -> float:
+        if self.latency is not None:
+            return self.latency
+        return time.monotonic() - self.started if self.started is not None else 0.0
+    
+    def __enter__(self) -> 'ProviderCall':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.started is None or (exc_type is not None and issubclass(exc_type, asyncio.CancelledError)):
+            self.health.release_probe()
+        elif exc_type is None:
+            self.health.record_success(self.elapsed)
+        else:
+            self.health.record_failure(self.elapsed, timeout=issubclass(exc_type, asyncio.TimeoutError))
+        return False
+
+
+class ProviderHealthRegistry:
+    """프로바이더별 상태 추적기 모음 (설정값은 `PROVIDER_CIRCUIT_*`)"""
+    
+    def __init__(self):
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, provider) -> ProviderHealth:
+        """프로바이더 상태 추적기 (없으면 생성)"""
+        name = provider if isinstance(provider, str) else provider.get_name()
+        health = self._health.get(name)
+        if health is None:
+            with self._lock:
+                health = self._health.get(name)
+                if health is None:
+                    health = ProviderHealth(name, **_circuit_settings())
+                    self._health[name] = health
+        return health
+    
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """프로바이더별 상태 통계"""
+        return {name: health.stats() for name, health in list(self._health.items())}
+    
+    def reset(self):
+        """상태 초기화 (테스트, 장애 복구 후 수동 초기화)"""
+        with self._lock:
+            self._health.clear()
+
+
+def _circuit_settings() -> Dict[str, float]:
+    return {
+        'window_seconds': getattr(settings, 'PROVIDER_HEALTH_WINDOW_SECONDS', 300),
+        'failure_threshold': getattr(settings, 'PROVIDER_CIRCUIT_FAILURE_THRESHOLD', 5),
+        'error_rate_threshold': getattr(settings, 'PROVIDER_CIRCUIT_ERROR_RATE', 0.5),
+        'min_samples': getattr(settings, 'PROVIDER_CIRCUIT_MIN_SAMPLES', 10),
+        'open_seconds': getattr(settings, 'PROVIDER_CIRCUIT_OPEN_SECONDS', 30),
+        'max_open_seconds': getattr(settings, 'PROVIDER_CIRCUIT_MAX_OPEN_SECONDS', 300),
+    }
+
+
+# 전역 프로바이더 상태 추적기
+provider_health = ProviderHealthRegistry()
@@ -0,0 +1,209 @@
+"""
+프로바이더 헤지 요청 (꼬리 지연 감소)
+"""
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+from django.conf import settings
+from .health import ProviderCall, provider_health
+from .ratelimit import INTERACTIVE, rate_limiters
+
+logger = logging.getLogger(__name__)
+
+
+class HedgeBudget:
+    """헤지 요청 예산 (추가 부하 상한)
+    
+    일반 요청마다 `ratio`만큼 토큰이 쌓이고(최대 `burst`) 헤지 요청은 토큰 1개를 쓴다.
+    따라서 헤지로 늘어나는 요청은 장기적으로 전체의 `ratio` 비율을 넘지 않는다.
+    """
+    
+    def __init__(self, ratio: float = 0.1, burst: float = 5.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+    
+    def deposit(self):
+        """일반 요청 한 건만큼 예산 적립"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+    
+    def try_spend(self) -> bool:
+        """헤지 요청 한 건 예산 사용 (부족하면 False)"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+    
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class Hedger:
+    """프로바이더 하나의 헤지 요청 실행기
+    
+    첫 요청이 프로바이더 자신의 최근 p95 지연 시간(`provider_health`)까지 응답하지 않으면
+    같은 검색을 한 번 더 보내고(`BaseProvider.hedge_search`, 미러가 있으면 미러로) 먼저 성공한
+    결과를 사용한다. 남은 요청은 취소한다. 지연 표본이 `min_samples`개 미만이거나 예산/속도 제한
+    토큰이 없으면 헤지하지 않는다.
+    
+    지연 표본에는 첫 요청의 지연 시간만 남긴다. 헤지가 이기면 첫 요청은 최소한 헤지 대기 시간(p95)
+    이상 걸렸으므로 그 값을 기록한다. 헤지 응답 시간이 섞이면 p95가 헤지할 때마다 흔들린다.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        budget_ratio: float = 0.1,
+        budget_burst: float = 5.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05
+    ):
+        self.name = name
+        self.budget = HedgeBudget(budget_ratio, budget_burst)
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.skipped_budget = 0
+        self.skipped_rate_limit = 0
+    
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보낼 때까지의 대기 시간 (표본이 부족하면 None)"""
+        p95 = provider_health.get(self.name).latency_percentile(95, min_samples=self.min_samples)
+        if p95 is None:
+            return None
+        return max(self.min_delay, p95)
+    
+    async def search(
+        self,
+        provider,
+        keyword: str,
+        priority: int = INTERACTIVE,
+        call: Optional[ProviderCall] = None,
+        **kwargs
+    ):
+        """헤지를 적용한 검색 (사용자 검색만 헤지, 배치 작업은 그대로 호출)
+        
+        `call`이 있으면 헤지가 이겼을 때 기록할 첫 요청의 지연 시간을 지정한다.
+        """
+        self.requests += 1
+        self.budget.deposit()
+        
+        delay = self.hedge_delay() if priority == INTERACTIVE else None
+        if delay is None:
+            return await provider.search(keyword, **kwargs)
+        
+        primary = asyncio.ensure_future(provider.search(keyword, **kwargs))
+        hedge: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not await self._try_fire(provider, priority):
+                return await primary
+            
+            logger.info(f"프로바이더 {self.name} 응답 지연 ({delay:.2f}초 초과), 헤지 요청: {keyword}")
+            hedge = asyncio.ensure_future(provider.hedge_search(keyword, **kwargs))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.won += 1
+                            if call is not None:
+                                call.latency = delay
+                        return task.result()
+            # 둘 다 실패하면 첫 요청의 오류를 전달
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    async def _try_fire(self, provider, priority: int) -> bool:
+        """예산과 속도 제한 토큰을 모두 얻으면 True (속도 제한은 기다리지 않음)"""
+        if not self.budget.try_spend():
+            self.skipped_budget += 1
+            return False
+        if not await rate_limiters.get(provider).try_acquire(priority):
+            self.skipped_rate_limit += 1
+            return False
+        self.fired += 1
+        return True
+    
+    def stats(self) -> Dict[str, object]:
+        """헤지 요청 통계"""
+        return {
+            'requests': self.requests,
+            'fired': self.fired,
+            'won': self.won,
+            'win_rate': round(self.won / self.fired, 3) if self.fired else 0.0,
+            'extra_load': round(self.fired / self.requests, 3) if self.requests else 0.0,
+            'skipped_budget': self.skipped_budget,
+            'skipped_rate_limit': self.skipped_rate_limit,
+            'delay': self.hedge_delay(),
+            'budget': round(self.budget.tokens, 2),
+        }
+
+
+class HedgerRegistry:
+    """프로바이더별 헤지 실행기 모음 (설정값은 `PROVIDER_HEDGE_*`)"""
+    
+    def __init__(self):
+        self._hedgers: Dict[str, Hedger] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'PROVIDER_HEDGE_ENABLED', False)
+    
+    def get(self, provider) -> Hedger:
+        """프로바이더 헤지 실행기 (없으면 생성)"""
+        name = provider if isinstance(provider, str) else provider.get_name()
+        hedger = self._hedgers.get(name)
+        if hedger is None:
+            with self._lock:
+                hedger = self._hedgers.get(name)
+                if hedger is None:
+                    hedger = Hedger(name, **_hedge_settings())
+                    self._hedgers[name] = hedger
+        return hedger
+    
+    async def search(
+        self,
+        provider,
+        keyword: str,
+        priority: int = INTERACTIVE,
+        call: Optional[ProviderCall] = None,
+        **kwargs
+    ):
+        """헤지가 켜져 있고 프로바이더가 지원하면 헤지 검색, 아니면 그대로 검색"""
+        if not self.enabled or not provider.supports_hedging():
+            return await provider.search(keyword, **kwargs)
+        return await self.get(provider).search(provider, keyword, priority, call, **kwargs)
+    
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """프로바이더별 헤지 통계"""
+        return {name: hedger.stats() for name, hedger in list(self._hedgers.items())}
+    
+    def reset(self):
+        with self._lock:
+            self._hedgers.clear()
+
+
+def _hedge_settings() -> Dict[str, float]:
+    return {
+        'budget_ratio': getattr(settings, 'PROVIDER_HEDGE_BUDGET', 0.1),
+        'budget_burst': getattr(settings, 'PROVIDER_HEDGE_BURST', 5),
+        'min_samples': getattr(settings, 'PROVIDER_HEDGE_MIN_SAMPLES', 20),
+        'min_delay': getattr(settings, 'PROVIDER_HEDGE_MIN_DELAY', 0.05),
+    }
+
+
+# 전역 헤지 실행기
+hedgers = HedgerRegistry()
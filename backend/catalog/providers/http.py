@@ -0,0 +1,233 @@
+"""
+HTTP 기반 프로바이더 공통 클래스
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from django.conf import settings
+from core.runtime import runtime
+from .base import BaseProvider, OfferLike, SearchResult
+from .records import OfferRecord
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 재시도할 응답 상태 코드
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class ProviderHTTPError(Exception):
+    """프로바이더 HTTP 요청 실패"""
+
+
+class ResponseTooLarge(ProviderHTTPError):
+    """응답 크기가 제한을 넘음"""
+
+
+class HttpClientPool:
+    """이벤트 루프별 공유 httpx.AsyncClient
+    
+    AsyncClient의 커넥션은 생성된 이벤트 루프에 묶이므로 루프마다 클라이언트 하나를 두고,
+    같은 루프의 모든 HTTP 프로바이더가 호스트별 keep-alive 커넥션 풀을 공유한다.
+    워커의 런타임 루프(`core.runtime`) 클라이언트는 런타임이 종료될 때 닫히고,
+    그 밖의 루프에서 쓴 클라이언트는 루프를 닫기 전에 `aclose`로 직접 닫아야 한다.
+    h2 패키지가 설치되어 있으면 HTTP/2를 사용한다.
+    """
+    
+    def __init__(self):
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+    
+    def get(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프의 클라이언트 (없으면 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._create_client()
+                self._clients[loop] = client
+        return client
+    
+    async def aclose(self):
+        """현재 이벤트 루프의 클라이언트 종료"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+    
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=getattr(settings, 'PROVIDER_HTTP_MAX_CONNECTIONS', 100),
+            max_keepalive_connections=getattr(settings, 'PROVIDER_HTTP_MAX_KEEPALIVE', 20),
+            keepalive_expiry=getattr(settings, 'PROVIDER_HTTP_KEEPALIVE_EXPIRY', 30)
+        )
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=limits,
+            headers={'User-Agent': getattr(settings, 'PROVIDER_HTTP_USER_AGENT', 'PriceWatch/1.0')},
+            follow_redirects=True
+        )
+
+
+# 전역 HTTP 클라이언트 풀
+http_clients = HttpClientPool()
+runtime.on_shutdown(http_clients.aclose)
+
+
+class HttpProvider(BaseProvider):
+    """HTTP API를 호출하는 프로바이더 기본 클래스
+    
+    공유 커넥션 풀(`http_clients`)을 사용하고, 연결/읽기 타임아웃, 지수 백오프 + 지터 재시도,
+    응답 크기 제한을 적용한다. 어댑터는 `base_url`을 지정하고 `build_search_request`와
+    `parse_search_response`를 구현하면 된다. `mirror_urls`가 있으면 헤지 요청은 미러로 보낸다.
+    """
+    
+    base_url: str = ''
+    mirror_urls: List[str] = []
+    connect_timeout: float = 1.0
+    read_timeout: float = 2.5
+    max_retries: int = 2
+    retry_backoff: float = 0.2  # 첫 재시도 기준 대기 (초)
+    retry_backoff_max: float = 2.0
+    max_response_bytes: int = 2 * 1024 * 1024
+    headers: Dict[str, str] = {}
+    
+    @abstractmethod
+    def build_search_request(self, keyword: str, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """검색 요청 (경로, 쿼리 파라미터)"""
+        pass
+    
+    @abstractmethod
+    def parse_search_response(self, data: Any) -> List[OfferRecord]:
+        """검색 응답(JSON)을 오퍼 목록으로 변환 (`OfferRecord.create` 권장, OfferLike도 허용)"""
+        pass
+    
+    def parse_product_detail(self, data: Any) -> Optional[OfferLike]:
+        """상품 상세 응답(JSON)을 오퍼로 변환 (기본: 미지원)"""
+        return None
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        """키워드로 상품 검색"""
+        return await self._search(keyword, self.base_url, **kwargs)
+    
+    async def hedge_search(self, keyword: str, **kwargs) -> SearchResult:
+        """헤지 요청 검색 (미러가 있으면 그중 하나로)"""
+        base_url = random.choice(self.mirror_urls) if self.mirror_urls else self.base_url
+        return await self._search(keyword, base_url, **kwargs)
+    
+    async def _search(self, keyword: str, base_url: str, **kwargs) -> SearchResult:
+        started = time.monotonic()
+        path, params = self.build_search_request(keyword, **kwargs)
+        data = await self.get_json(path, params=params, base_url=base_url)
+        offers = self.parse_search_response(data)
+        return SearchResult(
+            offers=offers,
+            total_count=len(offers),
+            marketplace=self.name,
+            search_time=time.monotonic() - started
+        )
+    
+    async def get_product_detail(self, url: str) -> Optional[OfferLike]:
+        """상품 상세 정보 조회"""
+        return self.parse_product_detail(await self.get_json(url))
+    
+    async def get_json(
+        self, path: str, params: Optional[Dict[str, Any]] = None, base_url: Optional[str] = None
+    ) -> Any:
+        """GET 요청 후 JSON 응답 반환"""
+        response = await self.request('GET', path, params=params, base_url=base_url)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise ProviderHTTPError(f"{self.name} JSON 응답이 아닙니다: {str(e)}")
+    
+    async def request(self, method: str, path: str, base_url: Optional[str] = None, **kwargs) -> httpx.Response:
+        """재시도/크기 제한을 적용한 HTTP 요청
+        
+        연결 오류, 타임아웃, 429/5xx 응답은 `max_retries`번까지 지수 백오프(full jitter)로
+        다시 시도하며 `Retry-After` 헤더가 있으면 따른다. 그 밖의 4xx는 바로 실패한다.
+        """
+        url = self._url(path, base_url or self.base_url)
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        attempt = 0
+        
+        while True:
+            try:
+                response = await self._send(method, url, timeout=timeout, **kwargs)
+            except ResponseTooLarge:
+                raise
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise ProviderHTTPError(f"{self.name} 요청 실패: {type(e).__name__} {str(e)}") from e
+                delay = self._backoff(attempt)
+                logger.info(f"{self.name} 요청 재시도 {attempt + 1}/{self.max_retries} ({type(e).__name__})")
+            else:
+                if response.status_code < 400:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    raise ProviderHTTPError(f"{self.name} 응답 오류: HTTP {response.status_code}")
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.info(f"{self.name} 요청 재시도 {attempt + 1}/{self.max_retries} (HTTP {response.status_code})")
+            
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    async def _send(self, method: str, url: str, timeout: httpx.Timeout, **kwargs) -> httpx.Response:
+        """응답 본문을 크기 제한까지만 읽어 반환"""
+        client = http_clients.get()
+        headers = {**self.headers, **kwargs.pop('headers', {})}
+        async with client.stream(method, url, timeout=timeout, headers=headers, **kwargs) as response:
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > self.max_response_bytes:
+                raise ResponseTooLarge(f"{self.name} 응답이 너무 큽니다: {declared}바이트")
+            
+            chunks = []
+            received = 0
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                if received > self.max_response_bytes:
+                    raise ResponseTooLarge(f"{self.name} 응답이 {self.max_response_bytes}바이트를 넘습니다.")
+                chunks.append(chunk)
+        
+        # 본문은 이미 디코딩되었으므로 전송 관련 헤더는 제외
+        headers = [
+            (key, value) for key, value in response.headers.multi_items()
+            if key.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')
+        ]
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=b''.join(chunks),
+            request=response.request
+        )
+    
+    def _url(self, path: str, base_url: str) -> str:
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+    
+    def _backoff(self, attempt: int) -> float:
+        """지수 백오프 (full jitter)"""
+        return random.uniform(0, min(self.retry_backoff_max, self.retry_backoff * 2 ** attempt))
+    
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        value = response.headers.get('Retry-After', '')
+        try:
+            return min(float(value), self.retry_backoff_max)
+        except ValueError:
+            return None
@@ -6,14 +6,17 @@ import random
 from typing import List, Optional
 from decimal import Decimal
 from .base import BaseProvider, OfferLike, SearchResult
+from .records import OfferRecord
 
 
 class MockProvider(BaseProvider):
-    """목데이터 프로바이더"""
+    """목데이터 프로바이더 (외부 API 한도가 없으므로 속도 제한 없음)"""
     
     def __init__(self):
         super().__init__("mock")
         self._mock_data = self._generate_mock_data()
+        # 검색 결과용 레코드는 한 번만 변환
+        self._records = [OfferRecord.from_offer_like(offer) for offer in self._mock_data]
     
     def _generate_mock_data(self) -> List[OfferLike]:
         """목데이터 생성"""
@@ -133,14 +136,14 @@ class MockProvider(BaseProvider):
         filtered_offers = []
         keyword_lower = keyword.lower()
         
-        for offer in self._mock_data:
+        for offer, record in zip(self._mock_data, self._records):
             if (keyword_lower in offer.title.lower() or 
                 keyword_lower in offer.description.lower()):
-                filtered_offers.append(offer)
+                filtered_offers.append(record)
         
         # 키워드가 없으면 모든 데이터 반환
         if not filtered_offers:
-            filtered_offers = self._mock_data
+            filtered_offers = self._records
         
         # 랜덤하게 일부만 반환 (검색 결과 다양성)
         if len(filtered_offers) > 5:
@@ -0,0 +1,316 @@
+"""
+프로바이더 속도 제한 (토큰 버킷)
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 대기열 우선순위 (낮을수록 먼저)
+INTERACTIVE = 0  # 사용자 검색
+BACKGROUND = 1  # Watch 스캔 등 배치 작업
+
+# (버킷 용량, 초당 충전량)
+Window = Tuple[float, float]
+
+
+def windows_from_info(info: dict) -> List[Window]:
+    """`get_rate_limit_info()` 값을 토큰 버킷 목록으로 변환
+    
+    분당/시간당 한도는 각각 그 크기의 버킷으로, `cooldown_seconds`는 용량 1인 버킷
+    (요청 간 최소 간격)으로 표현한다. 값이 없거나 0이면 해당 제한은 두지 않는다.
+    """
+    windows = []
+    if info.get('requests_per_minute'):
+        windows.append((float(info['requests_per_minute']), info['requests_per_minute'] / 60))
+    if info.get('requests_per_hour'):
+        windows.append((float(info['requests_per_hour']), info['requests_per_hour'] / 3600))
+    if info.get('cooldown_seconds'):
+        windows.append((1.0, 1 / info['cooldown_seconds']))
+    return windows
+
+
+class LocalBucketStore:
+    """프로세스 내 토큰 버킷 저장소"""
+    
+    def __init__(self):
+        self._buckets: Dict[str, List[List[float]]] = {}
+        self._lock = threading.Lock()
+    
+    async def reserve(self, key: str, windows: Sequence[Window]) -> float:
+        """모든 버킷에서 토큰 1개씩 가져오기 (성공하면 0, 부족하면 기다려야 할 초)"""
+        return self.take(key, windows, time.monotonic())
+    
+    def take(self, key: str, windows: Sequence[Window], now: float) -> float:
+        with self._lock:
+            states = self._buckets.setdefault(key, [[capacity, now] for capacity, _ in windows])
+            wait = 0.0
+            for (capacity, rate), state in zip(windows, states):
+                state[0] = min(capacity, state[0] + (now - state[1]) * rate)
+                state[1] = now
+                if state[0] < 1:
+                    wait = max(wait, (1 - state[0]) / rate)
+            
+            if wait == 0:
+                for state in states:
+                    state[0] -= 1
+            return wait
+    
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBucketStore:
+    """Redis 토큰 버킷 저장소 (여러 워커가 같은 한도를 공유)
+    
+    버킷 상태는 `{prefix}:{key}` 해시에 저장하고 Lua 스크립트로 원자적으로 갱신한다.
+    시각은 Redis 서버 시계(TIME)를 사용한다. Redis 오류 시에는 프로세스 내 버킷으로 대신한다.
+    """
+    
+    SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local count = #ARGV / 2
+local levels = {}
+local wait = 0
+local ttl = 1
+for i = 1, count do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', KEYS[1], 't' .. i, 'u' .. i)
+    local level = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - updated) * rate)
+    levels[i] = level
+    if level < 1 then
+        wait = math.max(wait, (1 - level) / rate)
+    end
+    ttl = math.max(ttl, math.ceil(capacity / rate))
+end
+for i = 1, count do
+    local level = levels[i]
+    if wait == 0 then
+        level = level - 1
+    end
+    redis.call('HSET', KEYS[1], 't' .. i, tostring(level), 'u' .. i, tostring(now))
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return tostring(wait)
+"""
+
+    def __init__(self, client, prefix: str = 'pricewatch:ratelimit'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+        self._fallback = LocalBucketStore()
+    
+    async def reserve(self, key: str, windows: Sequence[Window]) -> float:
+        args = [value for window in windows for value in window]
+        try:
+            wait = await asyncio.to_thread(self._script, keys=[f"{self.prefix}:{key}"], args=args)
+        except Exception as e:
+            logger.warning(f"Redis 속도 제한 조회 실패, 프로세스 내 버킷 사용: {str(e)}")
+            return await self._fallback.reserve(key, windows)
+        return float(wait)
+    
+    def clear(self):
+        self._fallback.clear()
+
+
+@dataclass(order=True)
+class _Waiter:
+    """대기열 항목 (우선순위, 도착 순서로 정렬)"""
+    priority: int
+    sequence: int
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    future: Optional[asyncio.Future] = field(default=None, compare=False)
+
+
+class RateLimiter:
+    """프로바이더 하나의 속도 제한 대기열
+    
+    호출은 우선순위(사용자 검색 > 배치 작업), 같은 우선순위 안에서는 도착 순서대로
+    토큰을 받는다. 대기열 맨 앞 호출만 버킷에서 토큰을 가져가며, 부족하면 충전될 때까지
+    기다린다. 요청마다 이벤트 루프가 다를 수 있어 대기열은 스레드 락으로 보호한다.
+    """
+    
+    def __init__(self, key: str, windows: Sequence[Window], store):
+        self.key = key
+        self.windows = tuple(windows)
+        self.store = store
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._acquired = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._abandoned = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+    
+    async def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """토큰을 받을 때까지 대기 (대기 시간(초) 반환, 타임아웃 시 asyncio.TimeoutError)"""
+        if not self.windows:
+            return 0.0
+        
+        started = time.monotonic()
+        waiter = _Waiter(priority, next(self._sequence), asyncio.get_running_loop())
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        
+        try:
+            if timeout is None:
+                await self._wait_turn(waiter)
+            else:
+                await asyncio.wait_for(self._wait_turn(waiter), timeout=timeout)
+        except BaseException:
+            # 타임아웃/취소로 대기를 포기한 호출
+            self._discard(waiter)
+            self._abandoned += 1
+            raise
+        
+        waited = time.monotonic() - started
+        self._acquired[priority] = self._acquired.get(priority, 0) + 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return waited
+    
+    async def try_acquire(self, priority: int = INTERACTIVE) -> bool:
+        """대기 없이 토큰 가져오기 (대기열이 있거나 토큰이 부족하면 False)"""
+        if not self.windows:
+            return True
+        with self._lock:
+            if self._waiters:
+                return False
+        if await self.store.reserve(self.key, self.windows) > 0:
+            return False
+        self._acquired[priority] = self._acquired.get(priority, 0) + 1
+        return True
+    
+    async def _wait_turn(self, waiter: _Waiter):
+        while True:
+            with self._lock:
+                is_head = self._waiters[0] is waiter
+                if not is_head:
+                    waiter.future = waiter.loop.create_future()
+            
+            if not is_head:
+                await waiter.future
+                continue
+            
+            wait = await self.store.reserve(self.key, self.windows)
+            if wait <= 0:
+                self._discard(waiter)
+                return
+            # 충전 후 다시 확인 (그사이 우선순위가 높은 호출이 앞에 올 수 있음)
+            await asyncio.sleep(wait)
+    
+    def _discard(self, waiter: _Waiter):
+        """대기열에서 제거하고 새 맨 앞 호출을 깨움"""
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            
+            while self._waiters:
+                head = self._waiters[0]
+                if head.future is None or head.future.done():
+                    break
+                try:
+                    head.loop.call_soon_threadsafe(_resolve, head.future)
+                    break
+                except RuntimeError:
+                    # 닫힌 루프의 대기 항목은 버림
+                    heapq.heappop(self._waiters)
+    
+    def queue_depth(self) -> Dict[str, int]:
+        """우선순위별 대기 중인 호출 수"""
+        with self._lock:
+            interactive = sum(1 for waiter in self._waiters if waiter.priority == INTERACTIVE)
+            return {'interactive': interactive, 'background': len(self._waiters) - interactive}
+    
+    def stats(self) -> Dict[str, object]:
+        """대기열 깊이 및 대기 시간 통계"""
+        acquired = sum(self._acquired.values())
+        return {
+            'queued': self.queue_depth(),
+            'acquired': acquired,
+            'acquired_interactive': self._acquired[INTERACTIVE],
+            'acquired_background': self._acquired[BACKGROUND],
+            'abandoned': self._abandoned,
+            'avg_wait': self._total_wait / acquired if acquired else 0.0,
+            'max_wait': self._max_wait,
+            'limits': [
+                {'capacity': capacity, 'per_second': rate}
+                for capacity, rate in self.windows
+            ],
+        }
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimiterRegistry:
+    """프로바이더별 속도 제한기 모음
+    
+    제한값은 각 프로바이더의 `get_rate_limit_info()`에서 읽고, 저장소는
+    `PROVIDER_RATE_LIMIT_REDIS` 설정에 따라 프로세스 내 또는 Redis를 사용한다.
+    """
+    
+    def __init__(self, store=None):
+        self._store = store
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = _default_store()
+        return self._store
+    
+    def get(self, provider) -> RateLimiter:
+        """프로바이더의 속도 제한기 (없으면 생성)"""
+        name = provider.get_name()
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(name)
+                if limiter is None:
+                    limiter = RateLimiter(name, windows_from_info(provider.get_rate_limit_info()), self.store)
+                    self._limiters[name] = limiter
+        return limiter
+    
+    async def acquire(self, provider, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """프로바이더 호출 전 토큰 대기"""
+        return await self.get(provider).acquire(priority, timeout=timeout)
+    
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """프로바이더별 속도 제한 통계"""
+        return {name: limiter.stats() for name, limiter in list(self._limiters.items())}
+    
+    def reset(self):
+        """제한기/버킷 초기화 (테스트, 설정 변경 시)"""
+        with self._lock:
+            self._limiters.clear()
+            if self._store is not None:
+                self._store.clear()
+
+
+def _default_store():
+    """설정에 따른 토큰 버킷 저장소"""
+    if getattr(settings, 'PROVIDER_RATE_LIMIT_REDIS', False):
+        import redis
+        return RedisBucketStore(redis.Redis.from_url(settings.REDIS_URL))
+    return LocalBucketStore()
+
+
+# 전역 속도 제한기
+rate_limiters = RateLimiterRegistry()
@@ -0,0 +1,87 @@
+"""
+검색 파이프라인용 경량 오퍼 레코드
+"""
+import math
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Optional
+
+
+def to_won(value) -> int:
+    """가격을 원 단위 정수로 변환 (1원 미만은 반올림, 음수/숫자가 아니면 ValueError)"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        won = value
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"가격이 올바르지 않습니다: {value}")
+        won = int(Decimal(repr(value)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    else:
+        try:
+            amount = value if isinstance(value, Decimal) else Decimal(str(value).replace(',', '').strip())
+            won = int(amount.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"가격이 올바르지 않습니다: {value}")
+    if won < 0:
+        raise ValueError(f"가격은 0 이상이어야 합니다: {value}")
+    return won
+
+
+@dataclass(slots=True)
+class OfferRecord:
+    """검색/매칭/저장 경로에서 쓰는 오퍼 (가격은 원 단위 정수)
+    
+    프로바이더 경계(`SearchResult`)에서 한 번만 검증하고 만든 뒤 매칭, 최저가 선택,
+    `ingest_offers`까지 그대로 사용한다. 상세 화면용 필드(이미지, 설명, 평점)는
+    `OfferLike`에만 있다.
+    """
+    marketplace: str
+    seller: str
+    title: str
+    price: int
+    shipping_fee: int
+    url: str
+    affiliate_url: Optional[str] = None
+    
+    @property
+    def total_price(self) -> int:
+        return self.price + self.shipping_fee
+    
+    @classmethod
+    def create(
+        cls,
+        marketplace: str,
+        seller: str,
+        title: str,
+        price,
+        url: str,
+        shipping_fee=0,
+        affiliate_url: Optional[str] = None
+    ) -> 'OfferRecord':
+        """필드를 검증해 레코드 생성 (어댑터가 원본 응답에서 바로 만들 때 사용)"""
+        for field_name, value in (('marketplace', marketplace), ('seller', seller), ('title', title), ('url', url)):
+            if not isinstance(value, str):
+                raise ValueError(f"{field_name}은(는) 문자열이어야 합니다: {value!r}")
+        if not url:
+            raise ValueError("오퍼 URL이 비어 있습니다.")
+        return cls(
+            marketplace=marketplace,
+            seller=seller,
+            title=title,
+            price=to_won(price),
+            shipping_fee=to_won(shipping_fee or 0),
+            url=url,
+            affiliate_url=affiliate_url or None
+        )
+    
+    @classmethod
+    def from_offer_like(cls, offer) -> 'OfferRecord':
+        """검증을 마친 OfferLike에서 변환 (가격만 정수로 바꿈)"""
+        return cls(
+            offer.marketplace,
+            offer.seller,
+            offer.title,
+            to_won(offer.price),
+            to_won(offer.shipping_fee),
+            offer.url,
+            offer.affiliate_url
+        )
@@ -0,0 +1,34 @@
+"""
+Catalog renderers
+"""
+import json
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(BaseRenderer):
+    """줄 단위 JSON(NDJSON) 렌더러"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """단일 객체를 한 줄의 JSON으로 직렬화"""
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n').encode(self.charset)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Server-Sent Events 렌더러"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """단일 객체를 하나의 SSE 이벤트로 직렬화"""
+        if data is None:
+            return b''
+        event = data.get('event', 'message') if isinstance(data, dict) else 'message'
+        payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+        return f"event: {event}\ndata: {payload}\n\n".encode(self.charset)
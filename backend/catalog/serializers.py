@@ -1,8 +1,15 @@
 """
 Catalog serializers
 """
+from datetime import timedelta
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Product, Offer, PriceHistory, Watch
+from .services.history import BUCKETS
+from .services.pricing import best_price_data, current_best_price
+
+# 시간 단위 버킷으로 조회할 수 있는 최대 기간 (일)
+HOURLY_SERIES_MAX_DAYS = 31
 
 
 class ProductListSerializer(serializers.ModelSerializer):
@@ -15,20 +22,13 @@ class ProductListSerializer(serializers.ModelSerializer):
         fields = ['id', 'brand', 'model_code', 'name', 'best_price', 'offer_count', 'created_at']
     
     def get_best_price(self, obj):
-        """최저가 조회"""
-        best_offer = obj.offers.order_by('price').first()
-        if best_offer:
-            return {
-                'price': best_offer.price,
-                'total_price': best_offer.total_price,
-                'marketplace': best_offer.marketplace,
-                'seller': best_offer.seller
-            }
-        return None
+        """최저가 조회 (상품 최저가 테이블)"""
+        return best_price_data(getattr(obj, 'best_price_record', None))
     
     def get_offer_count(self, obj):
         """오퍼 개수"""
-        return obj.offers.count()
+        record = current_best_price(getattr(obj, 'best_price_record', None))
+        return record.offer_count if record else 0
 
 
 class ProductDetailSerializer(serializers.ModelSerializer):
@@ -70,6 +70,36 @@ class PriceHistoryListSerializer(serializers.ModelSerializer):
         fields = ['id', 'marketplace', 'seller', 'price', 'total_price', 'recorded_at']
 
 
+class PriceSeriesQuerySerializer(serializers.Serializer):
+    """가격 차트 조회 파라미터 시리얼라이저
+    
+    `start`가 없으면 `end`(기본 현재 시각)에서 `days`일 전부터 조회한다.
+    """
+    product_id = serializers.IntegerField(required=False)
+    offer_id = serializers.IntegerField(required=False)
+    bucket = serializers.ChoiceField(choices=BUCKETS, default='day')
+    days = serializers.IntegerField(min_value=1, max_value=730, default=30)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    points = serializers.IntegerField(min_value=3, max_value=2000, required=False)
+    
+    def validate(self, attrs):
+        if attrs.get('product_id') is None and attrs.get('offer_id') is None:
+            raise serializers.ValidationError("product_id 또는 offer_id를 입력해주세요.")
+        
+        end = attrs.get('end') or timezone.now()
+        start = attrs.get('start') or end - timedelta(days=attrs['days'])
+        if start >= end:
+            raise serializers.ValidationError("start는 end보다 이전이어야 합니다.")
+        if attrs['bucket'] == 'hour' and end - start > timedelta(days=HOURLY_SERIES_MAX_DAYS):
+            raise serializers.ValidationError(
+                f"시간 단위 조회는 최대 {HOURLY_SERIES_MAX_DAYS}일까지 가능합니다."
+            )
+        
+        attrs['start'], attrs['end'] = start, end
+        return attrs
+
+
 class WatchCreateSerializer(serializers.ModelSerializer):
     """가격 모니터링 생성 시리얼라이저"""
     class Meta:
@@ -92,15 +122,11 @@ class WatchListSerializer(serializers.ModelSerializer):
         ]
     
     def get_current_best_price(self, obj):
-        """현재 최저가"""
-        best_offer = obj.product.offers.order_by('price').first()
-        if best_offer:
-            return {
-                'price': best_offer.price,
-                'total_price': best_offer.total_price,
-                'marketplace': best_offer.marketplace
-            }
-        return None
+        """현재 최저가 (상품 최저가 테이블)"""
+        best_price = best_price_data(getattr(obj.product, 'best_price_record', None))
+        if best_price:
+            del best_price['seller']
+        return best_price
 
 
 class WatchUpdateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,231 @@
+"""
+검색 결과 캐시 서비스
+"""
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from core.runtime import runtime
+
+logger = logging.getLogger(__name__)
+
+# 캐시 미스 표시 (None도 캐시 값이 될 수 있으므로 별도 객체 사용)
+_MISS = object()
+
+
+class SearchResultCache:
+    """키워드 검색 결과 캐시
+    
+    - 프로세스 내 LRU 캐시 뒤에 Redis(Django `search` 캐시) 캐시를 두는 2단계 구조
+    - TTL이 지난 결과는 stale 구간 동안 그대로 반환하고 백그라운드에서 갱신 (stale-while-revalidate).
+      갱신은 요청 루프가 아니라 프로세스 런타임 루프에서 실행되어 요청이 끝나도 취소되지 않는다.
+    - 같은 키의 동시 미스는 하나의 조회로 합침 (request coalescing)
+    """
+    
+    def __init__(
+        self,
+        ttl: float = 300,
+        stale_ttl: float = 600,
+        maxsize: int = 256,
+        remote: Optional[BaseCache] = None
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.remote = remote
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0, 'refreshes': 0}
+        self._local: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refreshes: Set[concurrent.futures.Future] = set()
+    
+    def normalize_keyword(self, keyword: str) -> str:
+        """키워드 정규화: 소문자 변환, 공백 정규화"""
+        return ' '.join((keyword or '').lower().split())
+    
+    def make_key(self, keyword: str, providers: List[str]) -> str:
+        """정규화 키워드 + 프로바이더 조합으로 캐시 키 생성"""
+        raw = f"{self.normalize_keyword(keyword)}|{','.join(sorted(providers))}"
+        return f"search:v1:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+    
+    async def get_or_fetch(
+        self,
+        keyword: str,
+        providers: List[str],
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = None
+    ) -> Any:
+        """캐시 조회, 없으면 fetch 결과를 저장 후 반환
+        
+        반환값은 캐시와 공유되므로 호출자가 수정하지 않아야 한다.
+        """
+        key = self.make_key(keyword, providers)
+        value = await self._lookup(key, fetch, cacheable)
+        if value is not _MISS:
+            return value
+        
+        self.stats['misses'] += 1
+        return await asyncio.shield(self._fetch_once(key, fetch, cacheable))
+    
+    async def get(
+        self,
+        keyword: str,
+        providers: List[str],
+        fetch: Callable[[], Awaitable[Any]] = None,
+        cacheable: Callable[[Any], bool] = None
+    ) -> Optional[Any]:
+        """캐시 조회만 수행 (없으면 None)
+        
+        stale 결과를 반환할 때 fetch가 있으면 get_or_fetch와 같이 백그라운드에서 갱신한다.
+        미스일 때 직접 조회한 결과는 `set()`으로 저장한다 (스트리밍 검색).
+        """
+        value = await self._lookup(self.make_key(keyword, providers), fetch, cacheable)
+        if value is _MISS:
+            self.stats['misses'] += 1
+            return None
+        return value
+    
+    async def set(self, keyword: str, providers: List[str], value: Any):
+        """조회 결과 저장"""
+        await self._store(self.make_key(keyword, providers), value)
+    
+    async def _lookup(self, key: str, fetch, cacheable) -> Any:
+        """로컬 -> 원격 순서로 조회 (신선/stale 구간이면 값, 아니면 _MISS)"""
+        entry = self._get_local(key)
+        if entry is None:
+            entry = await self._get_remote(key)
+            if entry is not None:
+                self._set_local(key, entry)
+        
+        if entry is None:
+            return _MISS
+        
+        age = time.time() - entry['stored_at']
+        if age < self.ttl:
+            self.stats['hits'] += 1
+            return entry['value']
+        if age < self.ttl + self.stale_ttl:
+            self.stats['stale_hits'] += 1
+            if fetch is not None:
+                self.stats['refreshes'] += 1
+                self._schedule_refresh(key, fetch, cacheable)
+            return entry['value']
+        return _MISS
+    
+    async def invalidate(self, keyword: str, providers: List[str]):
+        """캐시 항목 삭제"""
+        key = self.make_key(keyword, providers)
+        with self._lock:
+            self._local.pop(key, None)
+        if self.remote is not None:
+            try:
+                await self.remote.adelete(key)
+            except Exception as e:
+                logger.warning(f"검색 캐시 삭제 중 오류: {str(e)}")
+    
+    async def wait_refreshes(self, timeout: Optional[float] = None):
+        """진행 중인 백그라운드 갱신이 끝날 때까지 대기"""
+        pending = list(self._refreshes)
+        if pending:
+            await asyncio.wait([asyncio.wrap_future(future) for future in pending], timeout=timeout)
+    
+    def clear_local(self):
+        """프로세스 내 캐시 초기화"""
+        with self._lock:
+            self._local.clear()
+    
+    def _schedule_refresh(self, key: str, fetch, cacheable):
+        """stale 항목 갱신을 런타임 루프에 제출"""
+        future = runtime.submit(self._refresh(key, fetch, cacheable))
+        self._refreshes.add(future)
+        future.add_done_callback(self._refreshes.discard)
+    
+    async def _refresh(self, key: str, fetch, cacheable):
+        # 오류는 _finish에서 로깅하므로 여기서는 완료만 기다림
+        await asyncio.wait({self._fetch_once(key, fetch, cacheable)})
+    
+    def _fetch_once(self, key: str, fetch, cacheable) -> asyncio.Task:
+        """키별로 하나의 조회만 실행 (이미 진행 중이면 그 작업을 공유)"""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.stats['coalesced'] += 1
+            return task
+        
+        task = loop.create_task(self._fetch_and_store(key, fetch, cacheable))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+    
+    def _finish(self, key: str, task: asyncio.Task):
+        """조회 완료 처리 (백그라운드 갱신 오류 로깅)"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"검색 캐시 갱신 중 오류: {str(task.exception())}")
+    
+    async def _fetch_and_store(self, key: str, fetch, cacheable) -> Any:
+        """조회 후 캐시 저장"""
+        value = await fetch()
+        if cacheable is None or cacheable(value):
+            await self._store(key, value)
+        return value
+    
+    async def _store(self, key: str, value: Any):
+        entry = {'stored_at': time.time(), 'value': value}
+        self._set_local(key, entry)
+        await self._set_remote(key, entry)
+    
+    def _get_local(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+            return entry
+    
+    def _set_local(self, key: str, entry: dict):
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+    
+    async def _get_remote(self, key: str) -> Optional[dict]:
+        if self.remote is None:
+            return None
+        try:
+            return await self.remote.aget(key)
+        except Exception as e:
+            # Redis 장애 시 캐시 미스로 처리
+            logger.warning(f"검색 캐시 조회 중 오류: {str(e)}")
+            return None
+    
+    async def _set_remote(self, key: str, entry: dict):
+        if self.remote is None:
+            return
+        try:
+            await self.remote.aset(key, entry, timeout=self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"검색 캐시 저장 중 오류: {str(e)}")
+
+
+def _remote_cache() -> Optional[BaseCache]:
+    """Redis 캐시 (settings.CACHES에 `search`가 있을 때만 사용)"""
+    if 'search' not in getattr(settings, 'CACHES', {}):
+        return None
+    return caches['search']
+
+
+# 전역 검색 결과 캐시
+search_cache = SearchResultCache(
+    ttl=getattr(settings, 'SEARCH_CACHE_TTL', 300),
+    stale_ttl=getattr(settings, 'SEARCH_CACHE_STALE_TTL', 600),
+    maxsize=getattr(settings, 'SEARCH_CACHE_LOCAL_SIZE', 256),
+    remote=_remote_cache()
+)
@@ -0,0 +1,292 @@
+"""
+가격 히스토리 차트 서비스
+"""
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from ..models import Offer, PriceHistory, PriceHistoryDaily
+
+logger = logging.getLogger(__name__)
+
+# 지원하는 버킷 크기
+BUCKETS = ('hour', 'day', 'week')
+
+BucketKey = Tuple[str, datetime]
+
+
+@dataclass
+class PriceBucket:
+    """마켓플레이스별 버킷 하나의 총 가격 요약"""
+    marketplace: str
+    start: datetime
+    low: Decimal
+    high: Decimal
+    close: Decimal
+    closed_at: datetime
+    count: int
+    
+    def merge(self, low: Decimal, high: Decimal, close: Decimal, closed_at: datetime, count: int):
+        """다른 요약 합산 (종가는 더 늦게 기록된 값)"""
+        self.low = min(self.low, low)
+        self.high = max(self.high, high)
+        if closed_at >= self.closed_at:
+            self.close = close
+            self.closed_at = closed_at
+        self.count += count
+    
+    def to_dict(self) -> Dict[str, object]:
+        """API 응답용 딕셔너리"""
+        return {
+            't': self.start,
+            'min': self.low,
+            'max': self.high,
+            'close': self.close,
+            'count': self.count,
+        }
+
+
+def price_history_series(
+    start: datetime,
+    end: datetime,
+    bucket: str = 'day',
+    product_id: Optional[int] = None,
+    offer_id: Optional[int] = None,
+    points: Optional[int] = None
+) -> List[Dict[str, object]]:
+    """상품 또는 오퍼의 가격 히스토리를 버킷별 최저/최고/종가로 집계
+    
+    원본 히스토리는 DB에서 버킷 단위로 집계하고, 원본이 정리된 구간은 일별 요약
+    (`PriceHistoryDaily`, 상품 기준 조회만 해당)으로 채운다. `points`를 주면 마켓플레이스별
+    시리즈를 LTTB로 그 개수 이하로 줄인다.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"지원하지 않는 버킷입니다: {bucket}")
+    if product_id is None and offer_id is None:
+        raise ValueError("product_id 또는 offer_id가 필요합니다.")
+    
+    buckets: Dict[BucketKey, PriceBucket] = {}
+    _add_raw_buckets(buckets, start, end, bucket, product_id, offer_id)
+    if offer_id is None:
+        _add_daily_buckets(buckets, start, end, bucket, product_id)
+    
+    series: Dict[str, List[PriceBucket]] = {}
+    for key in sorted(buckets):
+        series.setdefault(key[0], []).append(buckets[key])
+    
+    return [
+        {
+            'marketplace': marketplace,
+            'points': [item.to_dict() for item in downsample(items, points)],
+        }
+        for marketplace, items in sorted(series.items())
+    ]
+
+
+def downsample(items: List[PriceBucket], points: Optional[int]) -> List[PriceBucket]:
+    """버킷 목록을 종가 기준 LTTB로 `points`개 이하로 축소"""
+    if not points or len(items) <= points:
+        return items
+    indices = lttb([(item.start.timestamp(), float(item.close)) for item in items], points)
+    return [items[index] for index in indices]
+
+
+def lttb(data: Sequence[Tuple[float, float]], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets 다운샘플링
+    
+    (x, y) 목록에서 시각적 형태를 가장 잘 유지하는 `threshold`개 점의 인덱스를 반환한다.
+    첫 점과 마지막 점은 항상 포함된다.
+    """
+    length = len(data)
+    threshold = max(threshold, 3)
+    if threshold >= length:
+        return list(range(length))
+    
+    selected = [0]
+    every = (length - 2) / (threshold - 2)
+    a = 0
+    
+    for i in range(threshold - 2):
+        # 다음 버킷의 평균점
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, length)
+        avg_x = sum(x for x, _ in data[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y for _, y in data[next_start:next_end]) / (next_end - next_start)
+        
+        # 현재 버킷에서 이전 선택점/다음 평균점과 가장 큰 삼각형을 만드는 점
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = data[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = data[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        
+        selected.append(best)
+        a = best
+    
+    selected.append(length - 1)
+    return selected
+
+
+def bucket_start(value: datetime, bucket: str) -> datetime:
+    """현지 시간 기준 버킷 시작 시각"""
+    local = timezone.localtime(value)
+    if bucket == 'hour':
+        return local.replace(minute=0, second=0, microsecond=0)
+    day = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == 'week':
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def _add_raw_buckets(
+    buckets: Dict[BucketKey, PriceBucket],
+    start: datetime,
+    end: datetime,
+    bucket: str,
+    product_id: Optional[int],
+    offer_id: Optional[int]
+):
+    """원본 히스토리를 오퍼/버킷별로 DB에서 집계한 뒤 마켓플레이스별 최저가로 합산
+    
+    히스토리는 가격이 바뀔 때만 기록되므로, 버킷 안에서 오퍼마다 최저/최고/종가를 구하고
+    마켓플레이스 값은 오퍼들 중 최저로 정한다. 변경이 없는 버킷은 직전 가격을 이어받으며,
+    범위 시작 전 마지막 기록을 시작 가격으로 쓴다.
+    """
+    offers = Offer.objects.all()
+    history = PriceHistory.objects.all()
+    if product_id is not None:
+        offers = offers.filter(product_id=product_id)
+        history = history.filter(offer__product_id=product_id)
+    if offer_id is not None:
+        offers = offers.filter(pk=offer_id)
+        history = history.filter(offer_id=offer_id)
+    
+    rows = list(
+        history.filter(recorded_at__gte=start, recorded_at__lt=end).order_by()
+        .values('offer_id', bucket_at=Trunc('recorded_at', bucket, tzinfo=timezone.get_current_timezone()))
+        .annotate(
+            low=Min('total_price'),
+            high=Max('total_price'),
+            closed_at=Max('recorded_at'),
+            count=Count('id')
+        )
+    )
+    
+    # 버킷별 오퍼 종가와 범위 시작 전 오퍼별 마지막 기록을 한 번에 조회
+    last_before_start = PriceHistory.objects.filter(
+        offer_id=OuterRef('pk'), recorded_at__lt=start
+    ).order_by('-recorded_at', '-pk').values('pk')[:1]
+    prices = (
+        history.filter(
+            Q(recorded_at__in={row['closed_at'] for row in rows})
+            | Q(pk__in=offers.annotate(seed=Subquery(last_before_start)).values('seed'))
+        )
+        .order_by('pk')
+        .values_list('offer_id', 'offer__marketplace', 'recorded_at', 'total_price')
+    )
+    
+    marketplaces: Dict[int, str] = {}
+    closes: Dict[Tuple[int, datetime], Decimal] = {}
+    # 오퍼별 현재 (가격, 변경 시각)
+    current: Dict[int, Tuple[Decimal, datetime]] = {}
+    for offer, marketplace, recorded_at, total_price in prices:
+        marketplaces[offer] = marketplace
+        if recorded_at < start:
+            current[offer] = (total_price, recorded_at)
+        else:
+            closes[(offer, recorded_at)] = total_price
+    
+    changes: Dict[datetime, List[Dict[str, object]]] = {}
+    for row in rows:
+        changes.setdefault(bucket_start(row['bucket_at'], bucket), []).append(row)
+    
+    for key in _bucket_starts(start, end, bucket):
+        # 오퍼별 (최저, 최고, 종가, 종가 시각, 기록 수)
+        summaries: Dict[int, Tuple[Decimal, Decimal, Decimal, datetime, int]] = {}
+        for row in changes.get(key, []):
+            offer = row['offer_id']
+            low, high = row['low'], row['high']
+            if offer in current:
+                # 버킷 시작 시점 가격은 직전 가격
+                low = min(low, current[offer][0])
+                high = max(high, current[offer][0])
+            close = closes.get((offer, row['closed_at']), row['low'])
+            summaries[offer] = (low, high, close, row['closed_at'], row['count'])
+            current[offer] = (close, row['closed_at'])
+        for offer, (price, changed_at) in current.items():
+            summaries.setdefault(offer, (price, price, price, changed_at, 0))
+        
+        per_marketplace: Dict[str, List[Tuple[Decimal, Decimal, Decimal, datetime, int]]] = {}
+        for offer, summary in summaries.items():
+            per_marketplace.setdefault(marketplaces[offer], []).append(summary)
+        for marketplace, items in per_marketplace.items():
+            _add(buckets, marketplace, key,
+                 min(item[0] for item in items),
+                 min(item[1] for item in items),
+                 min(item[2] for item in items),
+                 max(item[3] for item in items),
+                 sum(item[4] for item in items))
+
+
+def _bucket_starts(start: datetime, end: datetime, bucket: str) -> Iterator[datetime]:
+    """`start`가 속한 버킷부터 `end` 이전까지의 버킷 시작 시각"""
+    current = bucket_start(start, bucket)
+    while current < end:
+        yield current
+        if bucket == 'hour':
+            current = timezone.localtime(current + timedelta(hours=1))
+        else:
+            step = timedelta(weeks=1) if bucket == 'week' else timedelta(days=1)
+            current = timezone.make_aware(current.replace(tzinfo=None) + step)
+
+
+def _add_daily_buckets(
+    buckets: Dict[BucketKey, PriceBucket],
+    start: datetime,
+    end: datetime,
+    bucket: str,
+    product_id: int
+):
+    """원본이 정리된 구간의 일별 요약을 버킷에 합산"""
+    daily = PriceHistoryDaily.objects.filter(
+        product_id=product_id,
+        date__gte=timezone.localdate(start),
+        date__lte=timezone.localdate(end)
+    ).order_by()
+    
+    for row in daily:
+        _add(buckets, row.marketplace, bucket_start(_start_of_day(row.date), bucket),
+             row.min_total_price, row.max_total_price, row.close_total_price, row.closed_at, row.sample_count)
+
+
+def _add(
+    buckets: Dict[BucketKey, PriceBucket],
+    marketplace: str,
+    start: datetime,
+    low: Decimal,
+    high: Decimal,
+    close: Decimal,
+    closed_at: datetime,
+    count: int
+):
+    """버킷에 요약 추가 (이미 있으면 합산)"""
+    key = (marketplace, start)
+    if key in buckets:
+        buckets[key].merge(low, high, close, closed_at, count)
+    else:
+        buckets[key] = PriceBucket(marketplace, start, low, high, close, closed_at, count)
+
+
+def _start_of_day(day: date) -> datetime:
+    """현지 시간 기준 날짜 시작 시각"""
+    return timezone.make_aware(datetime.combine(day, time.min))
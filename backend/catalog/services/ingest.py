@@ -0,0 +1,171 @@
+"""
+오퍼 수집(ingest) 서비스
+"""
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from django.db import transaction
+from django.utils import timezone
+from ..models import Offer, PriceHistory, Product, ProductBestPrice
+from ..providers.records import OfferRecord
+from ..signals import price_dropped
+from .pricing import refresh_best_prices
+
+logger = logging.getLogger(__name__)
+
+# 오퍼 upsert 시 갱신하는 필드
+OFFER_UPDATE_FIELDS = ['marketplace', 'seller', 'price', 'shipping_fee', 'affiliate_url', 'fetched_at']
+
+
+@dataclass
+class IngestResult:
+    """오퍼 수집 결과"""
+    created: int = 0
+    updated: int = 0
+    price_changed: int = 0
+    history_created: int = 0
+    product_ids: Set[int] = field(default_factory=set)
+    # 최저 총 가격이 내려간 상품: 상품 ID -> (이전 가격, 새 가격)
+    price_drops: Dict[int, Tuple[Optional[Decimal], Decimal]] = field(default_factory=dict)
+
+
+def ingest_offers(items: Iterable[Tuple[int, OfferRecord]], emit_events: bool = True) -> IngestResult:
+    """(상품 ID, OfferRecord) 목록을 일괄 upsert (같은 필드를 가진 OfferLike도 허용)
+    
+    (상품, URL) 기준 bulk upsert 1회로 가격/배송비/수집 시각을 갱신하고,
+    새 오퍼이거나 총 가격이 바뀐 오퍼에 대해서만 가격 히스토리를 bulk_create로 추가한다.
+    가격이 바뀐 상품의 최저가 테이블도 함께 갱신하며, 최저 총 가격이 내려간 상품은
+    `price_dropped` 시그널로 알린다 (`emit_events=False`면 결과에만 기록).
+    
+    가격이 바뀐 상품 행을 트랜잭션 시작 시 잠그고 최저가 비교까지 같은 트랜잭션에서 하므로,
+    같은 상품을 동시에 수집해도 가격 하락은 한 번만 감지된다. 시그널은 커밋 후에 보낸다.
+    """
+    # 같은 (상품, URL)은 마지막 오퍼만 사용
+    incoming: Dict[Tuple[int, str], OfferRecord] = {}
+    for product_id, record in items:
+        incoming[(product_id, record.url)] = record
+    
+    result = IngestResult()
+    if not incoming:
+        return result
+    
+    product_ids = {product_id for product_id, _ in incoming}
+    existing = {
+        (row['product_id'], row['url']): row
+        for row in Offer.objects.filter(
+            product_id__in=product_ids,
+            url__in={url for _, url in incoming}
+        ).values('id', 'product_id', 'url', 'price', 'shipping_fee')
+    }
+    
+    now = timezone.now()
+    offers = []
+    changed_keys = []
+    for key, record in incoming.items():
+        product_id, url = key
+        offers.append(Offer(
+            product_id=product_id,
+            marketplace=record.marketplace,
+            seller=record.seller,
+            price=record.price,
+            shipping_fee=record.shipping_fee,
+            url=url,
+            affiliate_url=record.affiliate_url,
+            fetched_at=now
+        ))
+        
+        previous = existing.get(key)
+        if previous is None:
+            result.created += 1
+            changed_keys.append(key)
+        else:
+            result.updated += 1
+            if previous['price'] + previous['shipping_fee'] != record.price + record.shipping_fee:
+                result.price_changed += 1
+                changed_keys.append(key)
+    
+    result.product_ids = {product_id for product_id, _ in changed_keys}
+    with transaction.atomic():
+        if result.product_ids:
+            # 같은 상품을 동시에 수집하는 작업은 최저가 비교가 끝날 때까지 대기
+            list(
+                Product.objects.select_for_update()
+                .filter(pk__in=result.product_ids)
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+        
+        Offer.objects.bulk_create(
+            offers,
+            update_conflicts=True,
+            unique_fields=['product', 'url'],
+            update_fields=OFFER_UPDATE_FIELDS
+        )
+        
+        if changed_keys:
+            offer_ids = _offer_ids(changed_keys, offers, existing)
+            history = [
+                PriceHistory(
+                    offer_id=offer_ids[key],
+                    price=incoming[key].price,
+                    total_price=incoming[key].price + incoming[key].shipping_fee,
+                    recorded_at=now
+                )
+                for key in changed_keys
+            ]
+            PriceHistory.objects.bulk_create(history)
+            result.history_created = len(history)
+        
+        # 가격이 바뀐 상품만 최저가 테이블 갱신
+        if result.product_ids:
+            result.price_drops = _refresh_and_detect_drops(result.product_ids)
+            if emit_events and result.price_drops:
+                transaction.on_commit(lambda: _send_price_drops(result.price_drops))
+    
+    logger.info(
+        f"오퍼 수집 완료: 신규 {result.created}개, 갱신 {result.updated}개, "
+        f"가격 변경 {result.price_changed}개, 히스토리 {result.history_created}건"
+    )
+    return result
+
+
+def _refresh_and_detect_drops(product_ids: Set[int]) -> Dict[int, Tuple[Optional[Decimal], Decimal]]:
+    """최저가 테이블 갱신 후 최저 총 가격이 내려간 상품 반환 (상품 행을 잠근 트랜잭션 안에서 호출)"""
+    before = dict(
+        ProductBestPrice.objects.select_for_update()
+        .filter(product_id__in=product_ids)
+        .values_list('product_id', 'total_price')
+    )
+    refresh_best_prices(product_ids)
+    after = ProductBestPrice.objects.filter(product_id__in=product_ids).values_list('product_id', 'total_price')
+    
+    return {
+        product_id: (before.get(product_id), total_price)
+        for product_id, total_price in after
+        if before.get(product_id) is None or total_price < before[product_id]
+    }
+
+
+def _send_price_drops(price_drops: Dict[int, Tuple[Optional[Decimal], Decimal]]):
+    """가격 하락 시그널 전송 (수신자 오류는 로깅만)"""
+    for receiver, response in price_dropped.send_robust(sender=Offer, drops=price_drops):
+        if isinstance(response, Exception):
+            logger.error(f"가격 하락 이벤트 처리 중 오류: {str(response)}")
+
+
+def _offer_ids(keys: List[Tuple[int, str]], offers: List[Offer], existing: dict) -> Dict[Tuple[int, str], int]:
+    """upsert된 오퍼의 ID 조회 (DB가 ID를 반환하지 않으면 다시 조회)"""
+    offer_ids = {(offer.product_id, offer.url): offer.pk for offer in offers if offer.pk}
+    for key in keys:
+        if key not in offer_ids and key in existing:
+            offer_ids[key] = existing[key]['id']
+    
+    missing = [key for key in keys if key not in offer_ids]
+    if missing:
+        rows = Offer.objects.filter(
+            product_id__in={product_id for product_id, _ in missing},
+            url__in={url for _, url in missing}
+        ).values_list('product_id', 'url', 'id')
+        offer_ids.update({(product_id, url): offer_id for product_id, url, offer_id in rows})
+    return offer_ids
@@ -2,17 +2,151 @@
 상품 매칭 서비스
 """
 import re
-from typing import List, Dict, Any, Tuple
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
 from decimal import Decimal
+import numpy as np
+from django.conf import settings
 from ..models import Product, Offer
 
+# 점수 합산의 부동소수점 오차 여유 (블로킹 보장 계산용)
+_SCORE_EPSILON = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class TitleFeatures:
+    """제목 단위 매칭 특징 (제목당 한 번만 계산)"""
+    normalized: str
+    tokens: Dict[str, str]
+    model_code: str
+
+
+@dataclass(frozen=True, slots=True)
+class ProductFeatures:
+    """후보 단위 매칭 특징 (제목 특징 + 상품 필드 보정값)"""
+    tokens: Dict[str, str]
+    brand: str
+    model_code: str
+    gtin: Optional[str]
+
+
+class FeatureCache:
+    """제목 -> TitleFeatures LRU 캐시
+    
+    프로세스 단위로 유지되어 요청과 Celery 스캔 사이에서 재사용된다.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_build(self, title: str, builder: Callable[[str], TitleFeatures]) -> TitleFeatures:
+        """캐시 조회, 없으면 생성 후 저장"""
+        with self._lock:
+            features = self._entries.get(title)
+            if features is not None:
+                self._entries.move_to_end(title)
+                self.hits += 1
+                return features
+            self.misses += 1
+        
+        features = builder(title)
+        
+        with self._lock:
+            self._entries[title] = features
+            self._entries.move_to_end(title)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        
+        return features
+    
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def clear(self):
+        """캐시 및 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# 전역 제목 특징 캐시
+feature_cache = FeatureCache(getattr(settings, 'MATCHING_FEATURE_CACHE_SIZE', 4096))
+
+
+class DisjointSet:
+    """유니온-파인드 (경로 압축 + 크기 기준 합치기)"""
+    
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.members = {i: [i] for i in range(size)}
+    
+    def find(self, i: int) -> int:
+        """대표 원소 조회"""
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+    
+    def union(self, a: int, b: int) -> int:
+        """두 집합 합치기, 합쳐진 집합의 대표 원소 반환"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        
+        self.parent[root_b] = root_a
+        self.members[root_a].extend(self.members.pop(root_b))
+        return root_a
+    
+    def groups(self) -> List[List[int]]:
+        """집합 목록 (각 집합은 정렬된 원소 인덱스)"""
+        return [sorted(members) for members in self.members.values()]
+
 
 class ProductMatcher:
     """상품 매칭 서비스"""
     
-    def __init__(self, threshold: float = 0.75):
+    CLUSTERING_MODES = ('greedy', 'union_find')
+    LINKAGES = ('single', 'complete', 'average')
+    
+    def __init__(
+        self,
+        threshold: float = 0.75,
+        blocking: bool = True,
+        cache: FeatureCache = None,
+        clustering: str = 'greedy',
+        linkage: str = 'single'
+    ):
+        if clustering not in self.CLUSTERING_MODES:
+            raise ValueError(f"지원하지 않는 그룹핑 방식입니다: {clustering}")
+        if linkage not in self.LINKAGES:
+            raise ValueError(f"지원하지 않는 연결 기준입니다: {linkage}")
+        
         self.threshold = threshold
+        # 블로킹 사용 시 키를 공유하는 후보끼리만 점수 계산
+        self.blocking = blocking
+        self.cache = cache if cache is not None else feature_cache
+        # 그룹핑 방식: greedy(입력 순서 의존) 또는 union_find(순서 무관)
+        self.clustering = clustering
+        self.linkage = linkage
         # 가중치 설정
         self.weights = {
             'brand': 0.3,
@@ -134,34 +268,58 @@ class ProductMatcher:
         # 가격 차이의 백분율 계산
         diff = abs(price1 - price2)
         avg_price = (price1 + price2) / 2
-        proximity = 1 - (diff / avg_price)
+        proximity = float(1 - (diff / avg_price))
         
         return max(0.0, min(1.0, proximity))
     
+    def title_features(self, title: str) -> TitleFeatures:
+        """제목 특징 조회 (LRU 캐시)"""
+        return self.cache.get_or_build(title or "", self._build_title_features)
+    
+    def _build_title_features(self, title: str) -> TitleFeatures:
+        """제목 특징 계산: 정규화 문자열, 토큰, 소문자 모델 코드"""
+        tokens = self.extract_tokens(title)
+        return TitleFeatures(
+            normalized=self.normalize(title),
+            tokens=tokens,
+            model_code=tokens.get('model_code', '').lower()
+        )
+    
+    def product_features(self, product: Product) -> ProductFeatures:
+        """후보 특징 계산: 토큰에 없는 브랜드/모델 코드는 상품 필드로 보정"""
+        title = self.title_features(product.name)
+        return ProductFeatures(
+            tokens=title.tokens,
+            brand=(title.tokens.get('brand', product.brand) or '').lower(),
+            model_code=title.model_code or (product.model_code or '').lower(),
+            gtin=product.gtin
+        )
+    
     def score(self, product1: Product, product2: Product, offer1: Offer = None, offer2: Offer = None) -> float:
         """두 상품 간의 매칭 점수 계산"""
-        # 토큰 추출
-        tokens1 = self.extract_tokens(product1.name)
-        tokens2 = self.extract_tokens(product2.name)
-        
+        return self.score_features(
+            self.product_features(product1),
+            self.product_features(product2),
+            offer1,
+            offer2
+        )
+    
+    def score_features(
+        self, features1: ProductFeatures, features2: ProductFeatures, offer1: Offer = None, offer2: Offer = None
+    ) -> float:
+        """미리 계산한 특징으로 매칭 점수 계산"""
         # GTIN 동일 시 하드매칭
-        if product1.gtin and product2.gtin and product1.gtin == product2.gtin:
+        if features1.gtin and features2.gtin and features1.gtin == features2.gtin:
             return 1.0
         
         # 브랜드 유사도
-        brand_sim = self.calculate_brand_similarity(
-            tokens1.get('brand', product1.brand),
-            tokens2.get('brand', product2.brand)
-        )
+        brand_sim = self.calculate_brand_similarity(features1.brand, features2.brand)
         
         # 모델 코드 유사도
-        model_sim = self.calculate_model_similarity(
-            tokens1.get('model_code', product1.model_code),
-            tokens2.get('model_code', product2.model_code)
-        )
+        model_sim = self.calculate_model_similarity(features1.model_code, features2.model_code)
         
         # 스펙 중복도
-        spec_overlap = self.calculate_spec_overlap(tokens1, tokens2)
+        spec_overlap = self.calculate_spec_overlap(features1.tokens, features2.tokens)
         
         # 가격 근접도 (오퍼가 있는 경우)
         price_proximity = 0.0
@@ -178,42 +336,390 @@ class ProductMatcher:
         
         return score
     
+    def minimum_model_similarity(self) -> float:
+        """임계값에 도달할 수 있는 최소 모델 코드 유사도 (브랜드/스펙/가격이 모두 만점일 때)"""
+        rest = self.weights['brand'] + self.weights['spec_overlap'] + self.weights['price_proximity']
+        return (self.threshold - rest) / self.weights['model_code']
+    
+    def brand_required(self) -> bool:
+        """브랜드 유사도 없이는 임계값에 도달할 수 없으면 True"""
+        rest = self.weights['model_code'] + self.weights['spec_overlap'] + self.weights['price_proximity']
+        return self.threshold > rest + _SCORE_EPSILON
+    
+    def blocking_applies(self) -> bool:
+        """블로킹 키가 임계값 이상인 쌍을 모두 보장하면 True
+        
+        모델 코드가 없어도 임계값에 도달할 수 있을 만큼 임계값이 낮으면 키로 거를 수 없으므로
+        전수 비교로 대체한다.
+        """
+        return self.blocking and self.minimum_model_similarity() > _SCORE_EPSILON
+    
+    def brand_scopes(self, brands: List[str]) -> Dict[str, List[str]]:
+        """브랜드별 블로킹 범위: 묶음 안의 브랜드 중 자신에 포함되는 브랜드 목록
+        
+        브랜드 유사도는 한쪽이 다른 쪽에 포함될 때(삼성/삼성전자)도 0보다 크므로
+        짧은 쪽 브랜드를 두 후보가 함께 범위로 갖게 한다.
+        """
+        distinct = sorted({brand for brand in brands if brand})
+        return {brand: [scope for scope in distinct if scope in brand] for brand in distinct}
+    
+    def blocking_keys(self, product: Product) -> List[Tuple]:
+        """상품 하나의 블로킹 키 (다른 후보 없이 계산)"""
+        return self.batch_blocking_keys([self.product_features(product)])[0]
+    
+    def batch_blocking_keys(self, features: List[ProductFeatures]) -> List[List[Tuple]]:
+        """후보 묶음의 블로킹 키: GTIN, 범위+유사 모델 코드 쌍
+        
+        GTIN이 같으면 1.0, 아니면 점수는 모델 코드 유사도가 `minimum_model_similarity()`
+        이상이고 (임계값에 따라) 브랜드 유사도가 0보다 커야 임계값에 도달할 수 있다.
+        그래서 같은 범위(브랜드, 필요 없으면 전체) 안에서 그 유사도 이상인 모델 코드 쌍마다
+        키를 만들어 임계값에 도달할 수 있는 쌍은 반드시 키를 공유하게 한다.
+        """
+        brand_required = self.brand_required()
+        scopes = self.brand_scopes([f.brand for f in features]) if brand_required else {}
+        
+        candidate_scopes = []
+        codes_by_scope = defaultdict(set)
+        for f in features:
+            own_scopes = scopes.get(f.brand, []) if brand_required else ['*']
+            candidate_scopes.append(own_scopes)
+            if f.model_code:
+                for scope in own_scopes:
+                    codes_by_scope[scope].add(f.model_code)
+        
+        min_similarity = self.minimum_model_similarity() - _SCORE_EPSILON
+        similar = {}
+        
+        def similar_codes(scope: str, code: str) -> List[str]:
+            key = (scope, code)
+            if key not in similar:
+                similar[key] = sorted(
+                    other for other in codes_by_scope[scope]
+                    if self._model_similarity_at_least(code, other, min_similarity)
+                )
+            return similar[key]
+        
+        keys = []
+        for f, own_scopes in zip(features, candidate_scopes):
+            candidate_keys = []
+            if f.gtin:
+                candidate_keys.append(('gtin', f.gtin))
+            if f.model_code:
+                for scope in own_scopes:
+                    for other in similar_codes(scope, f.model_code):
+                        candidate_keys.append(('model', scope) + tuple(sorted((f.model_code, other))))
+            keys.append(candidate_keys)
+        
+        return keys
+    
+    def _model_similarity_at_least(self, model1: str, model2: str, minimum: float) -> bool:
+        """모델 코드 유사도가 minimum 이상인지 (상한값으로 먼저 걸러냄)"""
+        if model1 == model2:
+            return True
+        matcher = SequenceMatcher(None, model1, model2)
+        return (
+            matcher.real_quick_ratio() >= minimum and
+            matcher.quick_ratio() >= minimum and
+            matcher.ratio() >= minimum
+        )
+    
+    def build_blocking_index(
+        self, candidates: List[Dict[str, Any]], features: List[ProductFeatures] = None
+    ) -> Dict[Tuple, List[int]]:
+        """블로킹 인덱스 생성: 블로킹 키 -> 후보 인덱스 목록"""
+        if features is None:
+            features = [self.product_features(candidate['product']) for candidate in candidates]
+        
+        index = defaultdict(list)
+        for i, candidate_keys in enumerate(self.batch_blocking_keys(features)):
+            for key in candidate_keys:
+                index[key].append(i)
+        return index
+    
+    def candidate_neighbours(
+        self, candidates: List[Dict[str, Any]], features: List[ProductFeatures] = None
+    ) -> List[List[int]]:
+        """후보별 비교 대상 목록 (자신보다 뒤에 있고 블로킹 키를 공유하는 후보)"""
+        if not self.blocking_applies():
+            return [list(range(i + 1, len(candidates))) for i in range(len(candidates))]
+        
+        neighbours = [set() for _ in candidates]
+        for members in self.build_blocking_index(candidates, features).values():
+            for position, i in enumerate(members):
+                neighbours[i].update(members[position + 1:])
+        
+        return [sorted(others) for others in neighbours]
+    
     def match_products(self, candidates: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """상품 그룹핑: 동일 상품으로 판단되는 것들을 그룹화"""
         if not candidates:
             return []
         
+        if self.clustering == 'union_find':
+            return self.match_products_union_find(candidates)
+        
+        return self.match_products_vectorized(candidates)
+    
+    def score_matrix(
+        self, candidates: List[Dict[str, Any]], features: List[ProductFeatures] = None
+    ) -> np.ndarray:
+        """후보 전체의 매칭 점수 행렬 계산 (NumPy)
+        
+        score()와 같은 가중합을 쌍별 루프 대신 n x n 배열 연산으로 계산한다.
+        브랜드/모델 코드 유사도는 고유값끼리만 계산한 뒤 인덱싱으로 펼친다.
+        """
+        n = len(candidates)
+        if n == 0:
+            return np.zeros((0, 0))
+        
+        if features is None:
+            features = [self.product_features(candidate['product']) for candidate in candidates]
+        
+        brand_sim = self._similarity_matrix(
+            [f.brand for f in features], self.calculate_brand_similarity
+        )
+        model_sim = self._similarity_matrix(
+            [f.model_code for f in features], self.calculate_model_similarity
+        )
+        spec_overlap = self._spec_overlap_matrix(features)
+        price_proximity = self._price_proximity_matrix(candidates)
+        
+        scores = (
+            self.weights['brand'] * brand_sim +
+            self.weights['model_code'] * model_sim +
+            self.weights['spec_overlap'] * spec_overlap +
+            self.weights['price_proximity'] * price_proximity
+        )
+        
+        # GTIN 동일 시 하드매칭
+        gtin_codes = self._encode([f.gtin or '' for f in features])
+        scores[self._equal_present(gtin_codes)] = 1.0
+        np.fill_diagonal(scores, 1.0)
+        
+        return scores
+    
+    def _encode(self, values: List[str]) -> np.ndarray:
+        """문자열 값을 정수 코드로 변환 (빈 값은 -1)"""
+        codes = {}
+        return np.array(
+            [codes.setdefault(value, len(codes)) if value else -1 for value in values],
+            dtype=np.int64
+        )
+    
+    def _equal_present(self, codes: np.ndarray) -> np.ndarray:
+        """두 후보 모두 값이 있고 같은 위치의 불리언 행렬"""
+        present = codes >= 0
+        return (codes[:, None] == codes[None, :]) & present[:, None] & present[None, :]
+    
+    def _similarity_matrix(self, values: List[str], similarity: Callable[[str, str], float]) -> np.ndarray:
+        """고유값 쌍별 유사도 테이블을 후보 행렬로 펼침"""
+        uniques = list(dict.fromkeys(values))
+        position = {value: i for i, value in enumerate(uniques)}
+        
+        table = np.zeros((len(uniques), len(uniques)))
+        for i, first in enumerate(uniques):
+            for j in range(i, len(uniques)):
+                table[i, j] = table[j, i] = similarity(first, uniques[j])
+        
+        ids = np.array([position[value] for value in values], dtype=np.int64)
+        return table[np.ix_(ids, ids)]
+    
+    def _spec_overlap_matrix(self, features: List[ProductFeatures]) -> np.ndarray:
+        """토큰 키별 공통/일치 개수 행렬로 스펙 중복도 계산"""
+        n = len(features)
+        common = np.zeros((n, n))
+        matches = np.zeros((n, n))
+        
+        token_keys = sorted({key for f in features for key in f.tokens})
+        for key in token_keys:
+            codes = self._encode([f.tokens.get(key, '') for f in features])
+            present = codes >= 0
+            common += present[:, None] & present[None, :]
+            matches += self._equal_present(codes)
+        
+        overlap = np.zeros((n, n))
+        np.divide(matches, common, out=overlap, where=common > 0)
+        return overlap
+    
+    def _price_proximity_matrix(self, candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """가격 근접도 행렬 (가격이 없는 후보는 0)"""
+        prices = np.array([
+            float(candidate['offer'].price) if candidate.get('offer') and candidate['offer'].price else 0.0
+            for candidate in candidates
+        ])
+        valid = prices > 0
+        
+        diff = np.abs(prices[:, None] - prices[None, :])
+        avg_price = (prices[:, None] + prices[None, :]) / 2
+        
+        proximity = np.zeros_like(diff)
+        np.divide(diff, avg_price, out=proximity, where=avg_price > 0)
+        proximity = np.clip(1 - proximity, 0.0, 1.0)
+        proximity[~(valid[:, None] & valid[None, :])] = 0.0
+        return proximity
+    
+    def group_score_matrix(self, candidates: List[Dict[str, Any]], scores: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """점수 행렬 기반 그룹핑 (match_products와 같은 순서 의존 그리디 규칙)"""
+        return [[candidates[i] for i in group] for group in self._greedy_groups(scores)]
+    
+    def _greedy_groups(self, scores: np.ndarray) -> List[List[int]]:
+        """임계값 이상인 뒤쪽 후보를 앞쪽 대표 후보에 붙이는 그리디 그룹핑 (인덱스 기준)"""
+        above = scores >= self.threshold
+        assigned = np.zeros(len(scores), dtype=bool)
         groups = []
-        processed = set()
         
-        for i, candidate in enumerate(candidates):
-            if i in processed:
+        for i in range(len(scores)):
+            if assigned[i]:
                 continue
             
-            group = [candidate]
-            processed.add(i)
+            members = np.flatnonzero(above[i, i + 1:] & ~assigned[i + 1:]) + i + 1
+            assigned[i] = True
+            assigned[members] = True
+            groups.append([i] + members.tolist())
+        
+        return groups
+    
+    def blocking_components(
+        self, candidates: List[Dict[str, Any]], features: List[ProductFeatures] = None
+    ) -> List[List[int]]:
+        """블로킹 키로 연결된 후보 묶음 (묶음 사이에는 매칭이 일어나지 않음)"""
+        if not self.blocking_applies():
+            return [list(range(len(candidates)))] if candidates else []
+        
+        components = DisjointSet(len(candidates))
+        for members in self.build_blocking_index(candidates, features).values():
+            for i in members[1:]:
+                components.union(members[0], i)
+        
+        return sorted(components.groups(), key=lambda members: members[0])
+    
+    def match_products_vectorized(self, candidates: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """그리디 그룹핑: 블로킹 묶음마다 점수 행렬을 계산해 그룹화
+        
+        전체 n x n 행렬 대신 블로킹 묶음 크기의 행렬만 만들기 때문에 검색 결과부터
+        카탈로그 전체 재매칭까지 같은 경로를 쓴다. 묶음 밖의 쌍은 임계값에 도달할 수 없으므로
+        전체 쌍을 비교한 그리디 결과와 같다.
+        """
+        if not candidates:
+            return []
+        
+        # 후보별 특징은 한 번만 계산
+        features = [self.product_features(candidate['product']) for candidate in candidates]
+        seeded_groups = []
+        for members in self.blocking_components(candidates, features):
+            component = [candidates[i] for i in members]
+            scores = self.score_matrix(component, [features[i] for i in members])
+            for group in self._greedy_groups(scores):
+                # 원래 위치로 되돌려 대표 후보 순서대로 정렬
+                seeded_groups.append((members[group[0]], [component[i] for i in group]))
+        
+        seeded_groups.sort(key=lambda item: item[0])
+        return [group for _, group in seeded_groups]
+    
+    def candidate_key(self, candidate: Dict[str, Any]) -> Tuple:
+        """입력 순서와 무관한 후보 식별 키 (정렬/동점 처리용)"""
+        product = candidate['product']
+        offer = candidate.get('offer')
+        return (
+            offer.url if offer is not None and offer.url else '',
+            product.pk or 0,
+            product.name or ''
+        )
+    
+    def candidate_pairs(self, candidates: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """점수를 계산할 후보 쌍 (블로킹 키를 공유하는 i < j 쌍)"""
+        features = [self.product_features(candidate['product']) for candidate in candidates]
+        return [
+            (i, j)
+            for i, others in enumerate(self.candidate_neighbours(candidates, features))
+            for j in others
+        ]
+    
+    def score_edges(
+        self, candidates: List[Dict[str, Any]], pairs: List[Tuple[int, int]] = None
+    ) -> List[Tuple[int, int, float]]:
+        """후보 쌍별 점수 계산 (i, j, score)
+        
+        pairs를 나눠 여러 프로세스에서 계산한 뒤 결과를 이어 붙여
+        cluster_edges에 넘기면 한 번에 계산한 것과 같은 그룹이 나온다.
+        """
+        if pairs is None:
+            pairs = self.candidate_pairs(candidates)
+        
+        features = {}
+        keys = {}
+        
+        def prepare(i: int):
+            if i not in features:
+                features[i] = self.product_features(candidates[i]['product'])
+                keys[i] = self.candidate_key(candidates[i])
+        
+        edges = []
+        for i, j in pairs:
+            prepare(i)
+            prepare(j)
+            # 점수가 입력 순서에 좌우되지 않도록 식별 키 순서로 계산
+            first, second = (i, j) if keys[i] <= keys[j] else (j, i)
+            score = self.score_features(
+                features[first],
+                features[second],
+                candidates[first].get('offer'),
+                candidates[second].get('offer')
+            )
+            edges.append((min(i, j), max(i, j), score))
+        
+        return edges
+    
+    def cluster_edges(
+        self, candidates: List[Dict[str, Any]], edges: List[Tuple[int, int, float]]
+    ) -> List[List[int]]:
+        """유니온-파인드 그룹핑 (인덱스 기준)
+        
+        - single: 임계값 이상인 간선으로 연결된 후보를 모두 같은 그룹으로 묶음
+        - complete: 두 그룹의 모든 후보 쌍이 임계값 이상일 때만 합침
+        - average: 두 그룹 후보 쌍의 평균 점수가 임계값 이상일 때만 합침
+        
+        점수가 없는 쌍(블로킹으로 비교하지 않은 쌍)은 0점으로 본다.
+        """
+        keys = [self.candidate_key(candidate) for candidate in candidates]
+        clusters = DisjointSet(len(candidates))
+        scores = {(i, j): score for i, j, score in edges}
+        
+        # 높은 점수부터, 동점은 식별 키 순서로 처리해 입력 순서와 무관하게 만듦
+        accepted = sorted(
+            (edge for edge in edges if edge[2] >= self.threshold),
+            key=lambda edge: (-edge[2], min(keys[edge[0]], keys[edge[1]]), max(keys[edge[0]], keys[edge[1]]))
+        )
+        
+        for i, j, _ in accepted:
+            root_i, root_j = clusters.find(i), clusters.find(j)
+            if root_i == root_j:
+                continue
             
-            # 다른 후보들과 비교
-            for j, other in enumerate(candidates[i+1:], i+1):
-                if j in processed:
+            if self.linkage != 'single':
+                cross = [
+                    scores.get((min(a, b), max(a, b)), 0.0)
+                    for a in clusters.members[root_i]
+                    for b in clusters.members[root_j]
+                ]
+                if self.linkage == 'complete' and min(cross) < self.threshold:
+                    continue
+                if self.linkage == 'average' and sum(cross) / len(cross) < self.threshold:
                     continue
-                
-                # 매칭 점수 계산
-                score = self.score(
-                    candidate['product'], 
-                    other['product'],
-                    candidate.get('offer'),
-                    other.get('offer')
-                )
-                
-                # 임계값 이상이면 같은 그룹에 추가
-                if score >= self.threshold:
-                    group.append(other)
-                    processed.add(j)
             
-            groups.append(group)
+            clusters.union(i, j)
         
-        return groups
+        # 그룹 내부/그룹 간 순서도 식별 키 기준으로 고정
+        groups = [sorted(group, key=lambda i: keys[i]) for group in clusters.groups()]
+        return sorted(groups, key=lambda group: keys[group[0]])
+    
+    def match_products_union_find(self, candidates: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """유니온-파인드 기반 그룹핑 (입력 순서와 무관한 결정적 결과)"""
+        if not candidates:
+            return []
+        
+        groups = self.cluster_edges(candidates, self.score_edges(candidates))
+        return [[candidates[i] for i in group] for group in groups]
 
 
 def match_products_by_offers(offers: List[Offer]) -> List[List[Offer]]:
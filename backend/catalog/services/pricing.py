@@ -0,0 +1,135 @@
+"""
+최저가 조회 서비스
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, IntegerField, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from ..models import Offer, Product, ProductBestPrice
+
+logger = logging.getLogger(__name__)
+
+# 최저가 오퍼 어노테이션 필드
+BEST_OFFER_FIELDS = ('id', 'price', 'shipping_fee', 'marketplace', 'seller')
+
+# 최저가 테이블 갱신 배치 크기
+REFRESH_BATCH_SIZE = 500
+
+
+def best_offer_annotations(product_ref: str = 'pk', prefix: str = 'best_') -> Dict[str, Any]:
+    """상품별 최저가 오퍼/오퍼 개수 어노테이션
+    
+    `queryset.annotate(**best_offer_annotations())` 형태로 사용하며,
+    목록 크기와 무관하게 한 번의 쿼리로 최저가 정보를 함께 조회한다.
+    최저가 오퍼는 알림 판단과 같이 총 가격(가격 + 배송비) 기준으로 고른다.
+    """
+    offers = Offer.objects.filter(product_id=OuterRef(product_ref))
+    best_offer = offers.alias(total=F('price') + F('shipping_fee')).order_by('total', '-fetched_at')
+    
+    annotations = {
+        f'{prefix}{field}': Subquery(best_offer.values(field)[:1])
+        for field in BEST_OFFER_FIELDS
+    }
+    annotations[f'{prefix}total_price'] = ExpressionWrapper(
+        F(f'{prefix}price') + F(f'{prefix}shipping_fee'),
+        output_field=DecimalField(max_digits=11, decimal_places=0)
+    )
+    annotations['offer_count'] = Coalesce(
+        Subquery(
+            offers.order_by().values('product_id').annotate(count=Count('pk')).values('count'),
+            output_field=IntegerField()
+        ),
+        Value(0)
+    )
+    return annotations
+
+
+def refresh_best_prices(product_ids: Iterable[int]) -> int:
+    """상품 최저가 테이블 갱신
+    
+    오퍼가 기록된 상품만 다시 계산하며, 상품 수와 무관하게 배치마다
+    조회 1회 + upsert 1회 + 삭제 1회로 처리한다. 갱신된 행 수를 반환한다.
+    """
+    product_ids = sorted(set(product_ids))
+    updated = 0
+    
+    for start in range(0, len(product_ids), REFRESH_BATCH_SIZE):
+        batch = product_ids[start:start + REFRESH_BATCH_SIZE]
+        min_price = Offer.objects.filter(product_id=OuterRef('pk')).order_by().values('product_id').annotate(
+            min_price=Min('price')
+        ).values('min_price')
+        
+        rows = Product.objects.filter(pk__in=batch).order_by().annotate(
+            **best_offer_annotations(),
+            min_price=Subquery(min_price)
+        ).values(
+            'pk', 'best_id', 'best_price', 'best_total_price', 'best_marketplace', 'best_seller',
+            'min_price', 'offer_count'
+        )
+        
+        records = []
+        empty = []
+        for row in rows:
+            if row['best_id'] is None:
+                empty.append(row['pk'])
+                continue
+            records.append(ProductBestPrice(
+                product_id=row['pk'],
+                offer_id=row['best_id'],
+                price=row['best_price'],
+                total_price=row['best_total_price'],
+                min_price=row['min_price'],
+                marketplace=row['best_marketplace'],
+                seller=row['best_seller'],
+                offer_count=row['offer_count']
+            ))
+        
+        with transaction.atomic():
+            if records:
+                ProductBestPrice.objects.bulk_create(
+                    records,
+                    update_conflicts=True,
+                    unique_fields=['product'],
+                    update_fields=[
+                        'offer', 'price', 'total_price', 'min_price',
+                        'marketplace', 'seller', 'offer_count', 'updated_at'
+                    ]
+                )
+            if empty:
+                ProductBestPrice.objects.filter(product_id__in=empty).delete()
+        
+        updated += len(records)
+    
+    return updated
+
+
+def rebuild_best_prices() -> int:
+    """전체 상품 최저가 테이블 재구성"""
+    product_ids = Product.objects.order_by().values_list('pk', flat=True).iterator(chunk_size=REFRESH_BATCH_SIZE)
+    updated = refresh_best_prices(product_ids)
+    
+    # 오퍼가 모두 사라진 상품의 행 정리
+    ProductBestPrice.objects.filter(offer__isnull=True).delete()
+    logger.info(f"최저가 테이블 재구성 완료: {updated}개 상품")
+    return updated
+
+
+def current_best_price(record: Optional[ProductBestPrice]) -> Optional[ProductBestPrice]:
+    """유효한 최저가 레코드 (오퍼가 삭제되어 다시 계산되기 전인 행은 None)"""
+    if record is None or record.offer_id is None:
+        return None
+    return record
+
+
+def best_price_data(record: Optional[ProductBestPrice]) -> Optional[Dict[str, Any]]:
+    """최저가 응답 구성 (레코드가 없거나 오퍼가 삭제되었으면 None)"""
+    record = current_best_price(record)
+    if record is None:
+        return None
+    return {
+        'price': record.price,
+        'total_price': record.total_price,
+        'marketplace': record.marketplace,
+        'seller': record.seller
+    }
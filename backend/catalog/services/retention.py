@@ -0,0 +1,209 @@
+"""
+데이터 보존(retention) 서비스
+"""
+import logging
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from ..models import Offer, PriceHistory, PriceHistoryDaily
+from .pricing import refresh_best_prices
+
+logger = logging.getLogger(__name__)
+
+# 일별 요약 upsert 시 갱신하는 필드
+DAILY_UPDATE_FIELDS = ['min_total_price', 'max_total_price', 'close_total_price', 'closed_at', 'sample_count']
+
+DailyKey = Tuple[int, str, date]
+
+
+def delete_in_chunks(
+    queryset: QuerySet,
+    chunk_size: int,
+    before_delete: Optional[Callable[[List[int]], None]] = None,
+    after_delete: Optional[Callable[[List[int]], None]] = None
+) -> int:
+    """조건에 맞는 행을 PK 순서대로 `chunk_size`개씩 나눠 삭제
+    
+    구간마다 별도 트랜잭션으로 처리해 긴 락을 잡지 않는다. 삭제 직전에 같은 조건으로
+    다시 잠그므로, 조회 이후 갱신된 행은 건너뛴다. `before_delete`/`after_delete`는
+    같은 트랜잭션 안에서 삭제 직전/직후에 삭제될(된) PK 목록으로 호출된다.
+    """
+    deleted = 0
+    last_pk = 0
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        last_pk = ids[-1]
+        
+        with transaction.atomic():
+            locked = list(
+                queryset.filter(pk__in=ids)
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)
+            )
+            if not locked:
+                continue
+            if before_delete:
+                before_delete(locked)
+            queryset.model.objects.filter(pk__in=locked).delete()
+            if after_delete:
+                after_delete(locked)
+        deleted += len(locked)
+    
+    return deleted
+
+
+def rollup_price_history(history: QuerySet) -> int:
+    """가격 히스토리를 상품/마켓플레이스/날짜별 일별 요약에 합산
+    
+    이미 있는 요약 행과 병합하므로 같은 날짜가 여러 구간에 나뉘어도 결과가 같다.
+    반환값은 갱신된 요약 행 수.
+    """
+    summaries: Dict[DailyKey, PriceHistoryDaily] = {}
+    rows = history.order_by().values_list('offer__product_id', 'offer__marketplace', 'total_price', 'recorded_at')
+    for product_id, marketplace, total_price, recorded_at in rows:
+        key = (product_id, marketplace, _local_date(recorded_at))
+        _merge(summaries, key, total_price, total_price, total_price, recorded_at, 1)
+    
+    if not summaries:
+        return 0
+    
+    existing = PriceHistoryDaily.objects.filter(
+        product_id__in={product_id for product_id, _, _ in summaries},
+        date__in={day for _, _, day in summaries}
+    )
+    for row in existing:
+        key = (row.product_id, row.marketplace, row.date)
+        if key in summaries:
+            _merge(
+                summaries, key, row.min_total_price, row.max_total_price,
+                row.close_total_price, row.closed_at, row.sample_count
+            )
+    
+    PriceHistoryDaily.objects.bulk_create(
+        summaries.values(),
+        update_conflicts=True,
+        unique_fields=['product', 'marketplace', 'date'],
+        update_fields=DAILY_UPDATE_FIELDS
+    )
+    return len(summaries)
+
+
+def purge_stale_offers(before: datetime, chunk_size: int) -> int:
+    """`before` 이후 다시 수집되지 않은 오퍼 삭제
+    
+    오퍼를 지울 때 히스토리가 한꺼번에 연쇄 삭제되지 않도록, 먼저 삭제될 오퍼의 가격
+    히스토리를 구간별로 일별 요약에 합산해 지운 뒤 오퍼를 구간별로 삭제한다. 오퍼가
+    사라진 상품의 최저가는 구간마다 같은 트랜잭션 안에서 다시 계산한다.
+    """
+    stale = Offer.objects.filter(fetched_at__lt=before)
+    product_ids = []
+    
+    delete_in_chunks(
+        PriceHistory.objects.filter(offer__in=stale),
+        chunk_size,
+        lambda ids: rollup_price_history(PriceHistory.objects.filter(pk__in=ids))
+    )
+    
+    def archive(offer_ids: List[int]):
+        # 첫 단계 이후 새로 기록된 히스토리만 남아 있음
+        leftover = PriceHistory.objects.filter(offer_id__in=offer_ids)
+        rollup_price_history(leftover)
+        leftover.delete()
+        product_ids[:] = Offer.objects.filter(pk__in=offer_ids).values_list('product_id', flat=True)
+    
+    def refresh(offer_ids: List[int]):
+        # 오퍼가 사라진 상품의 최저가 다시 계산
+        refresh_best_prices(product_ids)
+    
+    return delete_in_chunks(stale, chunk_size, archive, refresh)
+
+
+def purge_price_history(before: datetime, chunk_size: int) -> int:
+    """`before` 이전 가격 히스토리를 일별 요약으로 합산한 뒤 삭제"""
+    return delete_in_chunks(
+        PriceHistory.objects.filter(recorded_at__lt=before),
+        chunk_size,
+        lambda ids: rollup_price_history(PriceHistory.objects.filter(pk__in=ids))
+    )
+
+
+def purge_daily_prices(before: date, chunk_size: int) -> int:
+    """`before` 이전 일별 요약 삭제"""
+    return delete_in_chunks(PriceHistoryDaily.objects.filter(date__lt=before), chunk_size)
+
+
+def cleanup_old_data(now: Optional[datetime] = None, chunk_size: Optional[int] = None) -> Dict[str, int]:
+    """테이블별 보존 기간(`RETENTION_*_DAYS`)이 지난 카탈로그 데이터 정리
+    
+    보존 기간이 0이면 해당 테이블은 건너뛴다. 오퍼를 먼저 정리해 삭제될 오퍼의
+    히스토리까지 요약에 포함시킨 뒤, 남은 오래된 히스토리를 요약하고 삭제한다.
+    """
+    now = now or timezone.now()
+    chunk_size = chunk_size or getattr(settings, 'RETENTION_CHUNK_SIZE', 1000)
+    offer_days = getattr(settings, 'RETENTION_OFFER_DAYS', 30)
+    history_days = getattr(settings, 'RETENTION_PRICE_HISTORY_DAYS', 90)
+    daily_days = getattr(settings, 'RETENTION_PRICE_HISTORY_DAILY_DAYS', 0)
+    stats = {'offers': 0, 'price_history': 0, 'daily_prices': 0}
+    
+    if offer_days:
+        stats['offers'] = purge_stale_offers(now - timedelta(days=offer_days), chunk_size)
+    
+    if history_days:
+        stats['price_history'] = purge_price_history(now - timedelta(days=history_days), chunk_size)
+    
+    if daily_days:
+        stats['daily_prices'] = purge_daily_prices(_local_date(now) - timedelta(days=daily_days), chunk_size)
+    
+    logger.info(
+        f"데이터 정리 완료: 오퍼 {stats['offers']}개, 히스토리 {stats['price_history']}건, "
+        f"일별 요약 {stats['daily_prices']}건 삭제"
+    )
+    return stats
+
+
+def _merge(
+    summaries: Dict[DailyKey, PriceHistoryDaily],
+    key: DailyKey,
+    low: Decimal,
+    high: Decimal,
+    close: Decimal,
+    closed_at: datetime,
+    count: int
+):
+    """일별 요약에 값 합산 (종가는 더 늦게 기록된 값)"""
+    summary = summaries.get(key)
+    if summary is None:
+        product_id, marketplace, day = key
+        summaries[key] = PriceHistoryDaily(
+            product_id=product_id,
+            marketplace=marketplace,
+            date=day,
+            min_total_price=low,
+            max_total_price=high,
+            close_total_price=close,
+            closed_at=closed_at,
+            sample_count=count
+        )
+        return
+    
+    summary.min_total_price = min(summary.min_total_price, low)
+    summary.max_total_price = max(summary.max_total_price, high)
+    if closed_at >= summary.closed_at:
+        summary.close_total_price = close
+        summary.closed_at = closed_at
+    summary.sample_count += count
+
+
+def _local_date(value: datetime) -> date:
+    """현지 시간 기준 날짜"""
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
@@ -2,30 +2,116 @@
 검색 서비스
 """
 import asyncio
-from typing import List, Dict, Any
-from decimal import Decimal
-from ..models import Product, Offer
-from ..providers.base import provider_registry, OfferLike
+import logging
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from ..models import Product
+from ..providers.base import provider_registry
+from ..providers.records import OfferRecord
+from .cache import SearchResultCache, search_cache
+from .ingest import ingest_offers
 from .matching import ProductMatcher
 
+logger = logging.getLogger(__name__)
+
 
 class SearchService:
     """검색 서비스"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[SearchResultCache] = search_cache):
         self.matcher = ProductMatcher()
+        self.cache = cache
     
-    async def search_products(self, keyword: str) -> Dict[str, Any]:
-        """키워드로 상품 검색"""
-        # 모든 프로바이더에서 검색
-        search_results = await provider_registry.search_all(keyword)
+    async def search_products(self, keyword: str, use_cache: bool = True) -> Dict[str, Any]:
+        """키워드로 상품 검색 (결과 캐시 사용)"""
+        if not use_cache or self.cache is None:
+            return await self._search_products(keyword)
+        
+        providers = [p.get_name() for p in provider_registry.get_available_providers()]
+        return await self.cache.get_or_fetch(
+            keyword,
+            providers,
+            lambda: self._search_products(keyword),
+            cacheable=self._is_cacheable
+        )
+    
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        """타임아웃/실패 프로바이더가 있는 부분 결과는 캐시하지 않음"""
+        return not result['timed_out_providers'] and not result['failed_providers']
+    
+    async def _search_products(self, keyword: str) -> Dict[str, Any]:
+        """키워드로 상품 검색 (캐시 미사용)"""
+        # 모든 프로바이더에서 동시 검색 (프로바이더별 타임아웃)
+        fan_out_result = await provider_registry.fan_out(keyword)
         
         # 모든 오퍼 수집
         all_offers = []
-        for result in search_results:
+        for result in fan_out_result.results:
             all_offers.extend(result.offers)
         
-        if not all_offers:
+        # 오퍼별 상품 조회/생성 후 매칭
+        _, result = await self._match(all_offers, [])
+        result['timed_out_providers'] = fan_out_result.timed_out
+        result['failed_providers'] = list(fan_out_result.failed)
+        return result
+    
+    async def stream_search_products(self, keyword: str, use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """키워드로 상품 검색 (스트리밍)
+        
+        프로바이더가 응답할 때마다 지금까지 모인 오퍼로 매칭한 상품 그룹과
+        현재 최저가를 담은 `partial` 이벤트를 내보내고, 마지막에 `done` 이벤트를 내보낸다.
+        캐시에 결과가 있으면 `done` 이벤트 하나만 보내고, 끝까지 받은 결과는 캐시에 저장한다.
+        """
+        providers = [p.get_name() for p in provider_registry.get_available_providers()]
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = await self.cache.get(
+                keyword,
+                providers,
+                lambda: self._search_products(keyword),
+                cacheable=self._is_cacheable
+            )
+            if cached is not None:
+                yield {'event': 'done', 'cached': True, **cached}
+                return
+        
+        pending = set(providers)
+        candidates = []
+        built = self._build_result(candidates)
+        timed_out = []
+        failed = []
+        
+        async for outcome in provider_registry.iter_fan_out(keyword):
+            pending.discard(outcome.provider)
+            
+            if outcome.status == 'ok':
+                candidates, built = await self._match(outcome.result.offers, candidates)
+            elif outcome.status == 'timeout':
+                timed_out.append(outcome.provider)
+            else:
+                failed.append(outcome.provider)
+            
+            yield {
+                'event': 'partial',
+                'provider': outcome.provider,
+                'status': outcome.status,
+                'pending_providers': sorted(pending),
+                **built
+            }
+        
+        result = dict(built)
+        result['timed_out_providers'] = timed_out
+        result['failed_providers'] = failed
+        if use_cache and self._is_cacheable(result):
+            await self.cache.set(keyword, providers, result)
+        
+        yield {'event': 'done', 'cached': False, **result}
+    
+    def _build_result(self, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """오퍼 매칭 후 상품 그룹/최저가 응답 구성 (후보는 {'product', 'offer': OfferRecord})"""
+        if not candidates:
             return {
                 'products': [],
                 'offers': [],
@@ -33,13 +119,8 @@ class SearchService:
                 'total_count': 0
             }
         
-        # 오퍼를 Product/Offer 모델로 변환
-        offers = await self._convert_offers_to_models(all_offers)
-        
         # 상품 매칭 실행
-        matched_groups = self.matcher.match_products([
-            {'product': offer.product, 'offer': offer} for offer in offers
-        ])
+        matched_groups = self.matcher.match_products(candidates)
         
         # 결과 구성
         products = []
@@ -51,15 +132,14 @@ class SearchService:
                 continue
             
             # 그룹의 대표 상품 선택 (첫 번째)
-            representative_offer = group[0]
-            product = representative_offer.product
+            product = group[0]['product']
             
             # 그룹의 모든 오퍼 수집
             group_offers = [item['offer'] for item in group]
             
             # 최저가 계산
             min_price_offer = min(group_offers, key=lambda x: x.price)
-            total_price = min_price_offer.price + min_price_offer.shipping_fee
+            total_price = min_price_offer.total_price
             
             # 전체 최저가 업데이트
             if best_price is None or total_price < best_price['total_price']:
@@ -89,7 +169,7 @@ class SearchService:
             }
             
             products.append(product_info)
-            all_offers_list.extend(group_offers)
+            all_offers_list.extend(self._serialize_offer(item['product'].id, item['offer']) for item in group)
         
         return {
             'products': products,
@@ -98,51 +178,122 @@ class SearchService:
             'total_count': len(products)
         }
     
-    async def _convert_offers_to_models(self, offer_likes: List[OfferLike]) -> List[Offer]:
-        """OfferLike를 Offer 모델로 변환"""
-        offers = []
-        
-        for offer_like in offer_likes:
-            # 상품 생성 또는 조회
-            product, created = await self._get_or_create_product(offer_like)
-            
-            # 오퍼 생성
-            offer = Offer(
-                product=product,
-                marketplace=offer_like.marketplace,
-                seller=offer_like.seller,
-                price=offer_like.price,
-                shipping_fee=offer_like.shipping_fee,
-                url=offer_like.url,
-                affiliate_url=offer_like.affiliate_url
-            )
-            
-            offers.append(offer)
+    def _serialize_offer(self, product_id: int, offer: OfferRecord) -> Dict[str, Any]:
+        """오퍼 레코드를 응답용 dict로 변환"""
+        return {
+            'product_id': product_id,
+            'marketplace': offer.marketplace,
+            'seller': offer.seller,
+            'price': offer.price,
+            'shipping_fee': offer.shipping_fee,
+            'total_price': offer.total_price,
+            'url': offer.url,
+            'affiliate_url': offer.affiliate_url
+        }
+    
+    async def _match(
+        self, records: List[OfferRecord], candidates: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """새 오퍼를 후보에 더하고 전체 후보를 매칭해 (후보 목록, 응답) 반환
         
-        return offers
+        상품 키 계산, 상품 조회/생성, 오퍼 저장, 매칭은 모두 CPU/DB 작업이므로 별도 스레드에서
+        한 번에 실행한다. 런타임 루프는 여러 요청이 함께 쓰므로 여기서 막히면 다른 요청의
+        프로바이더 I/O와 타임아웃이 밀린다.
+        """
+        return await sync_to_async(self._resolve_and_match, thread_sensitive=False)(records, candidates)
     
-    async def _get_or_create_product(self, offer_like: OfferLike) -> tuple[Product, bool]:
-        """상품 조회 또는 생성"""
-        # 제목에서 브랜드와 모델 코드 추출
-        tokens = self.matcher.extract_tokens(offer_like.title)
+    def _resolve_and_match(
+        self, records: List[OfferRecord], candidates: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        candidates = candidates + self._resolve_records(records)
+        return candidates, self._build_result(candidates)
+    
+    async def _resolve_candidates(self, records: List[OfferRecord]) -> List[Dict[str, Any]]:
+        """오퍼 레코드별 상품을 찾아 매칭 후보 목록으로 구성 (별도 스레드에서 실행)"""
+        if not records:
+            return []
+        return await sync_to_async(self._resolve_records, thread_sensitive=False)(records)
+    
+    def _resolve_records(self, records: List[OfferRecord]) -> List[Dict[str, Any]]:
+        """오퍼 레코드별 상품 조회/생성 및 오퍼 저장"""
+        if not records:
+            return []
         
-        brand = tokens.get('brand', 'Unknown')
-        model_code = tokens.get('model_code', 'Unknown')
+        # 상품 키는 오퍼당 한 번만 계산
+        keys = [self._product_key(record) for record in records]
+        products = self._resolve_and_ingest(records, keys)
+        return [{'product': products[key], 'offer': record} for key, record in zip(keys, records)]
+    
+    def _product_key(self, record: OfferRecord) -> Tuple[str, str]:
+        """제목에서 상품 키 (brand, model_code) 추출"""
+        tokens = self.matcher.title_features(record.title).tokens
+        return tokens.get('brand', 'Unknown'), tokens.get('model_code', 'Unknown')
+    
+    def _resolve_and_ingest(
+        self, records: List[OfferRecord], keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Product]:
+        """상품 일괄 조회/생성 후 검색된 오퍼 저장
         
-        # 기존 상품 조회
+        저장 경로에서 최저가가 내려간 상품은 가격 하락 이벤트로 알림 평가가 이어진다.
+        """
         try:
-            product = Product.objects.get(brand=brand, model_code=model_code)
-            return product, False
-        except Product.DoesNotExist:
-            # 새 상품 생성
-            product = Product.objects.create(
-                brand=brand,
-                model_code=model_code,
-                name=offer_like.title,
-                gtin=None,  # 나중에 업데이트
-                spec_hash=None  # 나중에 계산
+            products = self._resolve_products(records, keys)
+            try:
+                ingest_offers((products[key].id, record) for key, record in zip(keys, records))
+            except Exception as e:
+                # 저장 실패가 검색 응답을 막지 않도록 로깅만
+                logger.error(f"검색 오퍼 저장 중 오류: {str(e)}")
+            return products
+        finally:
+            close_old_connections()
+    
+    def _resolve_products(
+        self, records: List[OfferRecord], keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Product]:
+        """상품 일괄 조회 또는 생성
+        
+        기존 상품을 한 번의 IN 쿼리로 조회하고, 없는 상품은 bulk_create로 한 번에
+        생성한 뒤 다시 조회한다. 동시 검색이 같은 상품을 만들더라도 unique 제약과
+        ignore_conflicts로 중복 없이 처리된다.
+        """
+        # 상품 키별 첫 번째 제목을 상품명으로 사용
+        names = {}
+        for key, record in zip(keys, records):
+            names.setdefault(key, record.title)
+        
+        products = self._fetch_products(names)
+        
+        missing = [key for key in names if key not in products]
+        if missing:
+            Product.objects.bulk_create(
+                [
+                    Product(
+                        brand=brand,
+                        model_code=model_code,
+                        name=names[(brand, model_code)][:500],
+                        gtin=None,  # 나중에 업데이트
+                        spec_hash=None  # 나중에 계산
+                    )
+                    for brand, model_code in missing
+                ],
+                ignore_conflicts=True
             )
-            return product, True
+            products.update(self._fetch_products(missing))
+        
+        return products
+    
+    def _fetch_products(self, keys) -> Dict[Tuple[str, str], Product]:
+        """(brand, model_code) 키 목록으로 상품 조회"""
+        keys = set(keys)
+        queryset = Product.objects.filter(
+            brand__in={brand for brand, _ in keys},
+            model_code__in={model_code for _, model_code in keys}
+        )
+        return {
+            (product.brand, product.model_code): product
+            for product in queryset
+            if (product.brand, product.model_code) in keys
+        }
 
 
 # 전역 검색 서비스 인스턴스
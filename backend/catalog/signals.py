@@ -0,0 +1,8 @@
+"""
+Catalog signals
+"""
+from django.dispatch import Signal
+
+# 상품 최저 총 가격이 내려갔을 때 (트랜잭션 커밋 후) 발생
+# kwargs: drops = {상품 ID: (이전 가격 또는 None, 새 가격)}
+price_dropped = Signal()
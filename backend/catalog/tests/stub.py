@@ -0,0 +1,141 @@
+"""
+HTTP 프로바이더 테스트용 로컬 스텁 서버
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class StubResponse:
+    """스텁 응답 (json이 있으면 JSON 본문으로 전송)"""
+    status: int = 200
+    json: Any = None
+    body: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+    delay: float = 0.0
+
+
+@dataclass
+class StubRequest:
+    """스텁 서버가 받은 요청 기록"""
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+
+
+class StubServer:
+    """마켓플레이스 API를 흉내내는 로컬 HTTP/1.1 서버
+    
+    경로별로 응답 목록을 등록하면 요청마다 차례로 돌려주고 마지막 응답은 계속 반복한다.
+    keep-alive를 지원하며 받은 요청과 연결 수를 기록하므로, 네트워크 없이 어댑터의
+    파싱/재시도/커넥션 재사용을 시험할 수 있다.
+    
+        with StubServer() as server:
+            server.route('/search', StubResponse(json={'items': [...]}))
+            provider.base_url = server.url
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._routes: Dict[str, List[StubResponse]] = {}
+        self._lock = threading.Lock()
+        self.requests: List[StubRequest] = []
+        self.connections = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def route(self, path: str, *responses: StubResponse):
+        """경로 응답 등록 (기존 등록은 대체)"""
+        with self._lock:
+            self._routes[path] = list(responses) or [StubResponse()]
+    
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+    
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def _next_response(self, path: str) -> Optional[StubResponse]:
+        with self._lock:
+            responses = self._routes.get(path)
+            if not responses:
+                return None
+            return responses.pop(0) if len(responses) > 1 else responses[0]
+    
+    def _handler_class(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+            
+            def do_GET(self):
+                self._respond()
+            
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                self._respond()
+            
+            def _respond(self):
+                parts = urlsplit(self.path)
+                with stub._lock:
+                    stub.requests.append(StubRequest(
+                        method=self.command,
+                        path=parts.path,
+                        query=parse_qs(parts.query),
+                        headers=dict(self.headers)
+                    ))
+                
+                response = stub._next_response(parts.path) or StubResponse(status=404, json={'error': 'not found'})
+                if response.delay:
+                    time.sleep(response.delay)
+                
+                body = response.body
+                headers = dict(response.headers)
+                if response.json is not None:
+                    body = json.dumps(response.json, ensure_ascii=False).encode('utf-8')
+                    headers.setdefault('Content-Type', 'application/json; charset=utf-8')
+                
+                try:
+                    self.send_response(response.status)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 타임아웃으로 먼저 끊은 경우
+                    self.close_connection = True
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
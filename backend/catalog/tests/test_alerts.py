@@ -0,0 +1,445 @@
+"""
+알림 태스크 테스트
+"""
+import asyncio
+import time
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from django.utils import timezone
+from alerts.models import WatchNotificationState
+from apps.alerts import state as state_module
+from apps.alerts import tasks
+from core.runtime import AsyncRuntime
+from apps.alerts.state import default_cooldown, record_alerts, select_alertable
+from apps.alerts.watch_index import RedisTargetPriceIndex, TargetPriceIndex, get_watch_index
+from ..models import Product, Watch
+from ..providers.base import BaseProvider, OfferLike, SearchResult
+from ..providers.health import provider_health
+
+
+class CountingProvider(BaseProvider):
+    """검색 호출 횟수를 세는 테스트용 프로바이더"""
+    
+    def __init__(self, prices, delay: float = 0.0):
+        super().__init__("counting")
+        self.prices = prices
+        self.delay = delay
+        self.calls = []
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        self.calls.append(keyword)
+        await asyncio.sleep(self.delay)
+        offers = [
+            OfferLike(
+                marketplace="쿠팡",
+                seller="쿠팡",
+                title=keyword,
+                price=Decimal(self.prices[keyword]),
+                shipping_fee=Decimal("0"),
+                url=f"https://test.coupang.com/{keyword}"
+            )
+        ]
+        return SearchResult(offers=offers, total_count=1, marketplace=self.name, search_time=0.0)
+    
+    async def get_product_detail(self, url: str):
+        return None
+
+
+class StuckProvider(CountingProvider):
+    """'stuck' 검색에는 응답하지 않는 테스트용 프로바이더"""
+    
+    timeout = 0.1
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        if keyword == 'stuck':
+            self.calls.append(keyword)
+            await asyncio.Event().wait()
+        return await super().search(keyword, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def reset_watch_index():
+    get_watch_index().invalidate()
+    yield
+    get_watch_index().invalidate()
+
+
+@pytest.fixture
+def sent_alerts(monkeypatch):
+    sent = []
+    
+    def queue(watches, offer, price):
+        sent.extend((watch.id, price) for watch in watches)
+        return list(watches)
+    
+    monkeypatch.setattr(tasks, 'queue_price_alerts', queue)
+    return sent
+
+
+@pytest.mark.django_db
+class TestScanProducts:
+    """상품 단위 Watch 스캔 테스트"""
+    
+    def test_each_product_refreshed_once(self, sent_alerts):
+        galaxy = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        iphone = Product.objects.create(brand="Apple", model_code="IP15", name="iphone")
+        for target in ["1100000", "1200000", "1300000"]:
+            Watch.objects.create(user_id=1, product=galaxy, target_price=Decimal(target))
+        Watch.objects.create(user_id=2, product=iphone, target_price=Decimal("1000000"))
+        
+        provider = CountingProvider({'galaxy': "1200000", 'iphone': "1500000"})
+        stats = tasks.scan_products([galaxy.id, iphone.id], provider)
+        
+        assert sorted(provider.calls) == ['galaxy', 'iphone']
+        assert stats == {'products': 2, 'watches': 4, 'alerts': 2, 'errors': 0}
+        assert {price for _, price in sent_alerts} == {Decimal("1200000")}
+    
+    def test_product_searches_run_concurrently(self, sent_alerts):
+        prices = {}
+        product_ids = []
+        for index in range(8):
+            product = Product.objects.create(brand="Samsung", model_code=f"S{index}", name=f"p{index}")
+            Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000"))
+            prices[product.name] = "900"
+            product_ids.append(product.id)
+        
+        started_at = time.monotonic()
+        stats = tasks.scan_products(product_ids, CountingProvider(prices, delay=0.2))
+        
+        assert stats['products'] == 8
+        assert time.monotonic() - started_at < 1.0
+    
+    def test_stuck_search_times_out(self, sent_alerts):
+        stuck = Product.objects.create(brand="Samsung", model_code="S23", name="stuck")
+        galaxy = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        for product in (stuck, galaxy):
+            Watch.objects.create(user_id=1, product=product, target_price=Decimal("1300000"))
+        provider = StuckProvider({'galaxy': "1200000"})
+        
+        started_at = time.monotonic()
+        try:
+            stats = tasks.scan_products([stuck.id, galaxy.id], provider)
+            tasks.update_product_offers(stuck, provider)
+        finally:
+            provider_health.reset()
+        
+        assert time.monotonic() - started_at < 1.0
+        assert stats == {'products': 1, 'watches': 1, 'alerts': 1, 'errors': 1}
+        assert provider.calls.count('stuck') == 2
+    
+    def test_unchanged_prices_are_not_evaluated(self, sent_alerts):
+        galaxy = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        Watch.objects.create(user_id=1, product=galaxy, target_price=Decimal("1300000"))
+        provider = CountingProvider({'galaxy': "1200000"})
+        
+        tasks.scan_products([galaxy.id], provider)
+        stats = tasks.scan_products([galaxy.id], provider)
+        
+        assert stats['products'] == 1
+        assert stats['watches'] == 0
+        assert len(sent_alerts) == 1
+    
+    def test_raised_target_price_is_evaluated_without_price_drop(self, sent_alerts):
+        """가격이 그대로여도 목표가를 현재가 이상으로 올린 Watch는 다음 스캔에서 알림"""
+        galaxy = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        watch = Watch.objects.create(user_id=1, product=galaxy, target_price=Decimal("1100000"))
+        provider = CountingProvider({'galaxy': "1200000"})
+        tasks.scan_products([galaxy.id], provider)
+        assert sent_alerts == []
+        
+        watch.target_price = Decimal("1250000")
+        watch.save()
+        stats = tasks.scan_products([galaxy.id], provider)
+        
+        assert stats['alerts'] == 1
+        assert sent_alerts == [(watch.id, Decimal("1200000"))]
+    
+    def test_lost_price_drop_event_is_caught_by_scan(self, sent_alerts):
+        """가격 하락 이벤트가 유실돼도 다음 스캔에서 목표가 이하 Watch를 알림"""
+        galaxy = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        watch = Watch.objects.create(user_id=1, product=galaxy, target_price=Decimal("1300000"))
+        provider = CountingProvider({'galaxy': "1200000"})
+        # 검색 경로에서 저장됐지만 평가 태스크가 실행되지 않은 상황
+        result = tasks.ingest_offers(
+            [(galaxy.id, offer) for offer in tasks.runtime.run(provider.search('galaxy')).offers],
+            emit_events=False
+        )
+        assert result.price_drops
+        
+        stats = tasks.scan_products([galaxy.id], provider)
+        
+        assert stats['alerts'] == 1
+        assert sent_alerts == [(watch.id, Decimal("1200000"))]
+    
+    def test_inactive_watches_skipped(self, sent_alerts):
+        galaxy = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        Watch.objects.create(user_id=1, product=galaxy, target_price=Decimal("2000000"), is_active=False)
+        
+        stats = tasks.scan_products([galaxy.id], CountingProvider({'galaxy': "1200000"}))
+        
+        assert stats['watches'] == 0
+        assert sent_alerts == []
+
+
+class TestShardedScan:
+    """샤드 분산 스캔 테스트"""
+    
+    def test_shard_ranges(self):
+        assert tasks.shard_ranges([1, 2, 5, 9, 10], 2) == [(1, 2), (5, 9), (10, 10)]
+        assert tasks.shard_ranges([3], 200) == [(3, 3)]
+    
+    def test_finalize_aggregates_shard_stats(self):
+        result = tasks.finalize_watch_scan.run([
+            {'products': 2, 'watches': 5, 'alerts': 1, 'errors': 0, 'elapsed': 0.5},
+            {'products': 3, 'watches': 4, 'alerts': 2, 'errors': 1, 'elapsed': 1.5},
+        ])
+        assert result['totals'] == {
+            'products': 5, 'watches': 9, 'alerts': 3, 'errors': 1, 'shards': 2, 'slowest_shard': 1.5
+        }
+    
+    @pytest.mark.django_db
+    def test_scan_dispatches_shards(self, monkeypatch, settings, sent_alerts):
+        from marketwatch.celery import app
+        app.finalize()
+        monkeypatch.setitem(app.conf, 'CELERY_TASK_ALWAYS_EAGER', True)
+        settings.ALERTS_SCAN_SHARD_SIZE = 1
+        
+        prices = {}
+        for index in range(3):
+            product = Product.objects.create(brand="Samsung", model_code=f"S{index}", name=f"p{index}")
+            Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000"))
+            prices[product.name] = "900"
+        monkeypatch.setattr(tasks, 'get_scan_provider', lambda: CountingProvider(prices))
+        
+        result = tasks.scan_watches.run()
+        
+        assert result['totals']['shards'] == 3
+        assert result['totals']['alerts'] == 3
+        assert [stats['shard'] for stats in result['shards']] == [[p.id, p.id] for p in Product.objects.order_by('id')]
+        assert len(sent_alerts) == 3
+
+
+@pytest.mark.django_db
+class TestTargetPriceIndex:
+    """Watch 목표가 인덱스 테스트"""
+    
+    @pytest.fixture
+    def product(self):
+        return Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+    
+    def test_range_lookup(self, product):
+        watches = [
+            Watch.objects.create(user_id=index, product=product, target_price=Decimal(target))
+            for index, target in enumerate(["1000000", "1100000", "1100000", "1300000"])
+        ]
+        Watch.objects.create(user_id=9, product=product, target_price=Decimal("2000000"), is_active=False)
+        index = TargetPriceIndex()
+        
+        assert index.count(product.id) == 4
+        assert index.watches_at_or_above(product.id, Decimal("1100000")) == [w.id for w in watches[1:]]
+        assert index.watches_at_or_above(product.id, Decimal("1300001")) == []
+    
+    def test_lookup_is_single_query_per_product(self, product, django_assert_num_queries):
+        Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000000"))
+        index = TargetPriceIndex()
+        
+        with django_assert_num_queries(1):
+            index.watches_at_or_above(product.id, Decimal("900000"))
+            index.watches_at_or_above(product.id, Decimal("1000000"))
+            index.count(product.id)
+    
+    def test_signals_keep_index_in_sync(self, product):
+        index = get_watch_index()
+        watch = Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000000"))
+        assert index.watches_at_or_above(product.id, Decimal("1000000")) == [watch.id]
+        
+        other = Watch.objects.create(user_id=2, product=product, target_price=Decimal("1200000"))
+        watch.target_price = Decimal("900000")
+        watch.save()
+        assert index.watches_at_or_above(product.id, Decimal("1000000")) == [other.id]
+        
+        other.is_active = False
+        other.save()
+        watch.delete()
+        assert index.count(product.id) == 0
+
+
+@pytest.fixture
+def redis_client(settings):
+    """테스트용 Redis 클라이언트 (서버가 없으면 건너뜀)"""
+    redis = pytest.importorskip('redis')
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis 서버에 연결할 수 없습니다.")
+    yield client
+    for key in client.scan_iter('test:watch-index:*'):
+        client.delete(key)
+
+
+@pytest.mark.django_db
+class TestRedisTargetPriceIndex:
+    """Redis 목표가 인덱스 테스트"""
+    
+    @pytest.fixture
+    def product(self):
+        return Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+    
+    @pytest.fixture
+    def index(self, redis_client):
+        return RedisTargetPriceIndex(redis_client, prefix='test:watch-index', ttl=60)
+    
+    def test_loaded_key_expires_like_local_index(self, index, redis_client, product):
+        watch = Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000000"))
+        
+        assert index.watches_at_or_above(product.id, Decimal("900000")) == [watch.id]
+        
+        assert 0 < redis_client.ttl(f"test:watch-index:{product.id}") <= 60
+        # 적재용 임시 키는 RENAME으로 사라짐
+        assert list(redis_client.scan_iter('test:watch-index:*:build:*')) == []
+    
+    def test_add_does_not_create_unloaded_key(self, index, redis_client, product):
+        index.add(1, product.id, Decimal("1000000"))
+        assert not redis_client.exists(f"test:watch-index:{product.id}")
+        
+        watch = Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000000"))
+        assert index.count(product.id) == 1
+        index.add(watch.id + 1, product.id, Decimal("1200000"))
+        assert index.watches_at_or_above(product.id, Decimal("1100000")) == [watch.id + 1]
+
+
+@pytest.mark.django_db
+class TestNotificationState:
+    """알림 중복 방지 테스트"""
+    
+    @pytest.fixture
+    def watch(self):
+        product = Product.objects.create(brand="Samsung", model_code="S24", name="galaxy")
+        return Watch.objects.create(user_id=1, product=product, target_price=Decimal("1300000"))
+    
+    def test_repeat_alerts_suppressed_until_new_low(self, watch, sent_alerts):
+        provider = CountingProvider({'galaxy': "1200000"})
+        tasks.update_product_offers(watch.product, provider)
+        
+        tasks.check_price_and_alert(watch)
+        tasks.check_price_and_alert(watch)
+        assert len(sent_alerts) == 1
+        
+        provider.prices['galaxy'] = "1150000"
+        tasks.update_product_offers(watch.product, provider)
+        tasks.check_price_and_alert(watch)
+        
+        assert [price for _, price in sent_alerts] == [Decimal("1200000"), Decimal("1150000")]
+        state = WatchNotificationState.objects.get(watch=watch)
+        assert (state.last_alerted_price, state.alert_count) == (Decimal("1150000"), 2)
+    
+    def test_concurrent_evaluations_alert_once(self, watch, monkeypatch):
+        provider = CountingProvider({'galaxy': "1200000"})
+        tasks.update_product_offers(watch.product, provider)
+        sent = []
+        
+        def queue(watches, offer, price):
+            watches = list(watches)
+            first = not sent
+            sent.extend(watch.id for watch in watches)
+            if first:
+                # 첫 평가가 알림을 등록하는 사이 같은 상품을 다른 경로에서 평가
+                tasks.evaluate_product_watches(watch.product)
+                tasks.check_price_and_alert(watch)
+            return watches
+        
+        monkeypatch.setattr(tasks, 'queue_price_alerts', queue)
+        
+        assert tasks.evaluate_product_watches(watch.product) == (1, 1)
+        assert sent == [watch.id]
+        assert WatchNotificationState.objects.get(watch=watch).alert_count == 1
+    
+    def test_claim_is_rolled_back_without_channels(self, watch, settings):
+        settings.ALERTS_NOTIFICATION_CHANNELS = []
+        tasks.update_product_offers(watch.product, CountingProvider({'galaxy': "1200000"}))
+        
+        assert tasks.evaluate_product_watches(watch.product) == (1, 0)
+        tasks.check_price_and_alert(watch)
+        
+        assert not WatchNotificationState.objects.filter(watch=watch).exists()
+    
+    def test_cooldown_expiry(self, watch):
+        now = timezone.now()
+        record_alerts([watch], Decimal("1200000"), now=now)
+        
+        assert select_alertable([watch], Decimal("1200000"), now=now + timedelta(minutes=1)) == []
+        assert select_alertable([watch], Decimal("1200000"), now=now + default_cooldown()) == [watch]
+        
+        WatchNotificationState.objects.filter(watch=watch).update(cooldown=timedelta(minutes=5))
+        assert select_alertable([watch], Decimal("1200000"), now=now + timedelta(minutes=5)) == [watch]
+    
+    def test_scan_realerts_after_cooldown_without_price_change(self, watch, sent_alerts, monkeypatch):
+        """가격 변동이 없어도 재알림 대기 시간이 지나면 주기 스캔에서 다시 알림"""
+        provider = CountingProvider({'galaxy': "1200000"})
+        tasks.scan_products([watch.product_id], provider)
+        tasks.scan_products([watch.product_id], provider)
+        assert len(sent_alerts) == 1
+        
+        later = timezone.now() + default_cooldown() + timedelta(minutes=1)
+        monkeypatch.setattr(state_module, 'timezone', SimpleNamespace(now=lambda: later))
+        stats = tasks.scan_products([watch.product_id], provider)
+        
+        assert stats['alerts'] == 1
+        assert [price for _, price in sent_alerts] == [Decimal("1200000"), Decimal("1200000")]
+        assert WatchNotificationState.objects.get(watch=watch).alert_count == 2
+    
+    def test_states_checked_in_one_query(self, watch, django_assert_num_queries):
+        others = [
+            Watch.objects.create(user_id=index, product=watch.product, target_price=Decimal("1300000"))
+            for index in range(2, 6)
+        ]
+        record_alerts(others[:2], Decimal("1200000"))
+        
+        with django_assert_num_queries(1):
+            alertable = select_alertable([watch] + others, Decimal("1200000"))
+        
+        assert alertable == [watch] + others[2:]
+
+
+class TestAsyncRuntime:
+    """워커 비동기 런타임 테스트"""
+    
+    def test_loop_is_reused_between_calls(self):
+        runtime = AsyncRuntime()
+        try:
+            first = runtime.run(self._current_loop())
+            second = runtime.run(self._current_loop())
+            assert first is second
+        finally:
+            runtime.stop()
+        assert not runtime.is_running
+    
+    def test_run_many_limits_concurrency_and_keeps_errors(self):
+        runtime = AsyncRuntime()
+        active = []
+        peak = []
+        
+        async def job(value):
+            active.append(value)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(value)
+            if value == 3:
+                raise ValueError(value)
+            return value
+        
+        try:
+            results = runtime.run_many((job(value) for value in range(6)), concurrency=2)
+        finally:
+            runtime.stop()
+        
+        assert max(peak) == 2
+        assert results[:3] == [0, 1, 2]
+        assert isinstance(results[3], ValueError)
+    
+    @staticmethod
+    async def _current_loop():
+        return asyncio.get_running_loop()
@@ -0,0 +1,110 @@
+"""
+검색 결과 캐시 테스트
+"""
+import asyncio
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from ..services.cache import SearchResultCache
+
+
+class CountingFetch:
+    """호출 횟수를 세는 조회 함수"""
+    
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+    
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {'version': self.calls}
+
+
+@pytest.mark.asyncio
+class TestSearchResultCache:
+    """검색 결과 캐시 테스트"""
+    
+    async def test_key_normalizes_keyword_and_provider_order(self):
+        cache = SearchResultCache()
+        assert cache.make_key("  갤럭시   S24 ", ["coupang", "11st"]) == cache.make_key("갤럭시 s24", ["11st", "coupang"])
+        assert cache.make_key("갤럭시 s24", ["coupang"]) != cache.make_key("갤럭시 s24", ["11st", "coupang"])
+    
+    async def test_hit_within_ttl(self):
+        cache = SearchResultCache(ttl=60)
+        fetch = CountingFetch()
+        
+        first = await cache.get_or_fetch("s24", ["coupang"], fetch)
+        second = await cache.get_or_fetch("S24", ["coupang"], fetch)
+        
+        assert first == second == {'version': 1}
+        assert fetch.calls == 1
+        assert cache.stats['hits'] == 1
+    
+    async def test_concurrent_misses_are_coalesced(self):
+        cache = SearchResultCache(ttl=60)
+        fetch = CountingFetch(delay=0.05)
+        
+        results = await asyncio.gather(*[
+            cache.get_or_fetch("s24", ["coupang"], fetch) for _ in range(20)
+        ])
+        
+        assert fetch.calls == 1
+        assert all(result == {'version': 1} for result in results)
+        assert cache.stats['coalesced'] == 19
+    
+    async def test_stale_result_served_while_refreshing(self):
+        cache = SearchResultCache(ttl=0, stale_ttl=60)
+        fetch = CountingFetch(delay=0.01)
+        
+        await cache.get_or_fetch("s24", ["coupang"], fetch)
+        
+        stale = await cache.get_or_fetch("s24", ["coupang"], fetch)
+        assert stale == {'version': 1}
+        
+        await cache.wait_refreshes()
+        assert fetch.calls == 2
+        assert await cache.get("s24", ["coupang"]) == {'version': 2}
+        assert cache.stats['refreshes'] == 1
+    
+    async def test_refresh_outlives_request_loop(self):
+        """요청 루프가 닫혀도 stale 갱신은 런타임 루프에서 끝까지 실행"""
+        cache = SearchResultCache(ttl=0, stale_ttl=60)
+        fetch = CountingFetch(delay=0.05)
+        await cache.get_or_fetch("s24", ["coupang"], fetch)
+        
+        # 요청마다 새 루프를 만들고 닫는 환경 (응답 직후 루프 종료)
+        stale = await asyncio.to_thread(asyncio.run, cache.get_or_fetch("s24", ["coupang"], fetch))
+        assert stale == {'version': 1}
+        
+        await cache.wait_refreshes()
+        assert fetch.calls == 2
+        assert await cache.get("s24", ["coupang"]) == {'version': 2}
+    
+    async def test_remote_tier_shared_between_processes(self):
+        remote = LocMemCache('search-test', {})
+        fetch = CountingFetch()
+        
+        await SearchResultCache(remote=remote).get_or_fetch("s24", ["coupang"], fetch)
+        result = await SearchResultCache(remote=remote).get_or_fetch("s24", ["coupang"], fetch)
+        
+        assert result == {'version': 1}
+        assert fetch.calls == 1
+    
+    async def test_uncacheable_result_not_stored(self):
+        cache = SearchResultCache(ttl=60)
+        fetch = CountingFetch()
+        
+        await cache.get_or_fetch("s24", ["coupang"], fetch, cacheable=lambda result: False)
+        await cache.get_or_fetch("s24", ["coupang"], fetch, cacheable=lambda result: False)
+        
+        assert fetch.calls == 2
+    
+    async def test_local_lru_eviction(self):
+        cache = SearchResultCache(ttl=60, maxsize=2)
+        fetch = CountingFetch()
+        
+        for keyword in ["a", "b", "c"]:
+            await cache.get_or_fetch(keyword, ["coupang"], fetch)
+        await cache.get_or_fetch("a", ["coupang"], fetch)
+        
+        assert fetch.calls == 4
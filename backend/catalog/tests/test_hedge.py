@@ -0,0 +1,200 @@
+"""
+프로바이더 헤지 요청 테스트
+"""
+import asyncio
+import time
+import pytest
+from ..providers.base import BaseProvider, ProviderRegistry, SearchResult
+from ..providers.health import provider_health
+from ..providers.hedge import HedgeBudget, Hedger, hedgers
+from ..providers.http import HttpProvider, http_clients
+from ..providers.ratelimit import BACKGROUND, rate_limiters
+from .stub import StubResponse, StubServer
+
+
+class SlowFirstProvider(BaseProvider):
+    """정해진 지연 순서대로 응답하는 테스트용 프로바이더"""
+    
+    def __init__(self, name: str, delays, requests_per_minute: int = 0):
+        super().__init__(name)
+        self.delays = list(delays)
+        self.requests_per_minute = requests_per_minute
+        self.calls = 0
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return SearchResult(offers=[], total_count=self.calls, marketplace=self.name, search_time=delay)
+    
+    async def get_product_detail(self, url: str):
+        return None
+    
+    def get_rate_limit_info(self) -> dict:
+        return {'requests_per_minute': self.requests_per_minute, 'requests_per_hour': None, 'cooldown_seconds': 0}
+
+
+class MirroredProvider(HttpProvider):
+    """미러 엔드포인트가 있는 테스트용 HTTP 어댑터"""
+    
+    def __init__(self, base_url: str, mirror_url: str):
+        super().__init__('mirrored')
+        self.base_url = base_url
+        self.mirror_urls = [mirror_url]
+    
+    def build_search_request(self, keyword: str, **kwargs):
+        return '/search', {'q': keyword}
+    
+    def parse_search_response(self, data):
+        return []
+
+
+def warm_up(name: str, latency: float = 0.02, samples: int = 5):
+    """헤지 대기 시간을 정할 지연 표본 기록"""
+    health = provider_health.get(name)
+    for _ in range(samples):
+        health.record_success(latency)
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    provider_health.reset()
+    rate_limiters.reset()
+    hedgers.reset()
+    yield
+    provider_health.reset()
+    rate_limiters.reset()
+    hedgers.reset()
+
+
+class TestHedgeBudget:
+    """헤지 예산 테스트"""
+    
+    def test_budget_limits_extra_load(self):
+        budget = HedgeBudget(ratio=0.25, burst=1.0)
+        spent = 0
+        for _ in range(20):
+            budget.deposit()
+            spent += budget.try_spend()
+        assert spent == 5
+    
+    def test_budget_burst_cap(self):
+        budget = HedgeBudget(ratio=1.0, burst=2.0)
+        for _ in range(10):
+            budget.deposit()
+        assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+
+@pytest.mark.asyncio
+class TestHedger:
+    """헤지 요청 실행 테스트"""
+    
+    async def test_hedge_wins_when_primary_is_slow(self):
+        provider = SlowFirstProvider('slow', delays=[1.0, 0.01])
+        hedger = Hedger('slow', budget_ratio=1.0, min_samples=5, min_delay=0.01)
+        warm_up('slow')
+        
+        started = time.monotonic()
+        result = await hedger.search(provider, '아이폰')
+        
+        assert time.monotonic() - started < 0.5
+        assert result.total_count == 2
+        stats = hedger.stats()
+        assert stats['fired'] == 1 and stats['won'] == 1
+        assert stats['delay'] == pytest.approx(0.02)
+    
+    async def test_fast_primary_is_not_hedged(self):
+        provider = SlowFirstProvider('fast', delays=[0.0])
+        hedger = Hedger('fast', budget_ratio=1.0, min_samples=5, min_delay=0.01)
+        warm_up('fast', latency=0.05)
+        
+        await hedger.search(provider, '아이폰')
+        
+        assert provider.calls == 1
+        assert hedger.stats()['fired'] == 0
+    
+    async def test_no_hedge_without_budget_or_samples(self):
+        provider = SlowFirstProvider('slow', delays=[0.1, 0.1, 0.0])
+        
+        unwarmed = Hedger('slow', budget_ratio=1.0, min_samples=5, min_delay=0.01)
+        await unwarmed.search(provider, '아이폰')
+        assert unwarmed.hedge_delay() is None and provider.calls == 1
+        
+        warm_up('slow')
+        no_budget = Hedger('slow', budget_ratio=0.0, min_samples=5, min_delay=0.01)
+        result = await no_budget.search(provider, '아이폰')
+        assert result.total_count == 2 and provider.calls == 2
+        assert no_budget.stats()['skipped_budget'] == 1
+    
+    async def test_hedge_respects_rate_limit(self):
+        provider = SlowFirstProvider('limited', delays=[0.1, 0.0], requests_per_minute=1)
+        hedger = Hedger('limited', budget_ratio=1.0, min_samples=5, min_delay=0.01)
+        warm_up('limited')
+        await rate_limiters.acquire(provider)
+        
+        await hedger.search(provider, '아이폰')
+        
+        assert provider.calls == 1
+        assert hedger.stats()['skipped_rate_limit'] == 1
+    
+    async def test_background_searches_are_not_hedged(self):
+        provider = SlowFirstProvider('slow', delays=[0.1, 0.0])
+        hedger = Hedger('slow', budget_ratio=1.0, min_samples=5, min_delay=0.01)
+        warm_up('slow')
+        
+        await hedger.search(provider, '아이폰', priority=BACKGROUND)
+        
+        assert provider.calls == 1
+    
+    async def test_registry_hedges_only_when_enabled(self, settings):
+        registry = ProviderRegistry()
+        provider = SlowFirstProvider('slow', delays=[1.0, 0.01, 1.0])
+        registry.register(provider)
+        warm_up('slow', samples=20)
+        
+        settings.PROVIDER_HEDGE_ENABLED = True
+        settings.PROVIDER_HEDGE_BUDGET = 1.0
+        outcome = await registry.search_provider(provider, '아이폰', timeout=0.5)
+        
+        assert outcome.status == 'ok'
+        assert registry.get_hedge_stats()['slow']['won'] == 1
+        
+        settings.PROVIDER_HEDGE_ENABLED = False
+        outcome = await registry.search_provider(provider, '아이폰', timeout=0.2)
+        assert outcome.status == 'timeout'
+    
+    async def test_p95_is_stable_over_repeated_hedges(self, settings):
+        registry = ProviderRegistry()
+        provider = SlowFirstProvider('slow', delays=[0.3, 0.0] * 10)
+        registry.register(provider)
+        warm_up('slow', samples=20)
+        settings.PROVIDER_HEDGE_ENABLED = True
+        settings.PROVIDER_HEDGE_BUDGET = 1.0
+        settings.PROVIDER_HEDGE_MIN_DELAY = 0.01
+        
+        for _ in range(10):
+            outcome = await registry.search_provider(provider, '아이폰', timeout=1.0)
+            assert outcome.status == 'ok'
+        
+        # 헤지 응답 시간이 아니라 첫 요청의 하한(헤지 대기 시간)이 기록됨
+        assert registry.get_hedge_stats()['slow']['won'] == 10
+        assert provider_health.get('slow').latency_percentile(95) == pytest.approx(0.02)
+        assert hedgers.get('slow').hedge_delay() == pytest.approx(0.02)
+    
+    async def test_http_hedge_goes_to_mirror(self):
+        with StubServer() as primary, StubServer() as mirror:
+            primary.route('/search', StubResponse(json={'items': []}, delay=0.5))
+            mirror.route('/search', StubResponse(json={'items': []}))
+            provider = MirroredProvider(primary.url, mirror.url)
+            hedger = Hedger('mirrored', budget_ratio=1.0, min_samples=5, min_delay=0.01)
+            warm_up('mirrored')
+            
+            started = time.monotonic()
+            try:
+                await hedger.search(provider, '아이폰')
+            finally:
+                await http_clients.aclose()
+            
+            assert time.monotonic() - started < 0.4
+            assert len(primary.requests) == 1 and len(mirror.requests) == 1
+            assert hedger.stats()['won'] == 1
@@ -0,0 +1,186 @@
+"""
+HTTP 프로바이더 테스트 (로컬 스텁 서버 사용)
+"""
+import asyncio
+import pytest
+from decimal import Decimal
+from core.runtime import runtime
+from ..providers.base import OfferLike
+from ..providers.http import HttpProvider, ProviderHTTPError, ResponseTooLarge, http_clients
+from .stub import StubResponse, StubServer
+
+
+class JsonMarketProvider(HttpProvider):
+    """`/search?q=` JSON API를 호출하는 테스트용 어댑터"""
+    
+    connect_timeout = 0.5
+    read_timeout = 0.3
+    retry_backoff = 0.01
+    max_response_bytes = 4096
+    
+    def __init__(self, base_url: str):
+        super().__init__('json_market')
+        self.base_url = base_url
+    
+    def build_search_request(self, keyword: str, **kwargs):
+        return '/search', {'q': keyword, 'size': kwargs.get('limit', 20)}
+    
+    def parse_search_response(self, data):
+        return [
+            OfferLike(
+                marketplace=self.name,
+                seller=item['seller'],
+                title=item['title'],
+                price=Decimal(str(item['price'])),
+                shipping_fee=Decimal(str(item.get('shipping', 0))),
+                url=item['url']
+            )
+            for item in data['items']
+        ]
+
+
+ITEMS = {
+    'items': [
+        {'seller': '스토어A', 'title': '아이폰 15 128GB', 'price': 1090000, 'shipping': 3000,
+         'url': 'https://example.com/p/1'},
+        {'seller': '스토어B', 'title': '아이폰 15 256GB', 'price': 1250000, 'url': 'https://example.com/p/2'},
+    ]
+}
+
+
+@pytest.fixture
+def stub_server():
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def provider(stub_server):
+    return JsonMarketProvider(stub_server.url)
+
+
+@pytest.mark.asyncio
+class TestHttpProvider:
+    """HttpProvider 요청/재시도/제한 테스트"""
+    
+    async def test_search_parses_offers(self, stub_server, provider):
+        stub_server.route('/search', StubResponse(json=ITEMS))
+        try:
+            result = await provider.search('아이폰 15', limit=10)
+        finally:
+            await http_clients.aclose()
+        
+        assert result.marketplace == 'json_market'
+        assert [offer.price for offer in result.offers] == [Decimal('1090000'), Decimal('1250000')]
+        assert result.offers[0].shipping_fee == Decimal('3000')
+        request = stub_server.requests[0]
+        assert request.query == {'q': ['아이폰 15'], 'size': ['10']}
+        assert request.headers['User-Agent'] == 'PriceWatch/1.0'
+    
+    async def test_keep_alive_reuses_connection(self, stub_server, provider):
+        stub_server.route('/search', StubResponse(json=ITEMS))
+        try:
+            for _ in range(5):
+                await provider.search('아이폰')
+        finally:
+            await http_clients.aclose()
+        
+        assert len(stub_server.requests) == 5
+        assert stub_server.connections == 1
+    
+    async def test_retries_server_errors(self, stub_server, provider):
+        stub_server.route(
+            '/search',
+            StubResponse(status=503),
+            StubResponse(status=429, headers={'Retry-After': '0'}),
+            StubResponse(json=ITEMS)
+        )
+        try:
+            result = await provider.search('아이폰')
+        finally:
+            await http_clients.aclose()
+        
+        assert len(result.offers) == 2
+        assert len(stub_server.requests) == 3
+    
+    async def test_client_errors_are_not_retried(self, stub_server, provider):
+        stub_server.route('/search', StubResponse(status=404, json={'error': 'not found'}))
+        try:
+            with pytest.raises(ProviderHTTPError, match='HTTP 404'):
+                await provider.search('아이폰')
+        finally:
+            await http_clients.aclose()
+        
+        assert len(stub_server.requests) == 1
+    
+    async def test_gives_up_after_max_retries(self, stub_server, provider):
+        stub_server.route('/search', StubResponse(status=502))
+        try:
+            with pytest.raises(ProviderHTTPError, match='HTTP 502'):
+                await provider.search('아이폰')
+        finally:
+            await http_clients.aclose()
+        
+        assert len(stub_server.requests) == provider.max_retries + 1
+    
+    async def test_rejects_large_response(self, stub_server, provider):
+        stub_server.route('/search', StubResponse(body=b'x' * 10000))
+        try:
+            with pytest.raises(ResponseTooLarge):
+                await provider.search('아이폰')
+        finally:
+            await http_clients.aclose()
+        
+        # 크기 초과는 재시도하지 않음
+        assert len(stub_server.requests) == 1
+    
+    async def test_read_timeout_is_retried(self, stub_server, provider):
+        stub_server.route('/search', StubResponse(json=ITEMS, delay=0.5), StubResponse(json=ITEMS))
+        try:
+            result = await provider.search('아이폰')
+        finally:
+            await http_clients.aclose()
+        
+        assert len(result.offers) == 2
+        assert len(stub_server.requests) == 2
+    
+    async def test_client_is_shared_per_event_loop(self):
+        try:
+            first = http_clients.get()
+            assert http_clients.get() is first
+            other = await asyncio.to_thread(asyncio.run, _client_in_new_loop())
+            assert other is not first
+        finally:
+            await http_clients.aclose()
+
+
+class TestHttpClientLifecycle:
+    """런타임 루프 클라이언트 수명 테스트"""
+    
+    def test_runtime_shutdown_closes_client(self):
+        client = runtime.run(_current_client())
+        assert runtime.run(_current_client()) is client and not client.is_closed
+        
+        # WSGI 워커는 Celery 신호 없이 프로세스 종료 시(atexit) stop()만 호출됨
+        runtime.stop()
+        
+        assert client.is_closed
+        assert not runtime.is_running
+    
+    def test_adapter_must_implement_search_hooks(self):
+        class IncompleteProvider(HttpProvider):
+            def build_search_request(self, keyword: str, **kwargs):
+                return '/search', {'q': keyword}
+        
+        with pytest.raises(TypeError):
+            IncompleteProvider('incomplete')
+
+
+async def _current_client():
+    return http_clients.get()
+
+
+async def _client_in_new_loop():
+    client = http_clients.get()
+    await http_clients.aclose()
+    return client
@@ -0,0 +1,219 @@
+"""
+오퍼 수집 서비스 테스트
+"""
+import importlib
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+from ..models import Offer, PriceHistory, Product, ProductBestPrice, Watch
+from ..providers.base import OfferLike
+from ..services.ingest import ingest_offers
+from ..signals import price_dropped
+
+
+def make_offer_like(url: str, price: str, shipping_fee: str = "0") -> OfferLike:
+    return OfferLike(
+        marketplace="쿠팡",
+        seller="쿠팡",
+        title="삼성 갤럭시 S24 128GB",
+        price=Decimal(price),
+        shipping_fee=Decimal(shipping_fee),
+        url=url
+    )
+
+
+@pytest.mark.django_db
+class TestIngestOffers:
+    """오퍼 일괄 upsert 테스트"""
+    
+    @pytest.fixture
+    def product(self):
+        return Product.objects.create(brand="Samsung", model_code="S24", name="갤럭시 S24")
+    
+    def test_creates_offers_and_history(self, product):
+        result = ingest_offers([
+            (product.id, make_offer_like("https://test.coupang.com/1", "1200000")),
+            (product.id, make_offer_like("https://test.coupang.com/2", "1150000", "3000")),
+        ])
+        
+        assert (result.created, result.updated, result.history_created) == (2, 0, 2)
+        assert Offer.objects.filter(product=product).count() == 2
+        assert PriceHistory.objects.filter(offer__product=product).count() == 2
+        assert ProductBestPrice.objects.get(product=product).total_price == Decimal("1153000")
+    
+    def test_updates_in_place_and_records_only_changed_prices(self, product):
+        ingest_offers([
+            (product.id, make_offer_like("https://test.coupang.com/1", "1200000")),
+            (product.id, make_offer_like("https://test.coupang.com/2", "1150000")),
+        ])
+        
+        result = ingest_offers([
+            (product.id, make_offer_like("https://test.coupang.com/1", "1100000")),
+            (product.id, make_offer_like("https://test.coupang.com/2", "1150000")),
+        ])
+        
+        assert (result.created, result.updated, result.price_changed) == (0, 2, 1)
+        assert result.history_created == 1
+        assert Offer.objects.filter(product=product).count() == 2
+        assert Offer.objects.get(url="https://test.coupang.com/1").price == Decimal("1100000")
+        
+        history = PriceHistory.objects.filter(offer__url="https://test.coupang.com/1").order_by('id')
+        assert [entry.total_price for entry in history] == [Decimal("1200000"), Decimal("1100000")]
+        assert ProductBestPrice.objects.get(product=product).total_price == Decimal("1100000")
+    
+    def test_unchanged_prices_skip_best_price_refresh(self, product, django_assert_num_queries):
+        ingest_offers([(product.id, make_offer_like("https://test.coupang.com/1", "1200000"))])
+        
+        # 기존 오퍼 조회 + upsert (트랜잭션 포함)
+        with django_assert_num_queries(4):
+            result = ingest_offers([(product.id, make_offer_like("https://test.coupang.com/1", "1200000"))])
+        
+        assert result.product_ids == set()
+        assert result.history_created == 0
+
+
+@pytest.mark.django_db
+class TestPriceDropEvents:
+    """가격 하락 이벤트 테스트"""
+    
+    @pytest.fixture
+    def product(self):
+        return Product.objects.create(brand="Samsung", model_code="S24", name="갤럭시 S24")
+    
+    @pytest.fixture
+    def events(self):
+        received = []
+        
+        def receiver(sender, drops, **kwargs):
+            received.append(drops)
+        
+        price_dropped.connect(receiver, dispatch_uid='test-price-drop')
+        yield received
+        price_dropped.disconnect(dispatch_uid='test-price-drop')
+    
+    def test_emits_only_on_lower_best_price(self, product, events, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            ingest_offers([(product.id, make_offer_like("https://test.coupang.com/1", "1200000"))])
+        with django_capture_on_commit_callbacks(execute=True):
+            ingest_offers([(product.id, make_offer_like("https://test.coupang.com/1", "1300000"))])
+        with django_capture_on_commit_callbacks(execute=True):
+            ingest_offers([(product.id, make_offer_like("https://test.coupang.com/2", "1100000"))])
+        
+        assert events == [
+            {product.id: (None, Decimal("1200000"))},
+            {product.id: (Decimal("1300000"), Decimal("1100000"))},
+        ]
+    
+    def test_emit_events_disabled(self, product, events, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            result = ingest_offers(
+                [(product.id, make_offer_like("https://test.coupang.com/1", "1200000"))],
+                emit_events=False
+            )
+        
+        assert events == []
+        assert result.price_drops == {product.id: (None, Decimal("1200000"))}
+    
+    def test_only_watched_products_are_enqueued(self, product, monkeypatch, django_capture_on_commit_callbacks):
+        from apps.alerts import tasks
+        enqueued = []
+        monkeypatch.setattr(
+            tasks.evaluate_product_alerts, 'apply_async',
+            lambda args, **kwargs: enqueued.append(args[0])
+        )
+        unwatched = Product.objects.create(brand="Apple", model_code="IP15", name="아이폰 15")
+        Watch.objects.create(user_id=1, product=product, target_price=Decimal("1000000"))
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            ingest_offers([
+                (product.id, make_offer_like("https://test.coupang.com/1", "1200000")),
+                (unwatched.id, make_offer_like("https://test.coupang.com/2", "1500000")),
+            ])
+        
+        assert enqueued == [product.id]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPriceDropIsolation:
+    """가격 하락 감지 트랜잭션 테스트"""
+    
+    def test_drop_detected_in_ingest_transaction_and_sent_after_commit(self, monkeypatch):
+        from ..services import ingest
+        product = Product.objects.create(brand="Samsung", model_code="S24", name="갤럭시 S24")
+        seen = []
+        refresh = ingest.refresh_best_prices
+        
+        def spy(product_ids):
+            seen.append(('refresh', connection.in_atomic_block))
+            return refresh(product_ids)
+        
+        def receiver(sender, drops, **kwargs):
+            seen.append(('event', connection.in_atomic_block))
+        
+        monkeypatch.setattr(ingest, 'refresh_best_prices', spy)
+        price_dropped.connect(receiver, dispatch_uid='test-price-drop-isolation')
+        try:
+            ingest_offers([(product.id, make_offer_like("https://test.coupang.com/1", "1200000"))])
+        finally:
+            price_dropped.disconnect(dispatch_uid='test-price-drop-isolation')
+        
+        assert seen == [('refresh', True), ('event', False)]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMergeDuplicateOffersMigration:
+    """중복 오퍼 병합 마이그레이션 테스트 (유니크 제약 추가 전 상태에서 실행)"""
+    
+    MERGE = ('catalog', '0003_merge_duplicate_offers')
+    BEFORE = ('catalog', '0002_product_best_price')
+    
+    @pytest.fixture
+    def executor(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.BEFORE])
+        yield executor
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+    
+    def test_merges_into_latest_offer_and_keeps_history(self, executor):
+        apps = executor.loader.project_state([self.BEFORE]).apps
+        HistoricalProduct = apps.get_model('catalog', 'Product')
+        HistoricalOffer = apps.get_model('catalog', 'Offer')
+        HistoricalPriceHistory = apps.get_model('catalog', 'PriceHistory')
+        
+        product = HistoricalProduct.objects.create(brand="Samsung", model_code="S24", name="갤럭시 S24")
+        offers = [
+            HistoricalOffer.objects.create(
+                product=product, marketplace="쿠팡", seller="쿠팡", price=Decimal(price),
+                shipping_fee=Decimal("0"), url="https://test.coupang.com/1"
+            )
+            for price in ("1200000", "1150000", "1180000")
+        ]
+        other = HistoricalOffer.objects.create(
+            product=product, marketplace="11번가", seller="11번가", price=Decimal("1190000"),
+            shipping_fee=Decimal("0"), url="https://test.11st.co.kr/1"
+        )
+        # 가장 최근 수집 오퍼가 남음
+        HistoricalOffer.objects.filter(pk=offers[2].pk).update(fetched_at=timezone.now() + timedelta(hours=1))
+        for offer in offers + [other]:
+            HistoricalPriceHistory.objects.create(offer=offer, price=offer.price, total_price=offer.price)
+        # 0002 백필이 삭제될 중복 오퍼(1150000원)를 최저가로 기록한 상태
+        importlib.import_module('catalog.migrations.0002_product_best_price').backfill_best_prices(apps, None)
+        HistoricalBestPrice = apps.get_model('catalog', 'ProductBestPrice')
+        assert HistoricalBestPrice.objects.get(product_id=product.pk).offer_id == offers[1].pk
+        
+        executor.loader.build_graph()
+        executor.migrate([self.MERGE])
+        
+        remaining = list(HistoricalOffer.objects.filter(url="https://test.coupang.com/1"))
+        assert [offer.pk for offer in remaining] == [offers[2].pk]
+        assert HistoricalPriceHistory.objects.filter(offer_id=offers[2].pk).count() == 3
+        assert HistoricalPriceHistory.objects.filter(offer_id=other.pk).count() == 1
+        assert HistoricalOffer.objects.count() == 2
+        best = HistoricalBestPrice.objects.get(product_id=product.pk)
+        assert (best.offer_id, best.total_price, best.min_price, best.offer_count) == (
+            offers[2].pk, Decimal("1180000"), Decimal("1180000"), 2
+        )
@@ -187,3 +187,288 @@ class ProductMatcherPytestTest:
         result = matcher.match_products(candidates)
         assert len(result) == 1
         assert len(result[0]) == 1
+
+
+def make_candidate(pk: int, brand: str, model_code: str, name: str, price: str, gtin: str = None):
+    """저장하지 않은 Product/Offer로 매칭 후보 생성"""
+    product = Product(id=pk, brand=brand, model_code=model_code, name=name, gtin=gtin)
+    offer = Offer(
+        product=product,
+        marketplace="쿠팡",
+        seller="쿠팡",
+        price=Decimal(price),
+        shipping_fee=Decimal("0"),
+        url=f"https://test.com/{pk}"
+    )
+    return {'product': product, 'offer': offer}
+
+
+class TestBlockingIndex:
+    """블로킹 인덱스 테스트"""
+    
+    def make_catalog(self, size: int):
+        """상품당 오퍼 4개씩, 여러 브랜드에 걸친 후보 목록 생성"""
+        candidates = []
+        for i in range(size):
+            product_no = i // 4
+            # 브랜드끼리 서로 포함되지 않게 자릿수 고정 (brand1/brand10은 부분 일치)
+            brand = f"brand{product_no // 3:03d}"
+            model_code = f"{'sxq'[product_no % 3]}{100 + product_no}"
+            candidates.append(make_candidate(
+                i, brand, model_code, f"{model_code} {64 * (1 + product_no % 3)}gb", "1000000"
+            ))
+        return candidates
+    
+    def test_blocking_keys(self):
+        """GTIN, 브랜드 범위의 모델 코드 쌍 키 추출"""
+        matcher = ProductMatcher()
+        product = Product(brand="samsung", model_code="S24", name="samsung s24 128gb black", gtin="1234")
+        
+        keys = matcher.blocking_keys(product)
+        
+        assert keys == [('gtin', '1234'), ('model', 'samsung', 's24', 's24')]
+    
+    def test_brand_scopes_cover_partial_brands(self):
+        """다른 브랜드에 포함되는 브랜드는 두 후보 모두의 범위가 됨"""
+        scopes = ProductMatcher().brand_scopes(["삼성", "삼성전자", "lg", ""])
+        
+        assert scopes == {"삼성": ["삼성"], "삼성전자": ["삼성", "삼성전자"], "lg": ["lg"]}
+    
+    @pytest.mark.parametrize('first, second', [
+        (("samsung", "s24u", "samsung s24u black"), ("samsung", "ts240", "samsung ts240 black")),
+        (("삼성", "S24", "삼성 갤럭시 S24 블랙"), ("삼성전자", "S24", "삼성전자 갤럭시 S24 블랙")),
+    ])
+    def test_blocking_parity_with_exhaustive(self, first, second):
+        """임계값 이상인 쌍은 키가 달라 보여도(모델 코드 일부 일치, 브랜드 부분 일치) 블로킹에서 빠지지 않음"""
+        candidates = [
+            make_candidate(1, *first, "1200000"),
+            make_candidate(2, *second, "1190000"),
+        ]
+        
+        def urls(groups):
+            return sorted(sorted(item['offer'].url for item in group) for group in groups)
+        
+        exhaustive = ProductMatcher(blocking=False)
+        assert exhaustive.score(candidates[0]['product'], candidates[1]['product'],
+                                candidates[0]['offer'], candidates[1]['offer']) >= 0.75
+        expected = urls(exhaustive.match_products(candidates))
+        assert len(expected) == 1
+        
+        blocked = ProductMatcher(blocking=True)
+        assert urls(blocked.match_products(candidates)) == expected
+        assert urls(blocked.match_products_vectorized(candidates)) == expected
+        assert urls(ProductMatcher(blocking=True, clustering='union_find').match_products(candidates)) == expected
+    
+    def test_low_threshold_falls_back_to_exhaustive(self):
+        """모델 코드 없이도 도달 가능한 임계값이면 전수 비교"""
+        candidates = [make_candidate(i, "brand", "", f"상품 {i}", "1000") for i in range(4)]
+        
+        assert ProductMatcher(threshold=0.75).candidate_neighbours(candidates) == [[], [], [], []]
+        matcher = ProductMatcher(threshold=0.6)
+        assert not matcher.blocking_applies()
+        assert matcher.candidate_neighbours(candidates) == [[1, 2, 3], [2, 3], [3], []]
+        assert matcher.blocking_components(candidates) == [[0, 1, 2, 3]]
+    
+    def test_blocking_preserves_groups(self):
+        """블로킹 사용 여부와 관계없이 그룹 결과가 동일해야 함"""
+        candidates = self.make_catalog(120) + [
+            make_candidate(1000, "Apple", "iPhone15", "Apple iPhone 15 Pro 128GB 블랙", "1500000", gtin="9876"),
+            make_candidate(1001, "Apple", "iPhone15", "애플 아이폰 15 Pro", "1490000", gtin="9876"),
+        ]
+        
+        def urls(groups):
+            return [[item['offer'].url for item in group] for group in groups]
+        
+        blocked = ProductMatcher(blocking=True).match_products(candidates)
+        pairwise = ProductMatcher(blocking=False).match_products(candidates)
+        
+        assert urls(blocked) == urls(pairwise)
+    
+    def test_scoring_cost_grows_linearly(self):
+        """모델 수에 비례해 블록이 나뉘면 점수 행렬 크기가 선형에 가깝게 증가"""
+        from unittest import mock
+        
+        matcher = ProductMatcher()
+        cells = []
+        for size in (100, 400):
+            with mock.patch.object(matcher, 'score_matrix', wraps=matcher.score_matrix) as score:
+                matcher.match_products(self.make_catalog(size))
+                cells.append(sum(len(call.args[0]) ** 2 for call in score.call_args_list))
+        
+        # 4배 입력에서 전수 비교는 16배, 블로킹은 그보다 훨씬 작아야 함
+        assert cells[1] < cells[0] * 8
+        assert cells[1] < 400 * 400 / 10
+
+
+class TestFeatureCache:
+    """제목 특징 캐시 테스트"""
+    
+    def test_features_built_once_per_title(self):
+        """같은 제목은 매칭 중 한 번만 토큰화"""
+        from unittest import mock
+        from ..services.matching import FeatureCache
+        
+        matcher = ProductMatcher(cache=FeatureCache(maxsize=16))
+        candidates = [
+            make_candidate(i, "samsung", "s24", "samsung s24 128gb black", "1200000")
+            for i in range(10)
+        ]
+        
+        with mock.patch.object(matcher, 'extract_tokens', wraps=matcher.extract_tokens) as extract:
+            matcher.match_products(candidates)
+            matcher.match_products(candidates)
+        
+        assert extract.call_count == 1
+        assert matcher.cache.stats()['misses'] == 1
+        assert matcher.cache.stats()['hits'] == 19
+    
+    def test_lru_eviction(self):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 제목부터 제거"""
+        from ..services.matching import FeatureCache
+        
+        matcher = ProductMatcher(cache=FeatureCache(maxsize=2))
+        matcher.title_features("samsung s24")
+        matcher.title_features("apple iphone 15")
+        matcher.title_features("samsung s24")
+        matcher.title_features("lg oled65")
+        
+        stats = matcher.cache.stats()
+        assert stats['size'] == 2
+        assert stats['misses'] == 3
+        
+        matcher.title_features("samsung s24")
+        assert matcher.cache.stats()['hits'] == 2
+    
+    def test_features_match_extract_tokens(self):
+        """캐시된 특징은 extract_tokens 결과와 동일"""
+        matcher = ProductMatcher()
+        title = "Samsung Galaxy S24 (128GB) Black"
+        
+        features = matcher.title_features(title)
+        
+        assert features.tokens == matcher.extract_tokens(title)
+        assert features.normalized == matcher.normalize(title)
+        assert features.model_code == "s24"
+
+
+class TestScoreMatrix:
+    """점수 행렬 테스트"""
+    
+    def make_candidates(self):
+        return [
+            make_candidate(1, "samsung", "s24", "samsung galaxy s24 128gb black", "1200000"),
+            make_candidate(2, "samsung", "s24", "samsung s24 128gb black", "1180000"),
+            make_candidate(3, "samsung", "s23", "samsung galaxy s23 256gb white", "900000"),
+            make_candidate(4, "Apple", "iPhone15", "Apple iPhone 15 Pro 128GB", "1500000", gtin="9876"),
+            make_candidate(5, "애플", "iPhone15", "애플 아이폰 15 프로", "1490000", gtin="9876"),
+            make_candidate(6, "lg", "oled65", "lg oled 65인치 4k tv", "2500000"),
+            {'product': Product(id=7, brand="lg", model_code="oled65", name="lg oled65"), 'offer': None},
+        ]
+    
+    def test_matrix_matches_pairwise_score(self):
+        """행렬의 각 원소는 score() 결과와 같아야 함"""
+        matcher = ProductMatcher()
+        candidates = self.make_candidates()
+        
+        scores = matcher.score_matrix(candidates)
+        
+        assert scores.shape == (7, 7)
+        for i, first in enumerate(candidates):
+            for j, second in enumerate(candidates):
+                if i == j:
+                    continue
+                expected = matcher.score(
+                    first['product'], second['product'], first.get('offer'), second.get('offer')
+                )
+                assert scores[i, j] == pytest.approx(expected)
+    
+    def test_blocked_grouping_matches_full_matrix(self):
+        """블로킹 묶음별 그룹핑(match_products)은 전체 행렬 그룹핑과 같은 그룹을 만들어야 함"""
+        matcher = ProductMatcher()
+        candidates = self.make_candidates()
+        
+        def ids(groups):
+            return [[item['product'].id for item in group] for group in groups]
+        
+        expected = ids(matcher.group_score_matrix(candidates, matcher.score_matrix(candidates)))
+        
+        assert expected == [[1, 2], [3], [4, 5], [6, 7]]
+        assert ids(matcher.match_products(candidates)) == expected
+    
+    def test_empty_candidates(self):
+        """빈 후보 목록"""
+        matcher = ProductMatcher()
+        
+        assert matcher.score_matrix([]).shape == (0, 0)
+        assert matcher.match_products_vectorized([]) == []
+
+
+class TestUnionFindClustering:
+    """유니온-파인드 그룹핑 테스트"""
+    
+    def make_candidates(self):
+        return [
+            make_candidate(1, "samsung", "s24", "samsung galaxy s24 128gb black", "1200000"),
+            make_candidate(2, "samsung", "s24", "samsung s24 128gb black", "1180000"),
+            make_candidate(3, "samsung", "s23", "samsung galaxy s23 128gb black", "1150000"),
+            make_candidate(4, "Apple", "iPhone15", "Apple iPhone 15 Pro 128GB", "1500000", gtin="9876"),
+            make_candidate(5, "애플", "iPhone15", "애플 아이폰 15 프로", "1490000", gtin="9876"),
+            make_candidate(6, "lg", "oled65", "lg oled 65인치 4k tv", "2500000"),
+        ]
+    
+    def group_ids(self, groups):
+        return [[item['product'].id for item in group] for group in groups]
+    
+    def test_invalid_mode(self):
+        """지원하지 않는 그룹핑 방식/연결 기준"""
+        with pytest.raises(ValueError):
+            ProductMatcher(clustering='kmeans')
+        with pytest.raises(ValueError):
+            ProductMatcher(clustering='union_find', linkage='ward')
+    
+    @pytest.mark.parametrize('linkage', ['single', 'complete', 'average'])
+    def test_order_independent(self, linkage):
+        """프로바이더 응답 순서가 달라도 같은 그룹"""
+        matcher = ProductMatcher(clustering='union_find', linkage=linkage)
+        candidates = self.make_candidates()
+        
+        expected = self.group_ids(matcher.match_products(candidates))
+        
+        assert self.group_ids(matcher.match_products(candidates[::-1])) == expected
+        assert self.group_ids(matcher.match_products(candidates[3:] + candidates[:3])) == expected
+    
+    def test_chunked_edges_merge(self):
+        """후보 쌍을 나눠 계산한 간선을 합쳐도 같은 그룹"""
+        matcher = ProductMatcher(clustering='union_find')
+        candidates = self.make_candidates()
+        pairs = matcher.candidate_pairs(candidates)
+        
+        edges = []
+        for start in range(0, len(pairs), 2):
+            edges.extend(matcher.score_edges(candidates, pairs[start:start + 2]))
+        
+        assert matcher.cluster_edges(candidates, edges) == matcher.cluster_edges(
+            candidates, matcher.score_edges(candidates)
+        )
+    
+    def test_linkage_rules(self):
+        """a-b, b-c만 임계값 이상일 때 single은 연쇄로 묶고 complete/average는 분리"""
+        candidates = self.make_candidates()[:3]
+        edges = [(0, 1, 0.9), (1, 2, 0.8), (0, 2, 0.5)]
+        
+        single = ProductMatcher(clustering='union_find', linkage='single')
+        complete = ProductMatcher(clustering='union_find', linkage='complete')
+        average = ProductMatcher(clustering='union_find', linkage='average')
+        
+        assert len(single.cluster_edges(candidates, edges)) == 1
+        assert len(complete.cluster_edges(candidates, edges)) == 2
+        assert len(average.cluster_edges(candidates, edges)) == 2
+        assert len(average.cluster_edges(candidates, [(0, 1, 0.9), (1, 2, 0.8), (0, 2, 0.7)])) == 1
+    
+    def test_transitive_grouping(self):
+        """GTIN 그룹은 입력 순서와 관계없이 하나로 묶임"""
+        matcher = ProductMatcher(clustering='union_find')
+        groups = self.group_ids(matcher.match_products(self.make_candidates()))
+        
+        assert [4, 5] in groups
+        assert [6] in groups
@@ -0,0 +1,187 @@
+"""
+알림 발송 파이프라인 테스트
+"""
+import smtplib
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.db import connection
+from django.utils import timezone
+from alerts.models import Notification
+from apps.alerts import channels as channels_module
+from apps.alerts.channels import FileChannel, NotificationChannel
+from apps.alerts.delivery import deliver_pending, queue_price_alerts, retry_delay
+from ..models import Offer, Product, Watch
+
+
+class FailingChannel(NotificationChannel):
+    """항상 실패하는 테스트용 채널"""
+    
+    name = 'failing'
+    
+    def send_batch(self, notifications):
+        return {notification.id: "connection refused" for notification in notifications}
+
+
+class RejectingEmailBackend(locmem.EmailBackend):
+    """user_2 수신자만 거부하는 테스트용 메일 백엔드"""
+    
+    def send_messages(self, messages):
+        for message in messages:
+            if "user_2@example.com" in message.to:
+                raise smtplib.SMTPRecipientsRefused({"user_2@example.com": (550, b"mailbox unavailable")})
+        return super().send_messages(messages)
+
+
+class InspectingChannel(NotificationChannel):
+    """발송 중 트랜잭션 상태와 다른 워커의 발송 결과를 기록하는 테스트용 채널"""
+    
+    name = 'inspecting'
+    seen = []
+    
+    def send_batch(self, notifications):
+        InspectingChannel.seen.append({
+            'in_transaction': connection.in_atomic_block,
+            # 발송 중 다른 워커가 실행된 상황
+            'concurrent': deliver_pending(),
+        })
+        return {notification.id: None for notification in notifications}
+
+
+@pytest.fixture
+def watches():
+    product = Product.objects.create(brand="Samsung", model_code="S24", name="갤럭시 S24")
+    return [
+        Watch.objects.create(user_id=user_id, product=product, target_price=Decimal("1300000"))
+        for user_id in range(1, 4)
+    ]
+
+
+@pytest.fixture
+def offer(watches):
+    return Offer.objects.create(
+        product=watches[0].product, marketplace="쿠팡", seller="쿠팡",
+        price=Decimal("1200000"), url="https://test.coupang.com/1"
+    )
+
+
+@pytest.mark.django_db
+class TestNotificationDelivery:
+    """알림 발송 테스트"""
+    
+    def test_email_batch_uses_one_connection(self, watches, offer, settings, django_capture_on_commit_callbacks):
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        settings.ALERTS_NOTIFICATION_CHANNELS = ['email']
+        opened = []
+        original = channels_module.get_connection
+        
+        def counting_connection(*args, **kwargs):
+            opened.append(1)
+            return original(*args, **kwargs)
+        
+        with django_capture_on_commit_callbacks() as callbacks:
+            queue_price_alerts(watches, offer, Decimal("1200000"))
+        assert len(callbacks) == 1
+        
+        channels_module.get_connection = counting_connection
+        try:
+            stats = deliver_pending()
+        finally:
+            channels_module.get_connection = original
+        
+        assert stats == {'sent': 3, 'retried': 0, 'failed': 0}
+        assert len(opened) == 1
+        assert [message.to for message in mail.outbox] == [[f"user_{w.user_id}@example.com"] for w in watches]
+        assert not Notification.objects.exclude(status=Notification.STATUS_SENT).exists()
+    
+    def test_email_failures_are_per_notification(self, watches, offer, settings):
+        settings.EMAIL_BACKEND = f'{__name__}.RejectingEmailBackend'
+        settings.ALERTS_NOTIFICATION_CHANNELS = ['email']
+        queue_price_alerts(watches, offer, Decimal("1200000"))
+        
+        stats = deliver_pending()
+        
+        assert stats == {'sent': 2, 'retried': 1, 'failed': 0}
+        assert [message.to for message in mail.outbox] == [["user_1@example.com"], ["user_3@example.com"]]
+        rejected = Notification.objects.get(watch=watches[1])
+        assert rejected.status == Notification.STATUS_PENDING and "mailbox unavailable" in rejected.last_error
+    
+    def test_file_channel_writes_batch(self, watches, offer, settings, tmp_path, monkeypatch):
+        settings.ALERTS_NOTIFICATION_CHANNELS = ['file']
+        log_file = tmp_path / 'price_alerts.log'
+        monkeypatch.setitem(channels_module.CHANNELS, 'file', lambda: FileChannel(log_file))
+        
+        queue_price_alerts(watches, offer, Decimal("1200000"))
+        deliver_pending()
+        
+        assert log_file.read_text(encoding='utf-8').count("가격 알림: Samsung S24") == 3
+    
+    def test_failed_delivery_backs_off_then_fails(self, watches, offer, settings, monkeypatch):
+        settings.ALERTS_NOTIFICATION_CHANNELS = ['failing']
+        settings.ALERTS_NOTIFICATION_MAX_ATTEMPTS = 2
+        monkeypatch.setitem(channels_module.CHANNELS, 'failing', FailingChannel)
+        
+        queue_price_alerts(watches[:1], offer, Decimal("1200000"))
+        assert deliver_pending() == {'sent': 0, 'retried': 1, 'failed': 0}
+        
+        notification = Notification.objects.get()
+        assert notification.status == Notification.STATUS_PENDING
+        assert notification.next_attempt_at > timezone.now() + retry_delay(1) - timedelta(seconds=5)
+        
+        # 백오프 중에는 다시 시도하지 않음
+        assert deliver_pending() == {'sent': 0, 'retried': 0, 'failed': 0}
+        
+        Notification.objects.update(next_attempt_at=timezone.now())
+        assert deliver_pending() == {'sent': 0, 'retried': 0, 'failed': 1}
+        assert Notification.objects.get().last_error == "connection refused"
+    
+    def test_retry_delay_is_exponential_and_capped(self, settings):
+        settings.ALERTS_NOTIFICATION_RETRY_BASE = 60
+        settings.ALERTS_NOTIFICATION_RETRY_MAX = 600
+        assert [retry_delay(n).total_seconds() for n in range(1, 6)] == [60, 120, 240, 480, 600]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDeliveryClaim:
+    """알림 선점 테스트"""
+    
+    def test_sends_outside_transaction_after_claiming(self, watches, offer, settings, monkeypatch):
+        settings.ALERTS_NOTIFICATION_CHANNELS = ['inspecting']
+        monkeypatch.setitem(channels_module.CHANNELS, 'inspecting', InspectingChannel)
+        monkeypatch.setattr(InspectingChannel, 'seen', [])
+        queue_price_alerts(watches, offer, Decimal("1200000"))
+        
+        stats = deliver_pending()
+        
+        assert stats == {'sent': 3, 'retried': 0, 'failed': 0}
+        assert InspectingChannel.seen == [
+            {'in_transaction': False, 'concurrent': {'sent': 0, 'retried': 0, 'failed': 0}}
+        ]
+        assert set(Notification.objects.values_list('status', 'attempts')) == {(Notification.STATUS_SENT, 1)}
+    
+    def test_lease_expiry_makes_claimed_notifications_due_again(self, watches, offer, settings):
+        """발송 중 워커가 죽으면 선점 시간이 지난 뒤 다시 발송"""
+        from apps.alerts.delivery import _claim_batch
+        settings.ALERTS_NOTIFICATION_CHANNELS = ['file']
+        settings.ALERTS_NOTIFICATION_LEASE = 60
+        queue_price_alerts(watches[:1], offer, Decimal("1200000"))
+        now = timezone.now()
+        
+        assert len(_claim_batch('file', now, 10)) == 1
+        assert _claim_batch('file', now + timedelta(seconds=30), 10) == []
+        
+        reclaimed = _claim_batch('file', now + timedelta(seconds=61), 10)
+        assert [notification.attempts for notification in reclaimed] == [2]
+
+
+class TestNotificationChannel:
+    """알림 채널 베이스 클래스 테스트"""
+    
+    def test_send_batch_is_abstract(self):
+        class IncompleteChannel(NotificationChannel):
+            name = 'incomplete'
+        
+        with pytest.raises(TypeError):
+            IncompleteChannel()
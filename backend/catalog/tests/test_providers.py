@@ -5,7 +5,28 @@ import pytest
 from decimal import Decimal
 from django.test import TestCase
 from ..providers.mock import MockProvider
-from ..providers.base import OfferLike, SearchResult
+from ..providers.base import BaseProvider, OfferLike, ProviderRegistry, SearchResult
+from ..providers.health import CLOSED, HALF_OPEN, OPEN, ProviderHealth, provider_health
+
+
+class DelayedProvider(BaseProvider):
+    """지연/오류를 흉내내는 테스트용 프로바이더"""
+    
+    def __init__(self, name: str, delay: float, fail: bool = False, timeout: float = 1.0):
+        super().__init__(name)
+        self.delay = delay
+        self.fail = fail
+        self.timeout = timeout
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        import asyncio
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} 장애")
+        return SearchResult(offers=[], total_count=0, marketplace=self.name, search_time=self.delay)
+    
+    async def get_product_detail(self, url: str):
+        return None
 
 
 class MockProviderTest(TestCase):
@@ -60,7 +81,7 @@ class MockProviderTest(TestCase):
         # 빈 키워드 시 모든 데이터 반환
         self.assertGreaterEqual(len(result.offers), 5)
     
-    @pytest.mark_asyncio
+    @pytest.mark.asyncio
     async def test_search_nonexistent_keyword(self):
         """존재하지 않는 키워드 검색 테스트"""
         result = await self.provider.search("존재하지않는상품")
@@ -94,8 +115,9 @@ class MockProviderTest(TestCase):
         self.assertIn('requests_per_hour', rate_limit)
         self.assertIn('cooldown_seconds', rate_limit)
         
-        self.assertEqual(rate_limit['requests_per_minute'], 60)
-        self.assertEqual(rate_limit['requests_per_hour'], 1000)
+        # 목데이터 프로바이더는 주기 스캔을 막지 않도록 제한 없음
+        self.assertIsNone(rate_limit['requests_per_minute'])
+        self.assertIsNone(rate_limit['requests_per_hour'])
 
 
 @pytest.mark.asyncio
@@ -154,5 +176,120 @@ class MockProviderAsyncTest:
             assert isinstance(offer.marketplace, str)
             assert isinstance(offer.seller, str)
             assert isinstance(offer.title, str)
-            assert isinstance(offer.price, Decimal)
+            assert isinstance(offer.price, int)
             assert isinstance(offer.url, str)
+
+
+@pytest.mark.asyncio
+class TestProviderRegistryFanOut:
+    """프로바이더 동시 검색 테스트"""
+    
+    @pytest.fixture
+    def registry(self):
+        provider_health.reset()
+        registry = ProviderRegistry()
+        registry.register(DelayedProvider("fast", delay=0.05))
+        registry.register(DelayedProvider("slow", delay=0.3))
+        registry.register(DelayedProvider("stuck", delay=5.0, timeout=0.2))
+        registry.register(DelayedProvider("broken", delay=0.01, fail=True))
+        return registry
+    
+    async def test_fan_out_runs_concurrently(self, registry):
+        """전체 소요 시간은 합이 아니라 가장 느린 프로바이더 기준이어야 함"""
+        result = await registry.fan_out("갤럭시")
+        
+        assert result.elapsed < 0.6
+        assert sorted(r.marketplace for r in result.results) == ["fast", "slow"]
+    
+    async def test_fan_out_records_timeouts_and_failures(self, registry):
+        """타임아웃/실패 프로바이더 기록 테스트"""
+        result = await registry.fan_out("갤럭시")
+        
+        assert result.timed_out == ["stuck"]
+        assert "broken" in result.failed
+        assert result.is_partial
+    
+    async def test_fan_out_timeout_override(self, registry):
+        """공통 타임아웃 지정 시 느린 프로바이더도 타임아웃 처리"""
+        result = await registry.fan_out("갤럭시", timeout=0.1)
+        
+        assert [r.marketplace for r in result.results] == ["fast"]
+        assert sorted(result.timed_out) == ["slow", "stuck"]
+    
+    async def test_search_all_returns_partial_results(self, registry):
+        """search_all은 제시간에 응답한 결과만 반환"""
+        results = await registry.search_all("갤럭시")
+        
+        assert len(results) == 2
+
+
+class TestCircuitBreaker:
+    """회로 차단기 테스트"""
+    
+    def make_health(self, **kwargs):
+        options = {'failure_threshold': 3, 'min_samples': 4, 'open_seconds': 10, 'max_open_seconds': 40}
+        options.update(kwargs)
+        return ProviderHealth("p", **options)
+    
+    def test_opens_after_consecutive_failures(self):
+        health = self.make_health()
+        for _ in range(3):
+            health.record_failure(0.1, now=0.0)
+        
+        assert health.state == OPEN
+        assert health.is_open(now=5.0)
+        assert not health.allow_request(now=5.0)
+    
+    def test_opens_on_error_rate(self):
+        health = self.make_health(failure_threshold=100)
+        for ok in (True, False, True, False):
+            if ok:
+                health.record_success(0.1, now=0.0)
+            else:
+                health.record_failure(0.1, now=0.0)
+        
+        assert health.state == OPEN
+    
+    def test_half_open_probe_closes_or_backs_off(self):
+        health = self.make_health()
+        for _ in range(3):
+            health.record_failure(0.1, now=0.0)
+        
+        # 시험 호출은 한 번에 하나만 허용
+        assert health.allow_request(now=10.0)
+        assert health.state == HALF_OPEN
+        assert not health.allow_request(now=10.0)
+        
+        # 시험 호출 실패 시 두 배 동안 다시 열림
+        health.record_failure(0.1, now=10.0)
+        assert health.state == OPEN
+        assert health.open_until == 30.0
+        
+        assert health.allow_request(now=30.0)
+        health.record_success(0.1, now=30.0)
+        assert health.state == CLOSED
+        assert health.consecutive_failures == 0
+    
+    def test_latency_percentiles(self):
+        health = self.make_health()
+        for latency in range(1, 101):
+            health.record_success(latency / 100)
+        
+        assert health.latency_percentiles() == {'p50': 0.5, 'p95': 0.95, 'p99': 0.99}
+    
+    @pytest.mark.asyncio
+    async def test_registry_skips_open_provider(self, settings):
+        settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD = 2
+        provider_health.reset()
+        registry = ProviderRegistry()
+        registry.register(DelayedProvider("ok", delay=0.01))
+        registry.register(DelayedProvider("down", delay=0.01, fail=True))
+        
+        for _ in range(2):
+            await registry.fan_out("갤럭시")
+        
+        assert [p.get_name() for p in registry.get_available_providers()] == ["ok"]
+        result = await registry.fan_out("갤럭시")
+        assert result.failed == {}
+        assert registry.get_health_stats()["down"]["state"] == OPEN
+        provider_health.reset()
@@ -0,0 +1,133 @@
+"""
+프로바이더 속도 제한 테스트
+"""
+import asyncio
+import pytest
+from ..providers.base import BaseProvider, ProviderRegistry, SearchResult
+from ..providers.ratelimit import (
+    BACKGROUND, INTERACTIVE, LocalBucketStore, RateLimiter, rate_limiters, windows_from_info
+)
+
+
+class LimitedProvider(BaseProvider):
+    """분당 요청 수가 제한된 테스트용 프로바이더"""
+    
+    def __init__(self, name: str, requests_per_minute: int):
+        super().__init__(name)
+        self.requests_per_minute = requests_per_minute
+        self.calls = 0
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        self.calls += 1
+        return SearchResult(offers=[], total_count=0, marketplace=self.name, search_time=0.0)
+    
+    async def get_product_detail(self, url: str):
+        return None
+    
+    def get_rate_limit_info(self) -> dict:
+        return {'requests_per_minute': self.requests_per_minute, 'requests_per_hour': None, 'cooldown_seconds': 0}
+
+
+class DefaultProvider(BaseProvider):
+    """속도 제한을 따로 정하지 않은 테스트용 프로바이더"""
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        return SearchResult(offers=[], total_count=0, marketplace=self.name, search_time=0.0)
+    
+    async def get_product_detail(self, url: str):
+        return None
+
+
+class DeclaredProvider(DefaultProvider):
+    """어댑터에 속도 제한을 선언한 테스트용 프로바이더"""
+    
+    rate_limit = {'requests_per_minute': 60, 'requests_per_hour': 1000}
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiters():
+    rate_limiters.reset()
+    yield
+    rate_limiters.reset()
+
+
+class TestTokenBucket:
+    """토큰 버킷 계산 테스트"""
+    
+    def test_windows_from_info(self):
+        windows = windows_from_info({'requests_per_minute': 60, 'requests_per_hour': 1800, 'cooldown_seconds': 2})
+        assert windows == [(60.0, 1.0), (1800.0, 0.5), (1.0, 0.5)]
+        assert windows_from_info({'requests_per_minute': 0}) == []
+    
+    def test_take_waits_for_slowest_window(self):
+        store = LocalBucketStore()
+        windows = [(2.0, 1.0), (10.0, 0.1)]
+        
+        assert store.take('p', windows, now=0.0) == 0
+        assert store.take('p', windows, now=0.0) == 0
+        assert store.take('p', windows, now=0.0) == pytest.approx(1.0)
+        assert store.take('p', windows, now=0.5) == pytest.approx(0.5)
+        assert store.take('p', windows, now=1.0) == 0
+
+
+class TestRateLimitInfo:
+    """프로바이더별 속도 제한 설정 테스트"""
+    
+    def test_default_is_unlimited(self):
+        assert windows_from_info(DefaultProvider('default').get_rate_limit_info()) == []
+    
+    def test_adapter_declares_explicit_limits(self):
+        assert windows_from_info(DeclaredProvider('declared').get_rate_limit_info()) == [(60.0, 1.0), (1000.0, 1000 / 3600)]
+    
+    def test_settings_override_adapter_limits(self, settings):
+        settings.PROVIDER_RATE_LIMITS = {'default': {'cooldown_seconds': 2}, 'declared': {'requests_per_hour': None}}
+        
+        assert windows_from_info(DefaultProvider('default').get_rate_limit_info()) == [(1.0, 0.5)]
+        assert windows_from_info(DeclaredProvider('declared').get_rate_limit_info()) == [(60.0, 1.0)]
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+    """속도 제한 대기열 테스트"""
+    
+    async def test_interactive_calls_jump_background_queue(self):
+        limiter = RateLimiter('p', [(1.0, 20.0)], LocalBucketStore())
+        await limiter.acquire()
+        order = []
+        
+        async def call(label, priority):
+            await limiter.acquire(priority)
+            order.append(label)
+        
+        background = [asyncio.create_task(call(f'b{i}', BACKGROUND)) for i in range(2)]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth() == {'interactive': 0, 'background': 2}
+        interactive = [asyncio.create_task(call(f'i{i}', INTERACTIVE)) for i in range(2)]
+        await asyncio.gather(*background, *interactive)
+        
+        assert order == ['i0', 'i1', 'b0', 'b1']
+        stats = limiter.stats()
+        assert stats['acquired_interactive'] == 3 and stats['acquired_background'] == 2
+        assert stats['max_wait'] >= 0.04
+    
+    async def test_timeout_leaves_queue(self):
+        limiter = RateLimiter('p', [(1.0, 0.1)], LocalBucketStore())
+        await limiter.acquire()
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire(timeout=0.05)
+        
+        assert limiter.queue_depth() == {'interactive': 0, 'background': 0}
+        assert limiter.stats()['abandoned'] == 1
+    
+    async def test_registry_counts_queue_wait_against_provider_timeout(self):
+        provider = LimitedProvider("limited", requests_per_minute=1)
+        registry = ProviderRegistry()
+        registry.register(provider)
+        
+        first = await registry.search_provider(provider, "갤럭시", timeout=0.1)
+        second = await registry.search_provider(provider, "갤럭시", timeout=0.1)
+        
+        assert (first.status, second.status) == ('ok', 'timeout')
+        assert provider.calls == 1
+        assert registry.get_rate_limit_stats()['limited']['abandoned'] == 1
@@ -0,0 +1,69 @@
+"""
+오퍼 레코드 테스트
+"""
+import pytest
+from decimal import Decimal
+from pydantic import ValidationError
+from ..providers.base import OfferLike, SearchResult
+from ..providers.records import OfferRecord, to_won
+
+
+class TestToWon:
+    """원 단위 가격 변환 테스트"""
+    
+    @pytest.mark.parametrize('value, expected', [
+        (1200000, 1200000),
+        (Decimal('1200000'), 1200000),
+        (Decimal('999.5'), 1000),
+        (1499.4, 1499),
+        ('1,250,000', 1250000),
+        (' 3000 ', 3000),
+    ])
+    def test_converts_to_integer_won(self, value, expected):
+        assert to_won(value) == expected
+        assert type(to_won(value)) is int
+    
+    @pytest.mark.parametrize('value', [-1, Decimal('-0.6'), float('nan'), float('inf'), 'abc', None, Decimal('NaN')])
+    def test_rejects_invalid_prices(self, value):
+        with pytest.raises(ValueError):
+            to_won(value)
+
+
+class TestOfferRecord:
+    """오퍼 레코드 생성/변환 테스트"""
+    
+    def test_create_validates_once(self):
+        record = OfferRecord.create(
+            marketplace='쿠팡', seller='쿠팡', title='삼성 갤럭시 S24', price='1200000',
+            url='https://test.coupang.com/1', shipping_fee=Decimal('3000'), affiliate_url=''
+        )
+        assert record.price == 1200000 and record.shipping_fee == 3000
+        assert record.total_price == 1203000
+        assert record.affiliate_url is None
+        assert not hasattr(record, '__dict__')
+    
+    def test_create_rejects_missing_fields(self):
+        with pytest.raises(ValueError):
+            OfferRecord.create(marketplace='쿠팡', seller='쿠팡', title=None, price=1000, url='https://a')
+        with pytest.raises(ValueError):
+            OfferRecord.create(marketplace='쿠팡', seller='쿠팡', title='상품', price=1000, url='')
+    
+    def test_search_result_converts_at_boundary(self):
+        record = OfferRecord.create(marketplace='11번가', seller='11번가', title='LG 그램', price=1500000,
+                                    url='https://test.11st.co.kr/1')
+        offer_like = OfferLike(marketplace='쿠팡', seller='쿠팡', title='LG 그램', price=Decimal('1490000'),
+                               shipping_fee=Decimal('2500'), url='https://test.coupang.com/1', rating=4.5)
+        raw = {'marketplace': 'G마켓', 'seller': 'G마켓', 'title': 'LG 그램', 'price': '1480000',
+               'url': 'https://test.gmarket.co.kr/1'}
+        
+        result = SearchResult(offers=[record, offer_like, raw], marketplace='test', search_time=0.1)
+        
+        assert all(isinstance(offer, OfferRecord) for offer in result.offers)
+        # 이미 레코드인 오퍼는 다시 검증/복사하지 않음
+        assert result.offers[0] is record
+        assert result.offers[1].total_price == 1492500
+        assert result.offers[2].price == 1480000
+    
+    def test_search_result_rejects_invalid_raw_offer(self):
+        with pytest.raises(ValidationError):
+            SearchResult(offers=[{'marketplace': '쿠팡', 'price': '1000'}], marketplace='test', search_time=0.1)
@@ -0,0 +1,137 @@
+"""
+데이터 보존 서비스 테스트
+"""
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from django.utils import timezone
+from ..models import Offer, PriceHistory, PriceHistoryDaily, Product, ProductBestPrice
+from ..services.pricing import refresh_best_prices
+from ..services import retention
+from ..services.retention import cleanup_old_data, purge_price_history, purge_stale_offers
+
+
+NOW = timezone.make_aware(datetime(2026, 6, 30, 12, 0))
+
+
+def record(offer: Offer, total_price: str, recorded_at: datetime) -> PriceHistory:
+    history = PriceHistory.objects.create(offer=offer, price=Decimal(total_price), total_price=Decimal(total_price))
+    PriceHistory.objects.filter(pk=history.pk).update(recorded_at=recorded_at)
+    return history
+
+
+@pytest.mark.django_db
+class TestRetention:
+    """보존 기간 정리 테스트"""
+    
+    @pytest.fixture
+    def product(self):
+        return Product.objects.create(brand="Samsung", model_code="S24", name="갤럭시 S24")
+    
+    @pytest.fixture
+    def offer(self, product):
+        offer = Offer.objects.create(
+            product=product, marketplace="쿠팡", seller="쿠팡",
+            price=Decimal("1200000"), url="https://test.coupang.com/1"
+        )
+        Offer.objects.filter(pk=offer.pk).update(fetched_at=NOW)
+        return offer
+    
+    def test_rolls_up_history_across_chunks(self, offer):
+        day = NOW - timedelta(days=120)
+        for hour, price in [(9, "1200000"), (11, "1100000"), (15, "1250000"), (20, "1180000")]:
+            record(offer, price, day.replace(hour=hour))
+        recent = record(offer, "1150000", NOW - timedelta(days=1))
+        
+        deleted = purge_price_history(NOW - timedelta(days=90), chunk_size=3)
+        
+        assert deleted == 4
+        assert list(PriceHistory.objects.values_list('pk', flat=True)) == [recent.pk]
+        summary = PriceHistoryDaily.objects.get()
+        assert (summary.marketplace, summary.date) == ("쿠팡", timezone.localdate(day))
+        assert summary.min_total_price == Decimal("1100000")
+        assert summary.max_total_price == Decimal("1250000")
+        assert summary.close_total_price == Decimal("1180000")
+        assert summary.sample_count == 4
+    
+    def test_stale_offers_are_archived_and_best_price_refreshed(self, product, offer, settings):
+        settings.RETENTION_OFFER_DAYS = 30
+        stale = Offer.objects.create(
+            product=product, marketplace="11번가", seller="11번가",
+            price=Decimal("1000000"), url="https://test.11st.co.kr/1"
+        )
+        Offer.objects.filter(pk=stale.pk).update(fetched_at=NOW - timedelta(days=45))
+        record(stale, "1000000", NOW - timedelta(days=45))
+        refresh_best_prices([product.id])
+        assert ProductBestPrice.objects.get(product=product).offer_id == stale.id
+        
+        stats = cleanup_old_data(now=NOW)
+        
+        assert stats['offers'] == 1
+        assert list(Offer.objects.values_list('pk', flat=True)) == [offer.pk]
+        assert PriceHistoryDaily.objects.get(marketplace="11번가").close_total_price == Decimal("1000000")
+        assert ProductBestPrice.objects.get(product=product).offer_id == offer.id
+    
+    def test_best_price_is_refreshed_per_chunk(self, offer, monkeypatch):
+        products = [
+            Product.objects.create(brand="LG", model_code=f"OLED{i}", name=f"LG OLED {i}")
+            for i in range(3)
+        ]
+        for i, product in enumerate(products):
+            stale = Offer.objects.create(
+                product=product, marketplace="11번가", seller="11번가",
+                price=Decimal("1000000"), url=f"https://test.11st.co.kr/{i}"
+            )
+            Offer.objects.filter(pk=stale.pk).update(fetched_at=NOW - timedelta(days=45))
+        refresh_best_prices(product.id for product in products)
+        
+        calls = []
+        refresh = retention.refresh_best_prices
+        
+        def spy(product_ids):
+            # 구간 오퍼는 이미 삭제된 상태에서 같은 트랜잭션 안에서 호출됨
+            calls.append(sorted(product_ids))
+            assert not Offer.objects.filter(product_id__in=product_ids).exists()
+            return refresh(product_ids)
+        
+        monkeypatch.setattr(retention, 'refresh_best_prices', spy)
+        
+        assert purge_stale_offers(NOW - timedelta(days=30), chunk_size=2) == 3
+        assert calls == [[products[0].id, products[1].id], [products[2].id]]
+        assert not ProductBestPrice.objects.filter(product__in=products).exists()
+    
+    def test_stale_offer_history_is_deleted_in_chunks(self, product, offer, monkeypatch):
+        stale = Offer.objects.create(
+            product=product, marketplace="11번가", seller="11번가",
+            price=Decimal("1000000"), url="https://test.11st.co.kr/1"
+        )
+        Offer.objects.filter(pk=stale.pk).update(fetched_at=NOW - timedelta(days=45))
+        for days in range(45, 52):
+            record(stale, "1000000", NOW - timedelta(days=days))
+        record(offer, "1200000", NOW - timedelta(days=45))
+        
+        chunks = []
+        rollup = retention.rollup_price_history
+        
+        def spy(history):
+            chunks.append(history.count())
+            return rollup(history)
+        
+        monkeypatch.setattr(retention, 'rollup_price_history', spy)
+        
+        deleted = purge_stale_offers(NOW - timedelta(days=30), chunk_size=3)
+        
+        assert deleted == 1
+        # 히스토리는 구간별로 지워지고, 오퍼 삭제 시점에는 남은 히스토리가 없음
+        assert chunks == [3, 3, 1, 0]
+        assert list(PriceHistory.objects.values_list('offer_id', flat=True)) == [offer.pk]
+        assert PriceHistoryDaily.objects.filter(marketplace="11번가").count() == 7
+    
+    def test_zero_retention_keeps_table(self, offer, settings):
+        settings.RETENTION_OFFER_DAYS = 0
+        settings.RETENTION_PRICE_HISTORY_DAYS = 0
+        Offer.objects.filter(pk=offer.pk).update(fetched_at=NOW - timedelta(days=365))
+        record(offer, "1200000", NOW - timedelta(days=365))
+        
+        assert cleanup_old_data(now=NOW) == {'offers': 0, 'price_history': 0, 'daily_prices': 0}
+        assert PriceHistory.objects.count() == 1
@@ -0,0 +1,167 @@
+"""
+검색 서비스 테스트
+"""
+import asyncio
+import threading
+import pytest
+from decimal import Decimal
+from ..providers.base import BaseProvider, ProviderRegistry, SearchResult
+from ..providers.health import provider_health
+from ..providers.records import OfferRecord
+from ..services import search as search_module
+from ..services.cache import SearchResultCache
+from ..services.search import SearchService
+
+
+class StaticProvider(BaseProvider):
+    """고정 오퍼를 지연 후 반환하는 테스트용 프로바이더"""
+    
+    def __init__(self, name: str, offers, delay: float = 0.0):
+        super().__init__(name)
+        self.offers = offers
+        self.delay = delay
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        await asyncio.sleep(self.delay)
+        return SearchResult(
+            offers=self.offers,
+            total_count=len(self.offers),
+            marketplace=self.name,
+            search_time=self.delay
+        )
+    
+    async def get_product_detail(self, url: str):
+        return None
+
+
+def make_offer(marketplace: str, title: str, price: str, url: str) -> OfferRecord:
+    return OfferRecord.create(marketplace=marketplace, seller=marketplace, title=title, price=price, url=url)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ProviderRegistry()
+    registry.register(StaticProvider("coupang", [
+        make_offer("쿠팡", "삼성 갤럭시 S24 128GB 블랙", "1200000", "https://test.coupang.com/1"),
+    ], delay=0.01))
+    registry.register(StaticProvider("11st", [
+        make_offer("11번가", "삼성 갤럭시 S24 128GB 블랙", "1150000", "https://test.11st.co.kr/1"),
+    ], delay=0.2))
+    monkeypatch.setattr(search_module, 'provider_registry', registry)
+    return registry
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+class TestStreamSearchProducts:
+    """스트리밍 검색 테스트"""
+    
+    async def test_emits_partial_event_per_provider(self, registry):
+        """프로바이더 응답마다 부분 결과를 내보내고 마지막에 done 이벤트를 내보냄"""
+        service = SearchService(cache=None)
+        events = [event async for event in service.stream_search_products("갤럭시 S24")]
+        
+        assert [e['event'] for e in events] == ['partial', 'partial', 'done']
+        assert [e['provider'] for e in events[:2]] == ['coupang', '11st']
+        assert events[0]['pending_providers'] == ['11st']
+    
+    async def test_running_best_price(self, registry):
+        """최저가는 응답이 도착할수록 갱신됨"""
+        service = SearchService(cache=None)
+        events = [event async for event in service.stream_search_products("갤럭시 S24")]
+        
+        assert events[0]['best_price']['price'] == Decimal("1200000")
+        assert events[-1]['best_price']['price'] == Decimal("1150000")
+        assert len(events[-1]['offers']) == 2
+    
+    async def test_cache_hit_sends_single_done_event(self, registry):
+        """끝까지 받은 결과는 캐시에 저장되고, 다음 검색은 done 이벤트 하나로 응답"""
+        cache = SearchResultCache(ttl=60)
+        service = SearchService(cache=cache)
+        streamed = [event async for event in service.stream_search_products("갤럭시 S24")]
+        
+        events = [event async for event in service.stream_search_products("갤럭시  s24")]
+        
+        assert [e['event'] for e in events] == ['done']
+        assert events[0]['cached'] is True and streamed[-1]['cached'] is False
+        assert events[0]['best_price'] == streamed[-1]['best_price']
+        assert cache.stats['hits'] == 1
+        # 스트리밍으로 저장한 결과를 일반 검색도 그대로 사용
+        result = await service.search_products("갤럭시 S24")
+        assert result['offers'] == streamed[-1]['offers']
+        assert cache.stats['hits'] == 2
+    
+    async def test_partial_result_is_not_cached(self, registry):
+        """타임아웃 프로바이더가 있으면 캐시하지 않음"""
+        registry.get_provider("11st").timeout = 0.05
+        cache = SearchResultCache(ttl=60)
+        service = SearchService(cache=cache)
+        
+        events = [event async for event in service.stream_search_products("갤럭시 S24")]
+        assert events[-1]['timed_out_providers'] == ['11st']
+        
+        events = [event async for event in service.stream_search_products("갤럭시 S24")]
+        assert [e['event'] for e in events] == ['partial', 'partial', 'done']
+        provider_health.reset()
+    
+    async def test_matching_runs_off_event_loop(self, registry, monkeypatch):
+        """매칭(_build_result)은 이벤트 루프 스레드가 아닌 별도 스레드에서 실행"""
+        loop_thread = threading.current_thread()
+        threads = []
+        build_result = SearchService._build_result
+        
+        def spy(self, candidates):
+            threads.append(threading.current_thread())
+            return build_result(self, candidates)
+        
+        monkeypatch.setattr(SearchService, '_build_result', spy)
+        service = SearchService(cache=None)
+        
+        events = [event async for event in service.stream_search_products("갤럭시 S24")]
+        await service.search_products("갤럭시 S24", use_cache=False)
+        
+        assert len(events[-1]['products']) == 1
+        # 초기 빈 결과 한 번을 제외하면 모두 별도 스레드
+        assert threads[1:]
+        assert all(thread is not loop_thread for thread in threads[1:])
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+class TestBulkProductResolution:
+    """상품 일괄 조회/생성 테스트"""
+    
+    async def test_reuses_existing_and_creates_missing(self):
+        """기존 상품은 재사용하고 없는 상품만 한 번씩 생성"""
+        from ..models import Product
+        
+        existing = await Product.objects.acreate(brand="samsung", model_code="s24", name="Samsung S24")
+        offers = [
+            make_offer("쿠팡", "Samsung Galaxy S24 128GB", "1200000", "https://test.coupang.com/1"),
+            make_offer("11번가", "samsung s24 256gb", "1300000", "https://test.11st.co.kr/1"),
+            make_offer("쿠팡", "Apple iPhone 15 128GB", "1500000", "https://test.coupang.com/2"),
+            make_offer("11번가", "apple iphone 15 pro", "1490000", "https://test.11st.co.kr/2"),
+        ]
+        
+        candidates = await SearchService()._resolve_candidates(offers)
+        
+        assert [candidate['product'].id for candidate in candidates[:2]] == [existing.id, existing.id]
+        assert candidates[2]['product'].id == candidates[3]['product'].id
+        assert candidates[0]['offer'] is offers[0]
+        assert await Product.objects.acount() == 2
+    
+    async def test_concurrent_searches_do_not_duplicate_products(self):
+        """동시 검색이 같은 신규 상품을 만들어도 한 건만 생성"""
+        from ..models import Product
+        
+        offers = [make_offer("쿠팡", "LG OLED 65인치 4K TV", "2500000", "https://test.coupang.com/3")]
+        service = SearchService()
+        
+        results = await asyncio.gather(*[service._resolve_candidates(offers) for _ in range(5)])
+        
+        assert len({result[0]['product'].id for result in results}) == 1
+        assert await Product.objects.acount() == 1
+    
+    async def test_empty_offers(self):
+        """오퍼가 없으면 DB 조회 없이 빈 목록"""
+        assert await SearchService()._resolve_candidates([]) == []
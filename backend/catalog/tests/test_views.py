@@ -0,0 +1,336 @@
+"""
+카탈로그 API 테스트
+"""
+import asyncio
+import importlib
+import json
+import time
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from ..models import Offer, PriceHistory, PriceHistoryDaily, Product, ProductBestPrice, Watch
+from ..providers.base import BaseProvider, ProviderRegistry, SearchResult
+from ..providers.records import OfferRecord
+from .. import views
+from ..services import search as search_module
+from ..services.cache import SearchResultCache
+from ..services.history import lttb
+from ..services.pricing import rebuild_best_prices, refresh_best_prices
+from ..services.search import SearchService
+
+
+class DelayedSearchProvider(BaseProvider):
+    """오퍼 하나를 지연 후 반환하는 테스트용 프로바이더"""
+    
+    def __init__(self, name: str, price: int, delay: float):
+        super().__init__(name)
+        self.price = price
+        self.delay = delay
+    
+    async def search(self, keyword: str, **kwargs) -> SearchResult:
+        await asyncio.sleep(self.delay)
+        offer = OfferRecord.create(
+            marketplace=self.name, seller=self.name, title="삼성 갤럭시 S24 128GB",
+            price=self.price, url=f"https://test.{self.name}.com/1"
+        )
+        return SearchResult(offers=[offer], total_count=1, marketplace=self.name, search_time=self.delay)
+    
+    async def get_product_detail(self, url: str):
+        return None
+
+
+def make_products(count: int):
+    """오퍼 2개씩 가진 상품 생성"""
+    products = []
+    for index in range(count):
+        product = Product.objects.create(brand="Samsung", model_code=f"SM-{index}", name=f"상품 {index}")
+        Offer.objects.create(
+            product=product, marketplace="쿠팡", seller="쿠팡",
+            price=Decimal("10000") + index, shipping_fee=Decimal("3000"),
+            url=f"https://test.coupang.com/{index}"
+        )
+        Offer.objects.create(
+            product=product, marketplace="11번가", seller="셀러",
+            price=Decimal("12000") + index, shipping_fee=Decimal("0"),
+            url=f"https://test.11st.co.kr/{index}"
+        )
+        products.append(product)
+    refresh_best_prices(product.id for product in products)
+    return products
+
+
+@pytest.mark.django_db
+class TestBestPriceList:
+    """목록 API 최저가 테스트"""
+    
+    def test_product_list_best_price(self):
+        make_products(1)
+        Product.objects.create(brand="LG", model_code="NO-OFFER", name="오퍼 없음")
+        
+        response = APIClient().get('/api/v1/products/')
+        results = {item['model_code']: item for item in response.json()['results']}
+        
+        assert results['SM-0']['best_price'] == {
+            'price': 12000, 'total_price': 12000, 'marketplace': '11번가', 'seller': '셀러'
+        }
+        assert results['SM-0']['offer_count'] == 2
+        assert results['NO-OFFER']['best_price'] is None
+        assert results['NO-OFFER']['offer_count'] == 0
+    
+    def test_row_with_deleted_offer_is_not_shown(self):
+        product = make_products(1)[0]
+        Watch.objects.create(user_id=1, product=product, target_price=Decimal("9000"))
+        # 다시 계산되기 전에 최저가 오퍼가 삭제된 상태
+        Offer.objects.filter(product=product, marketplace="11번가").delete()
+        
+        product_item = APIClient().get('/api/v1/products/').json()['results'][0]
+        watch_item = APIClient().get('/api/v1/watches/', {'user_id': 1}).json()['results'][0]
+        
+        assert product_item['best_price'] is None and product_item['offer_count'] == 0
+        assert watch_item['current_best_price'] is None
+    
+    @pytest.mark.parametrize('count', [1, 15])
+    def test_product_list_query_count_is_constant(self, count, django_assert_num_queries):
+        make_products(count)
+        # 페이지네이션 count + 목록 조회
+        with django_assert_num_queries(2):
+            response = APIClient().get('/api/v1/products/')
+        assert len(response.json()['results']) == count
+    
+    @pytest.mark.parametrize('count', [1, 15])
+    def test_watch_list_query_count_is_constant(self, count, django_assert_num_queries):
+        for product in make_products(count):
+            Watch.objects.create(user_id=1, product=product, target_price=Decimal("9000"))
+        
+        with django_assert_num_queries(2):
+            response = APIClient().get('/api/v1/watches/', {'user_id': 1})
+        
+        results = response.json()['results']
+        assert len(results) == count
+        assert results[0]['current_best_price']['marketplace'] == '11번가'
+
+
+@pytest.mark.django_db
+class TestProductBestPrice:
+    """상품 최저가 테이블 테스트"""
+    
+    def test_refresh_tracks_min_total_price(self):
+        product = make_products(1)[0]
+        record = ProductBestPrice.objects.get(product=product)
+        assert record.total_price == Decimal("12000")
+        assert record.min_price == Decimal("10000")
+        assert record.offer_count == 2
+        
+        cheaper = Offer.objects.create(
+            product=product, marketplace="G마켓", seller="G셀러",
+            price=Decimal("9000"), shipping_fee=Decimal("2500"), url="https://test.gmarket.co.kr/0"
+        )
+        refresh_best_prices([product.id])
+        
+        record.refresh_from_db()
+        assert record.offer_id == cheaper.id
+        assert record.total_price == Decimal("11500")
+        assert record.marketplace == "G마켓"
+        assert record.offer_count == 3
+    
+    def test_refresh_removes_products_without_offers(self):
+        product = make_products(1)[0]
+        product.offers.all().delete()
+        
+        refresh_best_prices([product.id])
+        
+        assert not ProductBestPrice.objects.filter(product=product).exists()
+    
+    def test_rebuild(self):
+        products = make_products(3)
+        ProductBestPrice.objects.all().delete()
+        
+        assert rebuild_best_prices() == 3
+        assert ProductBestPrice.objects.count() == len(products)
+    
+    def test_migration_backfills_existing_offers(self):
+        """최저가 테이블 생성 마이그레이션이 기존 오퍼로 테이블을 채움"""
+        from django.apps import apps
+        migration = importlib.import_module('catalog.migrations.0002_product_best_price')
+        products = make_products(2)
+        ProductBestPrice.objects.all().delete()
+        
+        migration.backfill_best_prices(apps, None)
+        
+        assert ProductBestPrice.objects.count() == len(products)
+        assert ProductBestPrice.objects.get(product=products[0]).total_price == Decimal("12000")
+
+
+@pytest.mark.django_db
+class TestPriceSeries:
+    """가격 차트 시리즈 API 테스트"""
+    
+    END = timezone.make_aware(datetime(2026, 6, 30, 12, 0))
+    
+    def record(self, offer: Offer, total_price: str, recorded_at: datetime):
+        history = PriceHistory.objects.create(offer=offer, price=Decimal(total_price), total_price=Decimal(total_price))
+        PriceHistory.objects.filter(pk=history.pk).update(recorded_at=recorded_at)
+    
+    def get_series(self, **params):
+        params.setdefault('end', self.END.isoformat())
+        response = APIClient().get('/api/v1/price-history/series/', params)
+        assert response.status_code == 200, response.json()
+        return {item['marketplace']: item['points'] for item in response.json()['series']}
+    
+    def test_daily_buckets_per_marketplace_with_rollups(self):
+        product = make_products(1)[0]
+        coupang, elevenst = Offer.objects.filter(product=product).order_by('id')
+        day = self.END - timedelta(days=2)
+        for hour, price in [(9, "13000"), (13, "12500"), (18, "12800")]:
+            self.record(coupang, price, day.replace(hour=hour))
+        self.record(elevenst, "12000", day.replace(hour=10))
+        PriceHistoryDaily.objects.create(
+            product=product, marketplace="쿠팡", date=(self.END - timedelta(days=200)).date(),
+            min_total_price=Decimal("14000"), max_total_price=Decimal("15000"),
+            close_total_price=Decimal("14500"), closed_at=self.END - timedelta(days=200), sample_count=9
+        )
+        
+        series = self.get_series(product_id=product.id, days=365)
+        
+        # 변경이 없는 이후 버킷은 직전 종가를 이어받음
+        assert [point['close'] for point in series['쿠팡']] == [14500, 12800, 12800, 12800]
+        assert series['쿠팡'][1] == {
+            't': timezone.localtime(day).replace(hour=0).isoformat(),
+            'min': 12500, 'max': 13000, 'close': 12800, 'count': 3
+        }
+        assert [point['count'] for point in series['11번가']] == [1, 0, 0]
+    
+    def test_marketplace_close_is_cheapest_offer(self):
+        """마켓플레이스 값은 오퍼별 값 중 최저이며, 범위 시작 전 가격부터 이어짐"""
+        product = make_products(1)[0]
+        first = product.offers.get(marketplace="쿠팡")
+        second = Offer.objects.create(
+            product=product, marketplace="쿠팡", seller="다른 판매자",
+            price=Decimal("9000"), url="https://test.coupang.com/other"
+        )
+        day = timezone.localtime(self.END - timedelta(days=2)).replace(hour=0)
+        self.record(first, "10000", self.END - timedelta(days=40))
+        self.record(second, "9000", day.replace(hour=9))
+        self.record(second, "9500", day.replace(hour=18))
+        self.record(first, "11000", day.replace(hour=20))
+        
+        points = self.get_series(product_id=product.id, days=30)['쿠팡']
+        
+        assert len(points) == 31
+        assert points[0] == {
+            't': timezone.localtime(self.END - timedelta(days=30)).replace(hour=0).isoformat(),
+            'min': 10000, 'max': 10000, 'close': 10000, 'count': 0
+        }
+        # 마지막으로 바뀐 오퍼(11000)가 아니라 버킷 끝의 최저가(9500)가 종가
+        assert points[-3] == {'t': day.isoformat(), 'min': 9000, 'max': 9500, 'close': 9500, 'count': 3}
+        assert [point['close'] for point in points[-2:]] == [9500, 9500]
+    
+    def test_offer_series_downsampled_with_lttb(self, django_assert_max_num_queries):
+        offer = make_products(1)[0].offers.get(marketplace="쿠팡")
+        for days_ago in range(100):
+            self.record(offer, str(10000 + (days_ago % 7) * 100), self.END - timedelta(days=days_ago, hours=1))
+        
+        with django_assert_max_num_queries(2):
+            series = self.get_series(offer_id=offer.id, days=120, points=20)
+        
+        points = series['쿠팡']
+        assert len(points) == 20
+        assert points[0]['t'] < points[-1]['t']
+    
+    @pytest.mark.parametrize('params', [
+        {'days': 30},
+        {'product_id': 1, 'bucket': 'minute'},
+        {'product_id': 1, 'bucket': 'hour', 'days': 90},
+    ])
+    def test_invalid_params(self, params):
+        response = APIClient().get('/api/v1/price-history/series/', params)
+        assert response.status_code == 400
+    
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        data = [(float(x), 0.0) for x in range(100)]
+        data[50] = (50.0, 100.0)
+        
+        indices = lttb(data, 10)
+        
+        assert len(indices) == 10
+        assert indices[0] == 0 and indices[-1] == 99
+        assert 50 in indices
+
+
+@pytest.fixture
+def search_registry(monkeypatch):
+    """빠른/느린 프로바이더 레지스트리와 테스트 전용 검색 캐시"""
+    registry = ProviderRegistry()
+    registry.register(DelayedSearchProvider("fast", 1200000, delay=0.01))
+    registry.register(DelayedSearchProvider("slow", 1150000, delay=0.6))
+    monkeypatch.setattr(search_module, 'provider_registry', registry)
+    monkeypatch.setattr(views, 'search_service', SearchService(cache=SearchResultCache(ttl=60)))
+    return registry
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('search_registry')
+class TestSearchView:
+    """검색 API 테스트 (WSGI 테스트 클라이언트)"""
+    
+    def test_search_returns_matched_products(self):
+        response = APIClient().get('/api/v1/search/', {'q': '갤럭시 S24'})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 1 and len(data['offers']) == 2
+        assert data['best_price']['price'] == 1150000
+        assert data['timed_out_providers'] == [] and data['failed_providers'] == []
+    
+    def test_missing_query(self):
+        assert APIClient().get('/api/v1/search/').status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('search_registry')
+class TestSearchStreamView:
+    """검색 스트리밍 API 테스트 (WSGI 테스트 클라이언트)"""
+    
+    def test_partial_event_arrives_before_slow_provider(self):
+        started = time.monotonic()
+        response = APIClient().get('/api/v1/search/stream/', {'q': '갤럭시 S24'})
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        
+        chunks = iter(response.streaming_content)
+        first = json.loads(next(chunks))
+        first_at = time.monotonic() - started
+        rest = [json.loads(line) for chunk in chunks for line in chunk.splitlines() if line]
+        
+        assert first['event'] == 'partial' and first['provider'] == 'fast'
+        assert first['pending_providers'] == ['slow']
+        assert first_at < 0.5
+        assert [event['event'] for event in rest] == ['partial', 'done']
+        assert rest[-1]['best_price']['price'] == 1150000
+        response.close()
+    
+    def test_sse_format(self):
+        response = APIClient().get('/api/v1/search/stream/', {'q': '갤럭시 S24', 'format': 'sse'})
+        body = b''.join(response.streaming_content).decode()
+        
+        assert response['Content-Type'].startswith('text/event-stream')
+        assert body.count('event: partial') == 2 and 'event: done' in body
+        response.close()
+    
+    def test_cached_result_is_single_done_event(self):
+        """스트리밍으로 저장한 결과는 다음 요청에 done 이벤트 하나로 전송"""
+        first = APIClient().get('/api/v1/search/stream/', {'q': '갤럭시 S24'})
+        b''.join(first.streaming_content)
+        first.close()
+        
+        started = time.monotonic()
+        response = APIClient().get('/api/v1/search/stream/', {'q': '갤럭시 S24'})
+        events = [json.loads(line) for line in b''.join(response.streaming_content).splitlines() if line]
+        response.close()
+        
+        assert time.monotonic() - started < 0.5
+        assert [event['event'] for event in events] == ['done']
+        assert events[0]['cached'] is True and events[0]['query'] == '갤럭시 S24'
+        assert events[0]['best_price']['price'] == 1150000
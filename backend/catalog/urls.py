@@ -18,6 +18,17 @@ urlpatterns = [
     # 뷰셋 URL
     path('', include(router.urls)),
     
+    # 프로바이더 상태
+    path('providers/status/', views.provider_status, name='provider-status'),
+    
     # 검색 엔드포인트 (별도 액션)
     path('search/', views.ProductViewSet.as_view({'get': 'search'}), name='product-search'),
+    path(
+        'search/stream/',
+        views.ProductViewSet.as_view(
+            {'get': 'search_stream'},
+            **views.ProductViewSet.search_stream.kwargs
+        ),
+        name='product-search-stream'
+    ),
 ]
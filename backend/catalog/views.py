@@ -2,23 +2,29 @@
 Catalog views and viewsets
 """
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status, filters
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
 from django_filters.rest_framework import DjangoFilterBackend
+from core.runtime import runtime
 from .models import Product, Offer, PriceHistory, Watch
 from .serializers import (
     ProductListSerializer, ProductDetailSerializer,
-    OfferListSerializer, PriceHistoryListSerializer,
+    OfferListSerializer, PriceHistoryListSerializer, PriceSeriesQuerySerializer,
     WatchCreateSerializer, WatchListSerializer, WatchUpdateSerializer
 )
+from .providers.base import provider_registry
+from .renderers import NDJSONRenderer, EventStreamRenderer
+from .services.history import price_history_series
 from .services.search import search_service
 
 
 class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     """상품 뷰셋"""
-    queryset = Product.objects.all()
+    queryset = Product.objects.select_related('best_price_record')
     permission_classes = [AllowAny]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['brand', 'model_code', 'name', 'gtin']
@@ -31,8 +37,11 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         return ProductListSerializer
     
     @action(detail=False, methods=['get'])
-    async def search(self, request):
-        """상품 검색 (프로바이더 기반)"""
+    def search(self, request):
+        """상품 검색 (프로바이더 기반)
+        
+        DRF 뷰는 동기로 실행되므로 검색 코루틴은 프로세스 런타임 루프에서 실행한다.
+        """
         query = request.query_params.get('q', '')
         if not query:
             return Response(
@@ -42,20 +51,62 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         
         try:
             # 검색 서비스 호출
-            result = await search_service.search_products(query)
+            result = runtime.run(search_service.search_products(query))
             
             return Response({
                 'query': query,
                 'count': result['total_count'],
                 'products': result['products'],
                 'offers': result['offers'],
-                'best_price': result['best_price']
+                'best_price': result['best_price'],
+                'timed_out_providers': result['timed_out_providers'],
+                'failed_providers': result['failed_providers']
             })
         except Exception as e:
             return Response(
                 {'error': f'검색 중 오류가 발생했습니다: {str(e)}'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='search/stream',
+        renderer_classes=[NDJSONRenderer, EventStreamRenderer, JSONRenderer]
+    )
+    def search_stream(self, request):
+        """상품 검색 스트리밍 (프로바이더 응답마다 부분 결과 전송)
+        
+        `Accept: text/event-stream` 또는 `?format=sse`이면 SSE, 기본은 NDJSON으로 전송한다.
+        WSGI에서는 비동기 제너레이터를 그대로 넘기면 끝까지 모은 뒤에야 전송되므로,
+        프로세스 런타임 루프에서 이벤트를 하나씩 꺼내는 동기 이터레이터로 감싼다.
+        """
+        query = request.query_params.get('q', '')
+        if not query:
+            return Response(
+                {'error': '검색어를 입력해주세요.'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        renderer = request.accepted_renderer
+        if isinstance(renderer, JSONRenderer):
+            renderer = NDJSONRenderer()
+        
+        async def event_stream():
+            try:
+                async for event in search_service.stream_search_products(query):
+                    event['query'] = query
+                    yield renderer.render(event)
+            except Exception as e:
+                yield renderer.render({
+                    'event': 'error',
+                    'error': f'검색 중 오류가 발생했습니다: {str(e)}'
+                })
+        
+        response = StreamingHttpResponse(runtime.iterate(event_stream()), content_type=renderer.media_type)
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
 
 class OfferViewSet(viewsets.ReadOnlyModelViewSet):
@@ -78,11 +129,39 @@ class PriceHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['offer_id']
     ordering_fields = ['recorded_at']
     ordering = ['-recorded_at']
+    
+    @action(detail=False, methods=['get'])
+    def series(self, request):
+        """차트용 가격 시리즈 (버킷별 최저/최고/종가, 마켓플레이스별)
+        
+        `?product_id=1&days=365&bucket=day&points=200`처럼 기간과 버킷 크기를 지정하면
+        페이지네이션 없이 한 번에 반환한다. `points`를 주면 LTTB로 점 개수를 줄인다.
+        """
+        params = PriceSeriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        
+        series = price_history_series(
+            start=query['start'],
+            end=query['end'],
+            bucket=query['bucket'],
+            product_id=query.get('product_id'),
+            offer_id=query.get('offer_id'),
+            points=query.get('points')
+        )
+        return Response({
+            'product_id': query.get('product_id'),
+            'offer_id': query.get('offer_id'),
+            'bucket': query['bucket'],
+            'start': query['start'],
+            'end': query['end'],
+            'series': series
+        })
 
 
 class WatchViewSet(viewsets.ModelViewSet):
     """가격 모니터링 뷰셋"""
-    queryset = Watch.objects.select_related('product').all()
+    queryset = Watch.objects.select_related('product', 'product__best_price_record')
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['user_id', 'product_id', 'is_active']
@@ -135,3 +214,25 @@ class WatchViewSet(viewsets.ModelViewSet):
             {'message': '모니터링이 삭제되었습니다.'}, 
             status=status.HTTP_204_NO_CONTENT
         )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def provider_status(request):
+    """프로바이더 상태 (회로 상태/오류율/지연 시간, 속도 제한 대기열, 헤지 요청)"""
+    rate_limits = provider_registry.get_rate_limit_stats()
+    health = provider_registry.get_health_stats()
+    hedges = provider_registry.get_hedge_stats()
+    available = {provider.get_name() for provider in provider_registry.get_available_providers()}
+    return Response({
+        'providers': [
+            {
+                'name': provider.get_name(),
+                'available': provider.get_name() in available,
+                'health': health.get(provider.get_name()),
+                'rate_limit': rate_limits.get(provider.get_name()),
+                'hedge': hedges.get(provider.get_name())
+            }
+            for provider in provider_registry.get_all_providers()
+        ]
+    })
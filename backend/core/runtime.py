@@ -0,0 +1,177 @@
+"""
+워커 프로세스(Celery, WSGI)용 비동기 런타임
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """워커 프로세스당 하나의 이벤트 루프를 백그라운드 스레드에서 실행
+    
+    동기 Celery 태스크나 WSGI 뷰에서 코루틴을 제출하면 이 루프에서 실행되므로,
+    프로바이더의 HTTP 세션/커넥션 풀이 프로세스 수명 동안 유지된다. 루프에 묶인 자원은
+    `on_shutdown`으로 정리 함수를 등록하면 루프를 멈추기 전에 그 루프에서 닫는다.
+    프로세스 종료 시(`atexit`)에도 `stop`을 호출하므로 Celery 외 워커에서도 정리된다.
+    """
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._shutdown_callbacks: List[Callable[[], Awaitable]] = []
+        self._atexit_registered = False
+    
+    @property
+    def is_running(self) -> bool:
+        """현재 프로세스에서 루프가 실행 중인지 여부"""
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+    
+    def start(self):
+        """이벤트 루프 시작 (이미 실행 중이면 무시, fork 이후에는 새로 시작)"""
+        with self._lock:
+            if self.is_running:
+                return
+            
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self._run_loop, args=(loop,), name='async-runtime', daemon=True)
+            thread.start()
+            
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+            logger.info(f"비동기 런타임 시작 (pid={self._pid})")
+    
+    def on_shutdown(self, callback: Callable[[], Awaitable]):
+        """루프 종료 직전에 루프 안에서 실행할 정리 함수 등록 (인자 없는 코루틴 함수)"""
+        with self._lock:
+            self._shutdown_callbacks.append(callback)
+    
+    def stop(self, timeout: float = 5.0):
+        """정리 함수를 실행한 뒤 이벤트 루프 종료"""
+        with self._lock:
+            if not self.is_running:
+                return
+            
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"비동기 런타임 정리 실패: {str(e)}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+            
+            self._loop = None
+            self._thread = None
+            logger.info(f"비동기 런타임 종료 (pid={self._pid})")
+    
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """코루틴을 런타임 루프에서 실행하고 결과를 기다림"""
+        self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("런타임 루프 안에서는 run()을 호출할 수 없습니다.")
+        
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+    
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """코루틴을 런타임 루프에 제출하고 기다리지 않음 (요청보다 오래 걸리는 백그라운드 작업용)"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def iterate(self, agen: AsyncIterator, timeout: Optional[float] = None) -> Iterator:
+        """비동기 이터레이터를 런타임 루프에서 한 항목씩 꺼내는 동기 이터레이터
+        
+        WSGI 스트리밍 응답처럼 동기 코드가 항목을 받는 즉시 내보내야 할 때 사용한다.
+        중간에 닫히면(클라이언트 연결 종료 등) 비동기 이터레이터도 런타임 루프에서 정리한다.
+        """
+        try:
+            while True:
+                try:
+                    item = self.run(_anext(agen), timeout)
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            aclose = getattr(agen, 'aclose', None)
+            if aclose is not None and self.is_running:
+                try:
+                    self.run(aclose(), timeout=5)
+                except Exception as e:
+                    logger.warning(f"비동기 이터레이터 정리 실패: {str(e)}")
+    
+    def run_many(
+        self,
+        coros: Iterable[Awaitable],
+        concurrency: int = 8,
+        timeout: Optional[float] = None
+    ) -> List[Any]:
+        """여러 코루틴을 최대 concurrency개씩 동시에 실행
+        
+        결과는 입력 순서대로 반환하며, 실패한 코루틴 자리에는 예외 객체가 들어간다.
+        """
+        return self.run(self._gather_limited(list(coros), concurrency), timeout)
+    
+    async def _gather_limited(self, coros: List[Awaitable], concurrency: int) -> List[Any]:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(limited(coro) for coro in coros), return_exceptions=True)
+    
+    async def _shutdown(self):
+        for callback in self._shutdown_callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.warning(f"런타임 종료 정리 함수 실패 ({callback!r}): {str(e)}")
+        await asyncio.get_running_loop().shutdown_asyncgens()
+    
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+
+async def _anext(agen: AsyncIterator) -> Any:
+    return await agen.__anext__()
+
+
+# 워커 프로세스 전역 런타임
+runtime = AsyncRuntime()
+
+
+@worker_process_init.connect
+def start_runtime(**kwargs):
+    """워커 프로세스 시작 시 런타임 시작"""
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def stop_runtime(**kwargs):
+    """워커 프로세스 종료 시 런타임 종료 (등록된 HTTP 커넥션 풀 등도 함께 닫음)"""
+    runtime.stop()
@@ -17,6 +17,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # 태스크 자동 발견
 app.autodiscover_tasks()
 
+# 설치된 앱 밖에 있는 태스크 모듈
+app.conf.imports = ('apps.alerts.tasks',)
+
 # Beat 스케줄 설정
 app.conf.beat_schedule = {
     # 10분마다 Watch 스캔 (개발 환경)
@@ -24,6 +27,11 @@ app.conf.beat_schedule = {
         'task': 'alerts.scan_watches',
         'schedule': crontab(minute='*/10'),  # 0, 10, 20, 30, 40, 50분
     },
+    # 1분마다 대기 알림 발송 (재시도 포함)
+    'deliver-notifications-every-minute': {
+        'task': 'alerts.deliver_notifications',
+        'schedule': crontab(minute='*'),
+    },
     # 매일 자정에 정리 작업
     'cleanup-daily': {
         'task': 'alerts.cleanup_old_data',
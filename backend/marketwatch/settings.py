@@ -169,6 +169,70 @@ CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_WORKER_CONCURRENCY = get_env_int('CELERY_WORKER_CONCURRENCY', 4)
 CELERY_MAX_TASKS_PER_CHILD = get_env_int('CELERY_MAX_TASKS_PER_CHILD', 1000)
 
+# Watch 스캔 설정
+ALERTS_SCAN_SHARD_SIZE = get_env_int('ALERTS_SCAN_SHARD_SIZE', 200)  # 샤드당 상품 수
+ALERTS_SCAN_CONCURRENCY = get_env_int('ALERTS_SCAN_CONCURRENCY', 8)  # 샤드 내 동시 상품 검색 수
+ALERTS_WATCH_INDEX_REDIS = get_env_bool('ALERTS_WATCH_INDEX_REDIS', False)  # 목표가 인덱스를 Redis sorted set에 공유
+ALERTS_WATCH_INDEX_TTL = get_env_int('ALERTS_WATCH_INDEX_TTL', 60)  # 인덱스 재적재 주기 (초, Redis 인덱스는 키 TTL)
+ALERTS_COOLDOWN_MINUTES = get_env_int('ALERTS_COOLDOWN_MINUTES', 24 * 60)  # 같은 가격 재알림 대기 시간 (분)
+
+# 알림 발송 설정
+ALERTS_NOTIFICATION_CHANNELS = [
+    channel.strip()
+    for channel in get_env('ALERTS_NOTIFICATION_CHANNELS', 'file' if DEBUG else 'email').split(',')
+    if channel.strip()
+]  # email, file, webhook, extension
+ALERTS_NOTIFICATION_BATCH_SIZE = get_env_int('ALERTS_NOTIFICATION_BATCH_SIZE', 100)  # 채널별 1회 발송 묶음 크기
+ALERTS_NOTIFICATION_MAX_ATTEMPTS = get_env_int('ALERTS_NOTIFICATION_MAX_ATTEMPTS', 5)
+ALERTS_NOTIFICATION_RETRY_BASE = get_env_int('ALERTS_NOTIFICATION_RETRY_BASE', 60)  # 재시도 백오프 기준 (초)
+ALERTS_NOTIFICATION_RETRY_MAX = get_env_int('ALERTS_NOTIFICATION_RETRY_MAX', 3600)  # 재시도 백오프 상한 (초)
+ALERTS_NOTIFICATION_LEASE = get_env_int('ALERTS_NOTIFICATION_LEASE', 300)  # 발송 중 알림 선점 시간 (초, 지나면 다른 워커가 다시 발송)
+ALERTS_WEBHOOK_URL = get_env('ALERTS_WEBHOOK_URL', '')
+ALERTS_EXTENSION_PUSH_URL = get_env('ALERTS_EXTENSION_PUSH_URL', '')
+
+# 데이터 보존 설정 (일 단위, 0이면 삭제하지 않음)
+RETENTION_OFFER_DAYS = get_env_int('RETENTION_OFFER_DAYS', 30)  # 마지막 수집 이후 오퍼 보존 기간
+RETENTION_PRICE_HISTORY_DAYS = get_env_int('RETENTION_PRICE_HISTORY_DAYS', 90)  # 원본 히스토리 (지나면 일별 요약)
+RETENTION_PRICE_HISTORY_DAILY_DAYS = get_env_int('RETENTION_PRICE_HISTORY_DAILY_DAYS', 0)  # 일별 요약
+RETENTION_NOTIFICATION_DAYS = get_env_int('RETENTION_NOTIFICATION_DAYS', 30)  # 발송 완료/실패 알림
+RETENTION_CHUNK_SIZE = get_env_int('RETENTION_CHUNK_SIZE', 1000)  # 트랜잭션당 삭제 행 수 (PK 구간)
+
+# 캐시 설정
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'search': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': get_env('SEARCH_CACHE_URL', REDIS_URL),
+        'KEY_PREFIX': 'pricewatch',
+    },
+}
+
+# 검색 결과 캐시 설정
+SEARCH_CACHE_TTL = get_env_int('SEARCH_CACHE_TTL', 300)  # 신선 구간 (초)
+SEARCH_CACHE_STALE_TTL = get_env_int('SEARCH_CACHE_STALE_TTL', 600)  # TTL 이후 stale 응답 허용 구간 (초)
+SEARCH_CACHE_LOCAL_SIZE = get_env_int('SEARCH_CACHE_LOCAL_SIZE', 256)  # 프로세스 내 LRU 크기
+
+# 프로바이더 설정
+PROVIDER_RATE_LIMITS = {}  # 프로바이더별 속도 제한 재정의 ({'이름': {'requests_per_minute': 60, ...}}), 없으면 어댑터 값
+PROVIDER_RATE_LIMIT_REDIS = get_env_bool('PROVIDER_RATE_LIMIT_REDIS', False)  # 속도 제한 버킷을 Redis에서 워커 간 공유
+PROVIDER_HEALTH_WINDOW_SECONDS = get_env_int('PROVIDER_HEALTH_WINDOW_SECONDS', 300)  # 오류율/지연 집계 구간 (초)
+PROVIDER_CIRCUIT_FAILURE_THRESHOLD = get_env_int('PROVIDER_CIRCUIT_FAILURE_THRESHOLD', 5)  # 연속 실패 시 회로 열기
+PROVIDER_CIRCUIT_ERROR_RATE = float(get_env('PROVIDER_CIRCUIT_ERROR_RATE', '0.5'))  # 집계 구간 오류율 한도
+PROVIDER_CIRCUIT_MIN_SAMPLES = get_env_int('PROVIDER_CIRCUIT_MIN_SAMPLES', 10)  # 오류율 판단 최소 표본 수
+PROVIDER_CIRCUIT_OPEN_SECONDS = get_env_int('PROVIDER_CIRCUIT_OPEN_SECONDS', 30)  # 회로를 연 뒤 시험 호출까지 대기 (초)
+PROVIDER_CIRCUIT_MAX_OPEN_SECONDS = get_env_int('PROVIDER_CIRCUIT_MAX_OPEN_SECONDS', 300)  # 시험 호출 실패 시 대기 상한 (초)
+PROVIDER_HTTP_MAX_CONNECTIONS = get_env_int('PROVIDER_HTTP_MAX_CONNECTIONS', 100)  # HTTP 프로바이더 최대 동시 연결 수
+PROVIDER_HTTP_MAX_KEEPALIVE = get_env_int('PROVIDER_HTTP_MAX_KEEPALIVE', 20)  # 유지할 keep-alive 연결 수
+PROVIDER_HTTP_KEEPALIVE_EXPIRY = get_env_int('PROVIDER_HTTP_KEEPALIVE_EXPIRY', 30)  # 유휴 연결 유지 시간 (초)
+PROVIDER_HTTP_USER_AGENT = get_env('PROVIDER_HTTP_USER_AGENT', 'PriceWatch/1.0')  # 마켓플레이스 API 요청 User-Agent
+PROVIDER_HEDGE_ENABLED = get_env_bool('PROVIDER_HEDGE_ENABLED', False)  # p95 이상 지연 시 헤지 요청
+PROVIDER_HEDGE_BUDGET = float(get_env('PROVIDER_HEDGE_BUDGET', '0.1'))  # 헤지로 늘어나는 요청 비율 상한
+PROVIDER_HEDGE_BURST = get_env_int('PROVIDER_HEDGE_BURST', 5)  # 한 번에 쓸 수 있는 헤지 예산
+PROVIDER_HEDGE_MIN_SAMPLES = get_env_int('PROVIDER_HEDGE_MIN_SAMPLES', 20)  # p95를 신뢰할 최소 지연 표본 수
+PROVIDER_HEDGE_MIN_DELAY = float(get_env('PROVIDER_HEDGE_MIN_DELAY', '0.05'))  # 헤지 요청 최소 대기 (초)
+
 # 이메일 설정 (개발용)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # 개발용 콘솔 출력
 DEFAULT_FROM_EMAIL = 'noreply@pricewatch.com'
@@ -178,6 +242,9 @@ EMAIL_USE_TLS = get_env_bool('EMAIL_USE_TLS', True)
 EMAIL_HOST_USER = get_env('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = get_env('EMAIL_HOST_PASSWORD', '')
 
+# 상품 매칭 설정
+MATCHING_FEATURE_CACHE_SIZE = get_env_int('MATCHING_FEATURE_CACHE_SIZE', 4096)  # 제목 특징 LRU 캐시 크기
+
 # 로깅 설정
 from core.logging import configure_logging
 configure_logging(get_env('LOG_LEVEL', 'INFO'))
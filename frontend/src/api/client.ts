@@ -1,5 +1,7 @@
 import axios from 'axios'
-import type { SearchResult, Product, Offer, PriceHistory, Watch } from '@/types'
+import type {
+  SearchResult, SearchStreamEvent, Product, Offer, PriceHistory, PriceBucketSize, PriceSeriesResponse, Watch,
+} from '@/types'
 
 const apiClient = axios.create({
   baseURL: '/api/v1',
@@ -22,6 +24,39 @@ export const searchApi = {
     const response = await apiClient.get(`/search/?q=${encodeURIComponent(query)}`)
     return response.data
   },
+  
+  // 프로바이더 응답마다 부분 결과를 받는 스트리밍 검색 (NDJSON)
+  stream: async (
+    query: string,
+    onEvent: (event: SearchStreamEvent) => void,
+    signal?: AbortSignal
+  ): Promise<void> => {
+    const response = await fetch(`/api/v1/search/stream/?q=${encodeURIComponent(query)}`, {
+      headers: { Accept: 'application/x-ndjson' },
+      signal,
+    })
+    if (!response.ok || !response.body) {
+      throw new Error(`Search stream failed: ${response.status}`)
+    }
+    
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      
+      buffer += decoder.decode(value, { stream: true })
+      const lines = buffer.split('\n')
+      buffer = lines.pop() ?? ''
+      for (const line of lines) {
+        if (line.trim()) onEvent(JSON.parse(line))
+      }
+    }
+    
+    if (buffer.trim()) onEvent(JSON.parse(buffer))
+  },
 }
 
 export const productApi = {
@@ -50,6 +85,26 @@ export const priceHistoryApi = {
     const response = await apiClient.get(`/price-history/${params}`)
     return response.data.results
   },
+  
+  // 차트용 버킷 집계 시리즈 (마켓플레이스별 최저/최고/종가, 한 번에 조회)
+  getSeries: async (params: {
+    productId?: number
+    offerId?: number
+    days?: number
+    bucket?: PriceBucketSize
+    points?: number
+  }): Promise<PriceSeriesResponse> => {
+    const response = await apiClient.get('/price-history/series/', {
+      params: {
+        product_id: params.productId,
+        offer_id: params.offerId,
+        days: params.days,
+        bucket: params.bucket,
+        points: params.points,
+      },
+    })
+    return response.data
+  },
 }
 
 export const watchApi = {
@@ -1,5 +1,8 @@
+import { useQuery } from '@tanstack/react-query'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts'
-import { generateMockPriceHistory } from '@/utils'
+import { Loader2 } from 'lucide-react'
+import { priceHistoryApi } from '@/api/client'
+import type { PriceBucketSize, PriceSeries } from '@/types'
 
 interface PriceChartProps {
   productId?: number
@@ -7,9 +10,50 @@ interface PriceChartProps {
   className?: string
 }
 
+// 마켓플레이스별 선 색상
+const MARKETPLACE_STROKES: Record<string, string> = {
+  '쿠팡': '#f97316',
+  '11번가': '#3b82f6',
+  'G마켓': '#22c55e',
+  '옥션': '#a855f7',
+  '네이버': '#16a34a',
+  '카카오': '#eab308',
+}
+
+// 마켓플레이스별 최대 점 개수 (넘으면 서버에서 LTTB로 축소)
+const MAX_POINTS = 200
+
+type ChartRow = { date: string } & Record<string, number | string>
+
+function bucketForDays(days: number): PriceBucketSize {
+  if (days <= 2) return 'hour'
+  return days > 180 ? 'week' : 'day'
+}
+
+// 마켓플레이스별 시리즈를 시각 기준 행으로 병합 (값은 버킷 종가)
+function toChartRows(series: PriceSeries[]): ChartRow[] {
+  const rows = new Map<string, ChartRow>()
+  for (const { marketplace, points } of series) {
+    for (const point of points) {
+      const row = rows.get(point.t) ?? { date: point.t }
+      row[marketplace] = point.close
+      rows.set(point.t, row)
+    }
+  }
+  return Array.from(rows.values()).sort((a, b) => Date.parse(a.date) - Date.parse(b.date))
+}
+
 export function PriceChart({ productId, days = 30, className }: PriceChartProps) {
-  // Mock 데이터 생성 (실제로는 API에서 가져올 예정)
-  const data = generateMockPriceHistory(days)
+  const bucket = bucketForDays(days)
+  
+  const { data, isLoading, error } = useQuery({
+    queryKey: ['price-series', productId, days],
+    queryFn: () => priceHistoryApi.getSeries({ productId, days, bucket, points: MAX_POINTS }),
+    enabled: !!productId,
+  })
+  
+  const series = data?.series ?? []
+  const rows = toChartRows(series)
   
   const formatYAxis = (value: number) => {
     return `${(value / 10000).toFixed(0)}만원`
@@ -21,7 +65,7 @@ export function PriceChart({ productId, days = 30, className }: PriceChartProps)
         style: 'currency',
         currency: 'KRW',
       }).format(value),
-      name === 'price' ? '상품가' : '총가격',
+      name,
     ]
   }
   
@@ -29,68 +73,78 @@ export function PriceChart({ productId, days = 30, className }: PriceChartProps)
     <div className={className}>
       <div className="mb-4">
         <h3 className="text-lg font-semibold text-gray-900">가격 변동 추이</h3>
-        <p className="text-sm text-gray-500">최근 {days}일간의 가격 변화</p>
+        <p className="text-sm text-gray-500">최근 {days}일간의 마켓플레이스별 가격 변화 (배송비 포함)</p>
       </div>
       
       <div className="bg-white p-4 rounded-lg border">
-        <ResponsiveContainer width="100%" height={300}>
-          <LineChart data={data} margin={{ top: 5, right: 30, left: 20, bottom: 5 }}>
-            <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
-            <XAxis 
-              dataKey="date" 
-              stroke="#666"
-              fontSize={12}
-              tickFormatter={(value) => {
-                const date = new Date(value)
-                return `${date.getMonth() + 1}/${date.getDate()}`
-              }}
-            />
-            <YAxis 
-              stroke="#666"
-              fontSize={12}
-              tickFormatter={formatYAxis}
-            />
-            <Tooltip 
-              formatter={formatTooltip}
-              labelFormatter={(value) => {
-                const date = new Date(value)
-                return date.toLocaleDateString('ko-KR', {
-                  year: 'numeric',
-                  month: 'long',
-                  day: 'numeric',
-                })
-              }}
-            />
-            <Line 
-              type="monotone" 
-              dataKey="price" 
-              stroke="#3b82f6" 
-              strokeWidth={2}
-              dot={{ fill: '#3b82f6', strokeWidth: 2, r: 4 }}
-              activeDot={{ r: 6, stroke: '#3b82f6', strokeWidth: 2, fill: '#fff' }}
-            />
-            <Line 
-              type="monotone" 
-              dataKey="total_price" 
-              stroke="#ef4444" 
-              strokeWidth={2}
-              strokeDasharray="5 5"
-              dot={{ fill: '#ef4444', strokeWidth: 2, r: 4 }}
-              activeDot={{ r: 6, stroke: '#ef4444', strokeWidth: 2, fill: '#fff' }}
-            />
-          </LineChart>
-        </ResponsiveContainer>
-        
-        {/* 범례 */}
-        <div className="flex items-center justify-center gap-6 mt-4 text-sm">
-          <div className="flex items-center gap-2">
-            <div className="w-3 h-0.5 bg-blue-500"></div>
-            <span className="text-gray-600">상품가</span>
+        {isLoading ? (
+          <div className="h-[300px] flex items-center justify-center">
+            <Loader2 className="w-8 h-8 animate-spin text-blue-600" />
           </div>
-          <div className="flex items-center gap-2">
-            <div className="w-3 h-0.5 bg-red-500" style={{ borderTop: '2px dashed #ef4444' }}></div>
-            <span className="text-gray-600">총가격 (배송비 포함)</span>
+        ) : error || rows.length === 0 ? (
+          <div className="h-[300px] flex items-center justify-center text-sm text-gray-500">
+            {error ? '가격 변동 정보를 불러올 수 없습니다.' : '아직 기록된 가격 변동이 없습니다.'}
           </div>
+        ) : (
+          <ResponsiveContainer width="100%" height={300}>
+            <LineChart data={rows} margin={{ top: 5, right: 30, left: 20, bottom: 5 }}>
+              <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
+              <XAxis 
+                dataKey="date" 
+                stroke="#666"
+                fontSize={12}
+                tickFormatter={(value) => {
+                  const date = new Date(value)
+                  return bucket === 'hour'
+                    ? `${date.getHours()}시`
+                    : `${date.getMonth() + 1}/${date.getDate()}`
+                }}
+              />
+              <YAxis 
+                stroke="#666"
+                fontSize={12}
+                domain={['auto', 'auto']}
+                tickFormatter={formatYAxis}
+              />
+              <Tooltip 
+                formatter={formatTooltip}
+                labelFormatter={(value) => {
+                  const date = new Date(value)
+                  return date.toLocaleDateString('ko-KR', {
+                    year: 'numeric',
+                    month: 'long',
+                    day: 'numeric',
+                    ...(bucket === 'hour' ? { hour: 'numeric' } : {}),
+                  })
+                }}
+              />
+              {series.map(({ marketplace }) => (
+                <Line 
+                  key={marketplace}
+                  type="monotone" 
+                  dataKey={marketplace} 
+                  stroke={MARKETPLACE_STROKES[marketplace] ?? '#6b7280'} 
+                  strokeWidth={2}
+                  dot={false}
+                  activeDot={{ r: 5, strokeWidth: 2, fill: '#fff' }}
+                  connectNulls
+                />
+              ))}
+            </LineChart>
+          </ResponsiveContainer>
+        )}
+        
+        {/* 범례 */}
+        <div className="flex flex-wrap items-center justify-center gap-6 mt-4 text-sm">
+          {series.map(({ marketplace }) => (
+            <div key={marketplace} className="flex items-center gap-2">
+              <div
+                className="w-3 h-0.5"
+                style={{ backgroundColor: MARKETPLACE_STROKES[marketplace] ?? '#6b7280' }}
+              ></div>
+              <span className="text-gray-600">{marketplace}</span>
+            </div>
+          ))}
         </div>
       </div>
     </div>
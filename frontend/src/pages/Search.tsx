@@ -1,22 +1,52 @@
-import { useState } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useEffect, useState } from 'react'
 import { Search as SearchIcon, Loader2, AlertCircle, RefreshCw } from 'lucide-react'
 import { useNavigate } from 'react-router-dom'
 import { ResultCard } from '@/components/ResultCard'
 import { searchApi } from '@/api/client'
-import type { Product } from '@/types'
+import type { Product, SearchStreamEvent } from '@/types'
 
 export function Search() {
   const [query, setQuery] = useState('')
   const [searchTerm, setSearchTerm] = useState('')
+  const [attempt, setAttempt] = useState(0)
+  const [data, setData] = useState<SearchStreamEvent | null>(null)
+  const [isLoading, setIsLoading] = useState(false)
+  const [error, setError] = useState<Error | null>(null)
   const navigate = useNavigate()
   
-  const { data, isLoading, error, refetch } = useQuery({
-    queryKey: ['search', searchTerm],
-    queryFn: () => searchApi.search(searchTerm),
-    enabled: !!searchTerm,
-    staleTime: 5 * 60 * 1000, // 5분
-  })
+  // 스트리밍 검색: 첫 마켓 응답부터 결과를 그리고 나머지는 도착하는 대로 갱신
+  useEffect(() => {
+    if (!searchTerm) return
+    
+    const controller = new AbortController()
+    setData(null)
+    setError(null)
+    setIsLoading(true)
+    
+    searchApi
+      .stream(
+        searchTerm,
+        (event) => {
+          if (event.event === 'error') {
+            setError(new Error(event.error))
+            return
+          }
+          setData(event)
+          setIsLoading(false)
+        },
+        controller.signal
+      )
+      .catch((err) => {
+        if (!controller.signal.aborted) setError(err)
+      })
+      .finally(() => {
+        if (!controller.signal.aborted) setIsLoading(false)
+      })
+    
+    return () => controller.abort()
+  }, [searchTerm, attempt])
+  
+  const pendingCount = data?.event === 'partial' ? data.pending_providers?.length ?? 0 : 0
   
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault()
@@ -30,7 +60,7 @@ export function Search() {
   }
   
   const handleRetry = () => {
-    refetch()
+    setAttempt((value) => value + 1)
   }
   
   return (
@@ -82,7 +112,12 @@ export function Search() {
               </h2>
               {data && (
                 <p className="text-gray-600">
-                  총 {data.count}개의 상품을 찾았습니다.
+                  총 {data.total_count}개의 상품을 찾았습니다.
+                  {pendingCount > 0 && (
+                    <span className="ml-2 text-sm text-gray-400">
+                      ({pendingCount}개 마켓 응답 대기 중)
+                    </span>
+                  )}
                 </p>
               )}
             </div>
@@ -116,7 +151,7 @@ export function Search() {
             )}
             
             {/* 결과가 없는 경우 */}
-            {!isLoading && !error && data && data.count === 0 && (
+            {!isLoading && !error && data && data.event === 'done' && data.total_count === 0 && (
               <div className="text-center py-12">
                 <div className="text-6xl mb-4">🔍</div>
                 <h3 className="text-lg font-medium text-gray-900 mb-2">
@@ -129,7 +164,7 @@ export function Search() {
             )}
             
             {/* 검색 결과 그리드 */}
-            {!isLoading && !error && data && data.count > 0 && (
+            {!isLoading && !error && data && data.total_count > 0 && (
               <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
                 {data.products.map((product) => (
                   <ResultCard
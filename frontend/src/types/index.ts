@@ -34,6 +34,30 @@ export interface PriceHistory {
   recorded_at: string
 }
 
+export type PriceBucketSize = 'hour' | 'day' | 'week'
+
+export interface PriceSeriesPoint {
+  t: string
+  min: number
+  max: number
+  close: number
+  count: number
+}
+
+export interface PriceSeries {
+  marketplace: string
+  points: PriceSeriesPoint[]
+}
+
+export interface PriceSeriesResponse {
+  product_id: number | null
+  offer_id: number | null
+  bucket: PriceBucketSize
+  start: string
+  end: string
+  series: PriceSeries[]
+}
+
 export interface Watch {
   id: number
   user_id: number
@@ -57,6 +81,21 @@ export interface SearchResult {
   }
 }
 
+export interface SearchStreamEvent {
+  event: 'partial' | 'done' | 'error'
+  query: string
+  provider?: string
+  status?: 'ok' | 'timeout' | 'error'
+  pending_providers?: string[]
+  timed_out_providers?: string[]
+  failed_providers?: string[]
+  total_count: number
+  products: Product[]
+  offers: Offer[]
+  best_price?: SearchResult['best_price']
+  error?: string
+}
+
 export interface ApiResponse<T> {
   data: T
   status: number